@@ -42,6 +42,8 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    "todo_app.instrumentation.QueryInstrumentationMiddleware",
+    "todo_app.replicas.ReplicaPinMiddleware",
     "django.middleware.security.SecurityMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
@@ -75,12 +77,63 @@ WSGI_APPLICATION = "config.wsgi.application"
 # Database
 # https://docs.djangoproject.com/en/5.1/ref/settings/#databases
 
+# Pragmas run by every new SQLite connection. WAL lets readers keep
+# reading while a write is in progress, and synchronous=NORMAL is durable
+# under WAL except for the last commits before a power loss. mmap_size and
+# cache_size (negative: KiB) keep hot pages in memory, and busy_timeout makes
+# a writer wait for the lock instead of failing. Set to {} for SQLite's
+# defaults; journal_mode is stored in the database file, so switching back
+# from WAL also needs "journal_mode": "DELETE".
+TODO_SQLITE_PRAGMAS = {
+    "journal_mode": "WAL",
+    "synchronous": "NORMAL",
+    "mmap_size": 256 * 1024 * 1024,
+    "cache_size": -64 * 1024,
+    "busy_timeout": 5000,
+}
+
+# Transactions start with BEGIN TODO_SQLITE_TRANSACTION_MODE. IMMEDIATE
+# takes the write lock when an atomic block opens, so two writers queue on
+# busy_timeout rather than deadlocking on the upgrade from a read lock. The
+# cost is that every atomic block, even one that only reads, waits for and
+# holds the write lock; reads outside atomic blocks are not affected, and
+# under WAL they never wait. Every atomic block in todo_app writes, except
+# repair_tag_lists --dry-run. None keeps SQLite's DEFERRED.
+TODO_SQLITE_TRANSACTION_MODE = "IMMEDIATE"
+
+# Connections are kept for TODO_CONN_MAX_AGE seconds (0: closed at the end
+# of each request, None: kept forever) and checked before reuse, so a WSGI
+# worker opens its connection, and runs the pragmas above, once rather than
+# on every request. Under ASGI, where each request may run on a different
+# thread and persistent connections pile up, Django recommends setting it
+# to 0.
+TODO_CONN_MAX_AGE = 600
+
 DATABASES = {
     "default": {
         "ENGINE": "django.db.backends.sqlite3",
         "NAME": BASE_DIR / "db.sqlite3",
+        "OPTIONS": {
+            "init_command": ";".join(
+                f"PRAGMA {name}={value}" for name, value in TODO_SQLITE_PRAGMAS.items()
+            ),
+            "transaction_mode": TODO_SQLITE_TRANSACTION_MODE,
+        },
+        "CONN_MAX_AGE": TODO_CONN_MAX_AGE,
+        "CONN_HEALTH_CHECKS": True,
     }
 }
+
+# Reads of todo items and tags go to an alias from TODO_READ_REPLICAS
+# (further entries in DATABASES), picked once per request; writes, and
+# every read by a client for TODO_REPLICA_PIN_SECONDS after its last write,
+# go to "default". Pins are kept in the TODO_REPLICA_PIN_CACHE_ALIAS cache,
+# which must be shared between worker processes.
+DATABASE_ROUTERS = ["todo_app.replicas.ReplicaRouter"]
+TODO_READ_REPLICAS = []
+TODO_REPLICA_PIN_SECONDS = 5
+TODO_REPLICA_PIN_CACHE_ALIAS = "default"
+
 STATIC_URL = "/static/"
 STATIC_ROOT = BASE_DIR / "staticfiles"
 
@@ -128,9 +181,86 @@ DEFAULT_AUTO_FIELD = "django.db.models.BigAutoField"
 
 REST_FRAMEWORK = {
     "DEFAULT_AUTHENTICATION_CLASSES": [
-        "rest_framework.authentication.BasicAuthentication",
+        "todo_app.authentication.CachedBasicAuthentication",
     ],
     "DEFAULT_PERMISSION_CLASSES": [
         "rest_framework.permissions.IsAuthenticated",
     ],
+    # orjson-backed when it is installed, DRF's stdlib JSON otherwise.
+    "DEFAULT_RENDERER_CLASSES": [
+        "todo_app.renderers.FastJSONRenderer",
+        "rest_framework.renderers.BrowsableAPIRenderer",
+    ],
+    "DEFAULT_PARSER_CLASSES": [
+        "todo_app.renderers.FastJSONParser",
+        "rest_framework.parsers.FormParser",
+        "rest_framework.parsers.MultiPartParser",
+    ],
+}
+
+# Verified Basic credentials are cached so repeat callers skip the password
+# hash. Entries expire after TODO_AUTH_CACHE_TTL seconds.
+TODO_AUTH_CACHE_MAX_ENTRIES = 1024
+TODO_AUTH_CACHE_TTL = 300
+
+# Limits for the bulk endpoints: items accepted per request and rows per
+# INSERT batch.
+TODO_BULK_MAX_ITEMS = 5000
+TODO_BULK_BATCH_SIZE = 500
+
+# Rows moved to OVERDUE per UPDATE by the mark_overdue command.
+TODO_OVERDUE_BATCH_SIZE = 1000
+
+# Todo items checked per transaction by the repair_tag_lists command.
+TODO_TAG_LIST_BATCH_SIZE = 1000
+
+# Rendered /api/todos/ pages are cached in the "todo_list" cache, an LRU
+# bounded by MAX_ENTRIES. Point TODO_LIST_CACHE_ALIAS at a shared backend
+# (Redis, Memcached) when running several worker processes, or set it to
+# None to turn the cache off.
+CACHES = {
+    "default": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+    },
+    "todo_list": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        "LOCATION": "todo-list",
+        "TIMEOUT": 300,
+        "OPTIONS": {"MAX_ENTRIES": 1000},
+    },
 }
+TODO_LIST_CACHE_ALIAS = "todo_list"
+
+# Tombstones of deleted todos are kept for the change feed this many days,
+# then removed by the prune_tombstones command. Cursors that have not seen
+# every deletion up to then get 410 Gone and must sync again from the
+# start. None keeps tombstones forever.
+TODO_TOMBSTONE_RETENTION_DAYS = 30
+
+# Rows fetched per round trip by the streaming export; tags are loaded once
+# per chunk.
+TODO_EXPORT_CHUNK_SIZE = 2000
+
+# Valid rows written per transaction by the import_todos command.
+TODO_IMPORT_CHUNK_SIZE = 5000
+
+# The change event stream keeps the last TODO_EVENTS_BUFFER events for
+# clients resuming with Last-Event-ID, and sends a heartbeat comment after
+# TODO_EVENTS_HEARTBEAT idle seconds.
+TODO_EVENTS_BUFFER = 1000
+TODO_EVENTS_HEARTBEAT = 15
+
+# Every request reports its query count, SQL time and total time in a
+# Server-Timing header (set TODO_SERVER_TIMING to False to omit it) and on
+# the "todo_app.requests" logger. Views over their query_budget are logged
+# as warnings, or raise QueryBudgetExceeded when TODO_QUERY_BUDGET_STRICT is
+# on, as it is under the test runner.
+TODO_SERVER_TIMING = True
+TODO_QUERY_BUDGET_STRICT = False
+TEST_RUNNER = "todo_app.tests.runner.TestRunner"
+
+# Request metrics are served at /api/metrics/. Worker processes on one host
+# pool them by writing their totals to TODO_METRICS_DIR at most every
+# TODO_METRICS_FLUSH_INTERVAL seconds; None reports the scraped process only.
+TODO_METRICS_DIR = None
+TODO_METRICS_FLUSH_INTERVAL = 5
@@ -1,5 +1,16 @@
 from django.contrib import admin
+from django.contrib.admin.views.main import ORDER_VAR, ChangeList
+from django.db import connections
 from .models import TodoItem, Tag
+from .search import fts_supported, search_todos
+
+
+class TodoItemChangeList(ChangeList):
+    def get_ordering(self, request, queryset):
+        # Keep full-text matches in rank order unless a column is sorted.
+        if ORDER_VAR not in self.params and "search_rank" in queryset.query.annotations:
+            return ["search_rank", "pk"]
+        return super().get_ordering(request, queryset)
 
 
 # Register your models here.
@@ -21,3 +32,11 @@ class TodoItemAdmin(admin.ModelAdmin):
         ("Optional Information", {"fields": ("due_date", "tags")}),
         ("Read-Only Fields", {"fields": ("timestamp",)}),
     )
+
+    def get_search_results(self, request, queryset, search_term):
+        if not fts_supported(connections[queryset.db]):
+            return super().get_search_results(request, queryset, search_term)
+        return search_todos(queryset, search_term), False
+
+    def get_changelist(self, request, **kwargs):
+        return TodoItemChangeList
@@ -1,6 +1,35 @@
 from django.apps import AppConfig
+from django.db.models.signals import post_migrate
+
+
+def install_search_index(sender, using, **kwargs):
+    from django.db import connections
+    from .search import install_fts
+
+    install_fts(connections[using])
+
+
+def install_list_version(sender, using, **kwargs):
+    from django.db import connections
+    from .conditional import install_list_version
+
+    install_list_version(connections[using])
+
+
+def install_todo_counters(sender, using, **kwargs):
+    from django.db import connections
+    from .stats import install_counters
+
+    install_counters(connections[using])
 
 
 class TodoAppConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "todo_app"
+
+    def ready(self):
+        from . import signals  # noqa: F401
+
+        post_migrate.connect(install_search_index, sender=self)
+        post_migrate.connect(install_list_version, sender=self)
+        post_migrate.connect(install_todo_counters, sender=self)
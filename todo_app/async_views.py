@@ -0,0 +1,206 @@
+from asgiref.sync import sync_to_async
+from django.http import HttpResponse, StreamingHttpResponse
+from django.views import View
+from django.views.decorators.csrf import csrf_exempt
+from rest_framework import exceptions, status
+from rest_framework.request import Request
+from .authentication import CachedBasicAuthentication
+from .events import hub
+from .filters import TodoItemFilterBackend, TodoItemSearchBackend
+from .models import TodoItem
+from .pagination import TodoItemCursorPagination
+from .renderers import FastJSONParser, FastJSONRenderer
+from .serializers import TodoItemReadSerializer, TodoItemSerializer
+from .services import DELETE_TODO_QUERIES, TRANSACTION_QUERIES
+
+
+class AsyncAPIView(View):
+    """Base for native async JSON views.
+
+    DRF's generic views are synchronous, so under ASGI each request would be
+    handed to a worker thread for its whole lifetime. These views run on the
+    event loop instead: reads use the async ORM and only writes, which need
+    ``transaction.atomic``, hop to a thread for the duration of the save.
+    They reuse the DRF pieces that do no I/O (request parsing, filters,
+    serializers, keyset pagination and the JSON renderer) so responses match
+    the synchronous endpoints byte for byte, and authenticate with
+    ``CachedBasicAuthentication.aauthenticate``.
+    """
+
+    authentication = CachedBasicAuthentication()
+    renderer = FastJSONRenderer()
+
+    @classmethod
+    def as_view(cls, **initkwargs):
+        # As DRF's APIView does: CSRF protects cookie sessions, and these
+        # views only accept Basic credentials, which a browser never sends
+        # cross-site on its own.
+        return csrf_exempt(super().as_view(**initkwargs))
+
+    async def dispatch(self, request, *args, **kwargs):
+        self.request = Request(request, parsers=[FastJSONParser()])
+        handler = getattr(self, request.method.lower(), None)
+        if handler is None or request.method.lower() not in self.http_method_names:
+            return self.render(
+                {"detail": f'Method "{request.method}" not allowed.'},
+                status.HTTP_405_METHOD_NOT_ALLOWED,
+            )
+        try:
+            await self.authenticate(request)
+            return await handler(self.request, *args, **kwargs)
+        except exceptions.APIException as exc:
+            return self.handle_exception(exc)
+
+    async def authenticate(self, request):
+        result = await self.authentication.aauthenticate(request)
+        if result is None:
+            raise exceptions.NotAuthenticated()
+        self.request.user = result[0]
+
+    def handle_exception(self, exc):
+        response = self.render(
+            (
+                exc.detail
+                if isinstance(exc.detail, (list, dict))
+                else {"detail": exc.detail}
+            ),
+            exc.status_code,
+        )
+        if exc.status_code == status.HTTP_401_UNAUTHORIZED:
+            response["WWW-Authenticate"] = self.authentication.authenticate_header(
+                self.request
+            )
+        return response
+
+    def render(self, data, status_code=status.HTTP_200_OK):
+        return HttpResponse(
+            self.renderer.render(data) if data is not None else b"",
+            status=status_code,
+            content_type="application/json",
+        )
+
+    @staticmethod
+    def save(serializer):
+        """Save and serialize in one worker thread: the serializer's writes
+        run in ``transaction.atomic`` and reading back the tags queries."""
+        serializer.save()
+        instance = serializer.instance
+        if hasattr(instance, "_prefetched_objects_cache"):
+            instance._prefetched_objects_cache = {}
+        return serializer.data
+
+
+class AsyncTodoItemListCreateView(AsyncAPIView):
+    """Async twin of ``TodoItemListCreateView``: filtered, searchable
+    keyset pages on GET and single creates on POST.
+
+    Conditional requests and the rendered page cache stay with the
+    synchronous endpoint.
+    """
+
+    http_method_names = ["get", "post"]
+    # GET: authentication and the page, tags included.
+    query_budget = {
+        "GET": CachedBasicAuthentication.queries + 1,
+        "POST": CachedBasicAuthentication.queries
+        + TodoItemSerializer.create_queries
+        + 1,
+    }
+    filter_backends = [TodoItemFilterBackend, TodoItemSearchBackend]
+
+    async def get(self, request, *args, **kwargs):
+        # The same rows and serializer as the synchronous list's reads.
+        queryset = TodoItemReadSerializer.select(TodoItem.objects.all())
+        for backend in self.filter_backends:
+            queryset = backend().filter_queryset(request, queryset, self)
+        paginator = TodoItemCursorPagination()
+        page = paginator.get_page_queryset(queryset, request)
+        rows = paginator.build_page([row async for row in page])
+        return self.render(
+            {
+                "next": paginator.get_next_link(),
+                "previous": paginator.get_previous_link(),
+                "results": TodoItemReadSerializer(rows, many=True).data,
+            }
+        )
+
+    async def post(self, request, *args, **kwargs):
+        serializer = TodoItemSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        data = await sync_to_async(self.save)(serializer)
+        return self.render(data, status.HTTP_201_CREATED)
+
+
+class AsyncTodoItemDetailView(AsyncAPIView):
+    """Async twin of ``TodoItemDetailView`` without conditional GET."""
+
+    http_method_names = ["get", "put", "patch", "delete"]
+    # GET reads one row, tags included. PUT and PATCH load the todo and its
+    # tags; DELETE reads the row to delete inside its transaction.
+    query_budget = {
+        "GET": CachedBasicAuthentication.queries + 1,
+        "PUT": CachedBasicAuthentication.queries
+        + 2
+        + TodoItemSerializer.update_queries
+        + 1,
+        "DELETE": CachedBasicAuthentication.queries
+        + TRANSACTION_QUERIES
+        + 1
+        + DELETE_TODO_QUERIES,
+    }
+    query_budget["PATCH"] = query_budget["PUT"]
+
+    async def get_object(self, pk, queryset=None):
+        if queryset is None:
+            queryset = TodoItem.objects.prefetch_related("tags")
+        try:
+            return await queryset.aget(pk=pk)
+        except TodoItem.DoesNotExist:
+            raise exceptions.NotFound("No TodoItem matches the given query.")
+
+    async def get(self, request, pk):
+        row = await self.get_object(
+            pk, TodoItemReadSerializer.select(TodoItem.objects.all())
+        )
+        return self.render(TodoItemReadSerializer(row).data)
+
+    async def put(self, request, pk, partial=False):
+        todo = await self.get_object(pk)
+        serializer = TodoItemSerializer(todo, data=request.data, partial=partial)
+        serializer.is_valid(raise_exception=True)
+        return self.render(await sync_to_async(self.save)(serializer))
+
+    async def patch(self, request, pk):
+        return await self.put(request, pk, partial=True)
+
+    async def delete(self, request, pk):
+        deleted, _ = await TodoItem.objects.filter(pk=pk).adelete()
+        if not deleted:
+            raise exceptions.NotFound("No TodoItem matches the given query.")
+        return self.render(None, status.HTTP_204_NO_CONTENT)
+
+
+class TodoEventStreamView(AsyncAPIView):
+    """Server-Sent Events stream of todo and tag changes.
+
+    Events are ``todo.created``, ``todo.updated`` and ``todo.deleted`` with
+    the todo ``id``; ``todos.changed`` with the ``ids`` touched by a bulk
+    write (null when unknown); and ``tag.updated`` / ``tag.deleted``. They
+    are sent once the write commits. Reconnecting clients resume from the
+    ``Last-Event-ID`` header (or ``?last_event_id=``). Serve it from an
+    ASGI server: every open stream is an idle coroutine, not a thread.
+    """
+
+    http_method_names = ["get"]
+    query_budget = CachedBasicAuthentication.queries
+
+    async def get(self, request, *args, **kwargs):
+        last_event_id = request.headers.get(
+            "Last-Event-ID"
+        ) or request.query_params.get("last_event_id")
+        response = StreamingHttpResponse(
+            hub.stream(last_event_id), content_type="text/event-stream"
+        )
+        response["Cache-Control"] = "no-cache"
+        response["X-Accel-Buffering"] = "no"
+        return response
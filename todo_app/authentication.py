@@ -0,0 +1,148 @@
+import hashlib
+import hmac
+import secrets
+import threading
+import time
+from collections import OrderedDict
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.utils.crypto import constant_time_compare
+from rest_framework import authentication
+
+
+class CredentialCache:
+    """Bounded LRU of recently verified Basic credentials with a TTL.
+
+    Entries are keyed on an HMAC of the raw credential under a per-process
+    random salt, so plaintext passwords are never kept in memory. Each entry
+    remembers the username, password hash and active flag the user had when
+    the credential was verified; a lookup only counts as a hit while all
+    three are unchanged.
+    """
+
+    def __init__(self, max_entries=1024, ttl=300):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._salt = secrets.token_bytes(32)
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def make_key(self, userid, password):
+        message = f"{userid}\0{password}".encode()
+        return hmac.new(self._salt, message, hashlib.sha256).digest()
+
+    @staticmethod
+    def fingerprint(user):
+        return f"{user.get_username()}\0{user.password}\0{int(user.is_active)}"
+
+    def get(self, key):
+        """Return ``(user_pk, fingerprint)`` for a live entry, else None."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            user_pk, fingerprint, expires_at = entry
+            if expires_at <= time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return user_pk, fingerprint
+
+    def set(self, key, user):
+        if self.max_entries <= 0:
+            return
+        expires_at = time.monotonic() + self.ttl
+        with self._lock:
+            self._entries[key] = (user.pk, self.fingerprint(user), expires_at)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def discard(self, key):
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+credential_cache = CredentialCache(
+    max_entries=getattr(settings, "TODO_AUTH_CACHE_MAX_ENTRIES", 1024),
+    ttl=getattr(settings, "TODO_AUTH_CACHE_TTL", 300),
+)
+
+
+class CachedBasicAuthentication(authentication.BasicAuthentication):
+    """BasicAuthentication that skips the password hash for repeat callers.
+
+    A successful verification is remembered in ``credential_cache``. On a hit
+    the user is reloaded by primary key (a single indexed query) and the
+    cached fingerprint is compared against the fresh row, so a password
+    change, rename or deactivation falls through to a full verification.
+    """
+
+    credential_cache = credential_cache
+    # At most: the reload on a hit, then the full check when it no longer
+    # matches.
+    queries = 2
+
+    def authenticate_credentials(self, userid, password, request=None):
+        cache = self.credential_cache
+        key = cache.make_key(userid, password)
+        cached = cache.get(key)
+        if cached is not None:
+            user_pk, fingerprint = cached
+            user = get_user_model()._default_manager.filter(pk=user_pk).first()
+            if self.matches(user, fingerprint):
+                return (user, None)
+            cache.discard(key)
+
+        user, auth = super().authenticate_credentials(userid, password, request)
+        cache.set(key, user)
+        return (user, auth)
+
+    async def aauthenticate(self, request):
+        """Async ``authenticate`` for plain Django async views.
+
+        A cache hit costs one async query; a miss runs the password check
+        in a worker thread so the hash does not block the event loop.
+        """
+        credentials = BasicCredentials().authenticate(request)
+        if credentials is None:
+            return None
+        userid, password = credentials
+        cache = self.credential_cache
+        key = cache.make_key(userid, password)
+        cached = cache.get(key)
+        if cached is not None:
+            user_pk, fingerprint = cached
+            user = await get_user_model()._default_manager.filter(pk=user_pk).afirst()
+            if self.matches(user, fingerprint):
+                return (user, None)
+            cache.discard(key)
+        return await sync_to_async(self.authenticate_credentials)(
+            userid, password, request
+        )
+
+    def matches(self, user, fingerprint):
+        return (
+            user is not None
+            and user.is_active
+            and constant_time_compare(
+                fingerprint, self.credential_cache.fingerprint(user)
+            )
+        )
+
+
+class BasicCredentials(authentication.BasicAuthentication):
+    """Parses the Basic ``Authorization`` header into ``(userid, password)``
+    without verifying it."""
+
+    def authenticate_credentials(self, userid, password, request=None):
+        return userid, password
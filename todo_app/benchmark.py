@@ -0,0 +1,282 @@
+import base64
+import math
+import platform
+import random
+import statistics
+import time
+from itertools import accumulate
+
+import django
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.db.models import Max, Min
+from django.test import Client
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+from .models import Tag, TodoItem
+
+OPERATIONS = ["list", "detail", "create", "update", "delete"]
+STATUS_WEIGHTS = {
+    "OPEN": 40,
+    "WORKING": 20,
+    "PENDING REVIEW": 10,
+    "COMPLETED": 20,
+    "OVERDUE": 5,
+    "CANCELLED": 5,
+}
+WORDS = (
+    "report review invoice meeting deploy release budget draft email call "
+    "plan design test fix refactor backup audit migrate update schedule"
+).split()
+
+
+class Dataset:
+    """Random draws shaped like real data: tag popularity follows a Zipf
+    law (a few tags on most todos, a long tail on few), every todo has zero
+    to three tags, and statuses and due dates are skewed the way a live
+    list is."""
+
+    def __init__(self, tags=200, zipf=1.1, seed=0):
+        self.rng = random.Random(seed)
+        self.tag_names = [f"tag-{rank:04d}" for rank in range(1, tags + 1)]
+        self.tag_weights = list(
+            accumulate(1 / rank**zipf for rank in range(1, tags + 1))
+        )
+        self.statuses = list(STATUS_WEIGHTS)
+        self.status_weights = list(accumulate(STATUS_WEIGHTS.values()))
+
+    def tags(self):
+        count = self.rng.choices((0, 1, 2, 3), weights=(20, 40, 30, 10))[0]
+        picked = self.rng.choices(self.tag_names, cum_weights=self.tag_weights, k=count)
+        return list(dict.fromkeys(picked))
+
+    def todo(self, now):
+        due = None
+        if self.rng.random() < 0.6:
+            due = now + timezone.timedelta(hours=self.rng.randint(1, 24 * 90))
+        (status,) = self.rng.choices(self.statuses, cum_weights=self.status_weights)
+        return {
+            "title": " ".join(self.rng.choices(WORDS, k=3)).capitalize(),
+            "description": " ".join(self.rng.choices(WORDS, k=12)),
+            "due_date": due,
+            "status": status,
+        }
+
+
+def seed(size, dataset, batch_size=5000):
+    """Insert todos, with tags, until the table holds ``size`` rows."""
+    existing = TodoItem.objects.count()
+    tags = Tag.objects.resolve(dataset.tag_names)
+    Through = TodoItem.tags.through
+    now = timezone.now()
+    start = time.perf_counter()
+    for offset in range(existing, size, batch_size):
+        count = min(batch_size, size - offset)
+        names = [dataset.tags() for _ in range(count)]
+        todos = TodoItem.objects.bulk_create(
+            TodoItem(
+                **dataset.todo(now),
+                tag_list=sorted(
+                    ({"id": tags[name].pk, "name": name} for name in todo_names),
+                    key=lambda tag: tag["id"],
+                ),
+            )
+            for todo_names in names
+        )
+        Through.objects.bulk_create(
+            Through(todoitem_id=todo.pk, tag_id=tags[name].pk)
+            for todo, todo_names in zip(todos, names)
+            for name in todo_names
+        )
+    return time.perf_counter() - start
+
+
+def percentile(sorted_values, percent):
+    """Nearest-rank percentile of an already sorted list."""
+    rank = max(1, math.ceil(percent / 100 * len(sorted_values)))
+    return sorted_values[rank - 1]
+
+
+def summarize(latencies, queries, elapsed):
+    latencies = sorted(latencies)
+    return {
+        "requests": len(latencies),
+        "throughput_rps": round(len(latencies) / elapsed, 1) if elapsed else None,
+        "mean_ms": round(statistics.fmean(latencies) * 1000, 3),
+        "p50_ms": round(percentile(latencies, 50) * 1000, 3),
+        "p95_ms": round(percentile(latencies, 95) * 1000, 3),
+        "p99_ms": round(percentile(latencies, 99) * 1000, 3),
+        "queries_mean": round(statistics.fmean(queries), 2),
+        "queries_max": max(queries),
+    }
+
+
+class Runner:
+    """Drive the API in-process with Django's test client, authenticating
+    with HTTP Basic like a real caller, and time each request."""
+
+    username = "benchmark"
+    password = "benchmark-password"
+
+    def __init__(self, dataset, requests=200):
+        self.dataset = dataset
+        self.requests = requests
+        user_model = get_user_model()
+        if not user_model.objects.filter(username=self.username).exists():
+            user_model.objects.create_user(self.username, password=self.password)
+        token = base64.b64encode(f"{self.username}:{self.password}".encode()).decode()
+        self.client = Client(HTTP_AUTHORIZATION=f"Basic {token}")
+        self.created = []
+
+    def measure(self, name, requests, expected_status):
+        latencies, queries = [], []
+        start = time.perf_counter()
+        for method, url, data in requests:
+            with CaptureQueriesContext(connection) as captured:
+                began = time.perf_counter()
+                response = method(url, data, content_type="application/json")
+                latencies.append(time.perf_counter() - began)
+            if response.status_code != expected_status:
+                raise RuntimeError(
+                    f"{name} {url} returned {response.status_code}: "
+                    f"{response.content[:200]!r}"
+                )
+            queries.append(len(captured))
+            if name == "create":
+                self.created.append(response.json()["id"])
+        return summarize(latencies, queries, time.perf_counter() - start)
+
+    def run(self):
+        self.client.get(reverse("todo-list-create"))  # Warm the credential cache.
+        rng = self.dataset.rng
+        ids = self.sample_ids()
+        now = timezone.now()
+        list_url = reverse("todo-list-create")
+        results = {}
+        results["list"] = self.measure(
+            "list",
+            ((self.client.get, list_url, {}) for _ in range(self.requests)),
+            200,
+        )
+        results["detail"] = self.measure(
+            "detail",
+            ((self.client.get, reverse("todo-detail", args=[pk]), {}) for pk in ids),
+            200,
+        )
+        results["create"] = self.measure(
+            "create",
+            (
+                (self.client.post, list_url, self.payload(now))
+                for _ in range(self.requests)
+            ),
+            201,
+        )
+        results["update"] = self.measure(
+            "update",
+            (
+                (
+                    self.client.patch,
+                    reverse("todo-detail", args=[pk]),
+                    {"status": rng.choice(self.dataset.statuses)},
+                )
+                for pk in ids
+            ),
+            200,
+        )
+        # Delete what the create phase added so the dataset keeps its size.
+        results["delete"] = self.measure(
+            "delete",
+            (
+                (self.client.delete, reverse("todo-detail", args=[pk]), None)
+                for pk in list(self.created)
+            ),
+            204,
+        )
+        self.created.clear()
+        return results
+
+    def sample_ids(self):
+        """Ids of ``requests`` todos spread over the whole table, each found
+        with an index seek from a random point in the id range."""
+        rng = self.dataset.rng
+        bounds = TodoItem.objects.aggregate(low=Min("pk"), high=Max("pk"))
+        ids = []
+        for _ in range(self.requests):
+            start = rng.randint(bounds["low"], bounds["high"])
+            ids.append(
+                TodoItem.objects.filter(pk__gte=start)
+                .order_by("pk")
+                .values_list("pk", flat=True)
+                .first()
+            )
+        return ids
+
+    def payload(self, now):
+        todo = self.dataset.todo(now)
+        todo["due_date"] = todo["due_date"] and todo["due_date"].isoformat()
+        todo["tags"] = [{"name": name} for name in self.dataset.tags()]
+        return todo
+
+
+def run_benchmark(sizes, requests=200, tags=200, seed_value=0, log=None):
+    """Seed each dataset size in turn (ascending, topping up the previous
+    one) and benchmark every operation against it.
+
+    Returns a JSON-serializable report.
+    """
+    dataset = Dataset(tags=tags, seed=seed_value)
+    report = {
+        "meta": {
+            "started_at": timezone.now().isoformat(),
+            "python": platform.python_version(),
+            "django": django.get_version(),
+            "database": connection.vendor,
+            "requests_per_operation": requests,
+            "tags": tags,
+            "seed": seed_value,
+        },
+        "datasets": [],
+    }
+    for size in sorted(sizes):
+        if log:
+            log(f"Seeding {size} todos...")
+        seconds = seed(size, dataset)
+        if log:
+            log(f"Benchmarking {size} todos...")
+        operations = Runner(dataset, requests=requests).run()
+        report["datasets"].append(
+            {"size": size, "seed_seconds": round(seconds, 2), "operations": operations}
+        )
+    return report
+
+
+def compare(baseline, current):
+    """Yield ``(size, operation, metric, before, after, change)`` for p95
+    latency and throughput present in both reports; ``change`` is the
+    relative difference, positive when ``current`` is worse."""
+    before = {
+        (dataset["size"], name): stats
+        for dataset in baseline["datasets"]
+        for name, stats in dataset["operations"].items()
+    }
+    for dataset in current["datasets"]:
+        for name, stats in dataset["operations"].items():
+            old = before.get((dataset["size"], name))
+            if old is None:
+                continue
+            for metric, worse_when_higher in (
+                ("p95_ms", True),
+                ("throughput_rps", False),
+            ):
+                if not old.get(metric) or stats.get(metric) is None:
+                    continue
+                change = (stats[metric] - old[metric]) / old[metric]
+                yield (
+                    dataset["size"],
+                    name,
+                    metric,
+                    old[metric],
+                    stats[metric],
+                    change if worse_when_higher else -change,
+                )
@@ -0,0 +1,100 @@
+import hashlib
+import threading
+import uuid
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import transaction
+from django.http import HttpResponse
+
+
+class ListResponseCache:
+    """Rendered todo list responses, keyed by request and data generation.
+
+    Keys combine a generation token stored in the same cache backend with
+    the list ETag (itself derived from the query string, the negotiated
+    format and the latest write). Any write replaces the generation token,
+    making every cached page unreachable at once; the old entries then age
+    out of the backend's LRU. Should the token itself be evicted a fresh
+    one is drawn, which can only cause misses, never stale hits.
+
+    The backend is the ``TODO_LIST_CACHE_ALIAS`` entry of ``CACHES``; set the
+    alias to None to disable caching. Entries in a per-process backend such
+    as local memory are also keyed on the ETag, so a write made by another
+    process is still noticed on the next read.
+    """
+
+    generation_key = "todo-list:generation"
+    # Set per request by the view or the middleware, never replayed.
+    uncached_headers = {"x-cache", "server-timing"}
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def backend(self):
+        alias = getattr(settings, "TODO_LIST_CACHE_ALIAS", None)
+        return caches[alias] if alias else None
+
+    def generation(self, backend):
+        generation = backend.get(self.generation_key)
+        if generation is None:
+            generation = uuid.uuid4().hex
+            if not backend.add(self.generation_key, generation, timeout=None):
+                generation = backend.get(self.generation_key, generation)
+        return generation
+
+    def make_key(self, request, etag):
+        """Return the cache key for ``request``, or None if not cacheable.
+
+        Only JSON renderings are cached; the browsable API embeds
+        per-user content. The scheme and host are part of the key because
+        pages link to their neighbours with absolute URLs.
+        """
+        backend = self.backend
+        if backend is None or request.accepted_renderer.format != "json":
+            return None
+        origin = f"{request.scheme}://{request.get_host()}"
+        digest = hashlib.sha1(
+            f"{origin}\0{etag}".encode(), usedforsecurity=False
+        ).hexdigest()
+        return f"todo-list:{self.generation(backend)}:{digest}"
+
+    def get(self, key):
+        cached = self.backend.get(key)
+        with self._lock:
+            if cached is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+        content, headers = cached
+        return HttpResponse(content, headers=headers)
+
+    def set(self, key, response):
+        """Store the rendered body with the headers the view set on it
+        (Content-Type, Vary, Allow, ETag and so on), so a hit carries the
+        same headers as the miss that filled it."""
+        if response.status_code == 200:
+            headers = {
+                name: value
+                for name, value in response.items()
+                if name.lower() not in self.uncached_headers
+            }
+            self.backend.set(key, (response.content, headers))
+
+    def invalidate(self):
+        backend = self.backend
+        if backend is not None:
+            backend.set(self.generation_key, uuid.uuid4().hex, timeout=None)
+
+    def invalidate_on_commit(self, using=None):
+        transaction.on_commit(self.invalidate, using=using)
+
+    def stats(self):
+        with self._lock:
+            return {"hits": self.hits, "misses": self.misses}
+
+
+list_cache = ListResponseCache()
@@ -0,0 +1,128 @@
+import base64
+import json
+import time
+from collections import namedtuple
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import NotSupportedError, connections
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+from .conditional import versions_supported
+from .models import TodoItem, TodoItemTombstone, TodoListVersion
+
+
+class InvalidCursor(ValueError):
+    pass
+
+
+class ResyncRequired(InvalidCursor):
+    """The cursor predates the tombstone retention, so deletions it has not
+    seen may already be pruned."""
+
+
+TombstonePrune = namedtuple("TombstonePrune", ["deleted", "seconds"])
+
+
+def tombstone_retention():
+    days = getattr(settings, "TODO_TOMBSTONE_RETENTION_DAYS", 30)
+    return None if days is None else timedelta(days=days)
+
+
+def encode_cursor(position, seen):
+    """Encode the last change number returned, and the time up to which
+    every deletion the client needs has been seen."""
+    payload = {"c": position, "s": seen.isoformat()}
+    return base64.urlsafe_b64encode(json.dumps(payload).encode()).decode("ascii")
+
+
+def decode_cursor(cursor):
+    try:
+        payload = json.loads(base64.urlsafe_b64decode(cursor.encode("ascii")))
+        legacy = "c" not in payload and "u" in payload
+        position = None if legacy else int(payload["c"])
+        seen = parse_datetime(payload["s"])
+        # encode_cursor() always writes an offset.
+        if seen is None or timezone.is_naive(seen):
+            raise ValueError(payload["s"])
+    except (TypeError, ValueError, KeyError, AttributeError):
+        raise InvalidCursor(cursor)
+    if legacy:
+        # Positioned by time, from before change numbers.
+        raise ResyncRequired(cursor)
+    return position, seen
+
+
+def changes_since(cursor=None, limit=500):
+    """Return the todos updated and deleted after ``cursor``.
+
+    Todos and tombstones are read in ``change_seq`` order, the list version
+    their last write was stamped with, each with a seek on its
+    ``change_seq`` index, so the cost follows the number of changes, not
+    the size of the table. Writes commit one at a time and stamp a higher
+    number than any write committed before them, so a transaction that ran
+    long, or waited for the lock, before committing is still ahead of
+    every cursor handed out meanwhile. No cursor means "from the start".
+
+    Tombstones are pruned after ``TODO_TOMBSTONE_RETENTION_DAYS``; a cursor
+    that has not seen every deletion up to then raises ``ResyncRequired``,
+    and the client has to start again without one.
+
+    Returns ``(updated_todos, deleted_ids, next_cursor, has_more)``; the
+    next cursor is never behind the one passed in. Needs the change
+    triggers, which only exist on SQLite.
+    """
+    if not versions_supported(connections[TodoItem.objects.db]):
+        raise NotSupportedError("The change feed needs SQLite's change triggers.")
+    position, seen = decode_cursor(cursor) if cursor else (0, None)
+    now = timezone.now()
+    retention = tombstone_retention()
+    if seen and retention is not None and seen < now - retention:
+        raise ResyncRequired(cursor)
+
+    # Each query reads its own snapshot, so both stop at the version read
+    # first: every number up to it belongs to a committed write, and one
+    # committing between the two queries cannot push the cursor past a
+    # todo the first query missed.
+    version = TodoListVersion.objects.values_list("version", flat=True).first() or 0
+    window = {"change_seq__gt": position, "change_seq__lte": version}
+    updated = list(
+        TodoItem.objects.filter(**window)
+        .prefetch_related("tags")
+        .order_by("change_seq", "id")[: limit + 1]
+    )
+    deleted = list(
+        TodoItemTombstone.objects.filter(**window)
+        .order_by("change_seq", "id")
+        .values_list("change_seq", "todo_id")[: limit + 1]
+    )
+
+    # The first ``limit`` changes of both streams together.
+    changes = sorted(
+        [todo.change_seq for todo in updated] + [row[0] for row in deleted]
+    )
+    has_more = len(changes) > limit
+    if changes:
+        position = changes[:limit][-1]
+    updated = [todo for todo in updated if todo.change_seq <= position]
+    deleted = [todo_id for change_seq, todo_id in deleted if change_seq <= position]
+    # Once caught up, the client has seen every deletion made until now.
+    # Until then it keeps the time of its last full catch-up; on a first
+    # sync, the time it started, as deletions made before it never
+    # touched its copy.
+    if not has_more or seen is None:
+        seen = now
+    return updated, deleted, encode_cursor(position, seen), has_more
+
+
+def prune_tombstones(now=None):
+    """Delete tombstones older than ``TODO_TOMBSTONE_RETENTION_DAYS`` with
+    one ``DELETE`` served by the ``(deleted_at, id)`` index. Does nothing
+    when the retention is None."""
+    retention = tombstone_retention()
+    start = time.perf_counter()
+    deleted = 0
+    if retention is not None:
+        cutoff = (now or timezone.now()) - retention
+        deleted, _ = TodoItemTombstone.objects.filter(deleted_at__lt=cutoff).delete()
+    return TombstonePrune(deleted, time.perf_counter() - start)
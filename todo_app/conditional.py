@@ -0,0 +1,216 @@
+import hashlib
+
+from django.db.models import Max, Subquery
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date
+from .models import Tag, TodoItem, TodoItemTombstone, TodoListVersion
+
+VERSION_TABLE = TodoListVersion._meta.db_table
+TODO_TABLE = TodoItem._meta.db_table
+LINK_TABLE = TodoItem.tags.through._meta.db_table
+TAG_TABLE = Tag._meta.db_table
+TOMBSTONE_TABLE = TodoItemTombstone._meta.db_table
+
+BUMP_VERSION = f"UPDATE {VERSION_TABLE} SET version = version + 1;"
+
+
+def stamp_change(table):
+    return (
+        f"UPDATE {table} SET change_seq = (SELECT version FROM {VERSION_TABLE}) "
+        f"WHERE id = new.id;"
+    )
+
+
+# Bump the list version in the transaction of every write that can change
+# a list response: todos, tag links (tag filters) and tag names. Written
+# todos and new tombstones also take the bumped version as their
+# change_seq. SQLite runs one write transaction at a time, so a later
+# commit always stamps a higher number, however early it stamped
+# updated_at. The stamp itself raises change_seq, which the WHEN clause
+# skips, so it does not fire the update trigger again.
+VERSION_TRIGGERS = {
+    **{
+        f"{VERSION_TABLE}_{prefix}_a{event[0].lower()}": (
+            f"AFTER {event} ON {table} BEGIN {BUMP_VERSION} END"
+        )
+        for prefix, table, events in [
+            ("link", LINK_TABLE, ["INSERT", "UPDATE", "DELETE"]),
+            ("tag", TAG_TABLE, ["UPDATE"]),
+        ]
+        for event in events
+    },
+    f"{VERSION_TABLE}_todo_ai": (
+        f"AFTER INSERT ON {TODO_TABLE} BEGIN "
+        f"{BUMP_VERSION} {stamp_change(TODO_TABLE)} END"
+    ),
+    f"{VERSION_TABLE}_todo_au": (
+        f"AFTER UPDATE ON {TODO_TABLE} WHEN new.change_seq <= old.change_seq "
+        f"BEGIN {BUMP_VERSION} {stamp_change(TODO_TABLE)} END"
+    ),
+    f"{VERSION_TABLE}_todo_ad": f"AFTER DELETE ON {TODO_TABLE} BEGIN {BUMP_VERSION} END",
+    f"{VERSION_TABLE}_tombstone_ai": (
+        f"AFTER INSERT ON {TOMBSTONE_TABLE} BEGIN "
+        f"{BUMP_VERSION} {stamp_change(TOMBSTONE_TABLE)} END"
+    ),
+}
+
+
+def make_etag(*parts):
+    digest = hashlib.sha1(
+        "\0".join(str(part) for part in parts).encode(), usedforsecurity=False
+    )
+    return f'"{digest.hexdigest()}"'
+
+
+class ConditionalGetMixin:
+    """Answer ``If-None-Match`` / ``If-Modified-Since`` before any work.
+
+    Views provide ``get_validators(request)``, returning an ``(etag,
+    last_modified)`` pair from a cheap query, or ``(None, None)`` when there
+    is nothing to validate against; ``last_modified`` may be None on its
+    own. A matching request gets a bare 304 without touching the
+    serializer; any other 200 response carries the ``ETag`` and, when
+    there is one, ``Last-Modified`` header.
+    """
+
+    def get_validators(self, request):
+        raise NotImplementedError
+
+    def conditional_response(self, request, handler, *args, **kwargs):
+        etag, last_modified = self.get_validators(request)
+        self.etag = etag
+        if etag is None:
+            return handler(request, *args, **kwargs)
+        timestamp = int(last_modified.timestamp()) if last_modified else None
+        not_modified = get_conditional_response(
+            request, etag=etag, last_modified=timestamp
+        )
+        if not_modified is not None:
+            not_modified["ETag"] = etag
+            return not_modified
+        response = handler(request, *args, **kwargs)
+        if response.status_code == 200:
+            response["ETag"] = etag
+            if timestamp is not None:
+                response["Last-Modified"] = http_date(timestamp)
+        return response
+
+
+def versions_supported(connection):
+    return connection.vendor == "sqlite"
+
+
+def install_list_version(connection):
+    """Create the version row, and the triggers if any are missing.
+
+    ``latest_changes`` reads from the row, so it is created on every
+    backend, and again after a flush empties the table. Reinstalling the
+    triggers bumps the version, since writes made while one was missing
+    went uncounted. Runs after every migrate and flush, like the search
+    index triggers, and does nothing until the version table exists; the
+    triggers wait for the ``change_seq`` columns they stamp.
+    """
+    with connection.cursor() as cursor:
+        if VERSION_TABLE not in connection.introspection.table_names(cursor):
+            return False
+        cursor.execute(
+            f"INSERT INTO {VERSION_TABLE} (id, version) SELECT 1, 0 "
+            f"WHERE NOT EXISTS (SELECT 1 FROM {VERSION_TABLE})"
+        )
+        if not versions_supported(connection):
+            return False
+        for table in (TODO_TABLE, TOMBSTONE_TABLE):
+            columns = connection.introspection.get_table_description(cursor, table)
+            if "change_seq" not in {column.name for column in columns}:
+                return False
+        placeholders = ", ".join(["%s"] * len(VERSION_TRIGGERS))
+        cursor.execute(
+            f"SELECT name FROM sqlite_master WHERE name IN ({placeholders})",
+            sorted(VERSION_TRIGGERS),
+        )
+        if len(cursor.fetchall()) == len(VERSION_TRIGGERS):
+            return False
+        for name, body in VERSION_TRIGGERS.items():
+            cursor.execute(f"CREATE TRIGGER IF NOT EXISTS {name} {body}")
+        cursor.execute(f"UPDATE {VERSION_TABLE} SET version = version + 1")
+    return True
+
+
+def uninstall_list_version(connection):
+    if not versions_supported(connection):
+        return
+    with connection.cursor() as cursor:
+        for name in VERSION_TRIGGERS:
+            cursor.execute(f"DROP TRIGGER IF EXISTS {name}")
+
+
+def latest_changes():
+    """Return the latest todo ``updated_at``, tombstone ``deleted_at`` and
+    list version, in one query whether or not there are any todos.
+
+    The query reads the single version row, with the two timestamps as
+    subqueries that each seek the end of an index. The version stays at 0
+    on backends without the version triggers.
+    """
+    latest_update = TodoItem.objects.order_by("-updated_at").values("updated_at")[:1]
+    latest_delete = TodoItemTombstone.objects.order_by("-deleted_at").values(
+        "deleted_at"
+    )[:1]
+    state = (
+        TodoListVersion.objects.values("version")
+        .annotate(
+            updated_at=Subquery(latest_update), deleted_at=Subquery(latest_delete)
+        )
+        .first()
+    )
+    if state is None:
+        # Only until install_list_version runs again after a migrate.
+        state = {
+            "version": None,
+            **TodoItem.objects.aggregate(updated_at=Max("updated_at")),
+            **TodoItemTombstone.objects.aggregate(deleted_at=Max("deleted_at")),
+        }
+    return state["updated_at"], state["deleted_at"], state["version"]
+
+
+def list_validators(request):
+    """Validators for any todo list: an ETag, and no Last-Modified.
+
+    They are table-wide: the latest ``updated_at`` changes on every create
+    or update and the latest tombstone on every delete, and both are read
+    in one query that seeks the end of their indexes. A write that commits
+    after a later one leaves both maxima alone, so the ETag also holds the
+    list version, which every write bumps. The full query string and the
+    negotiated format are folded in because they select which bytes the
+    response holds.
+
+    A Last-Modified built from those timestamps would miss the same late
+    commits, and writes in the same second as the previous response, so
+    ``If-Modified-Since`` alone would get stale 304s.
+    """
+    updated_at, deleted_at, version = latest_changes()
+    etag = make_etag(
+        updated_at and updated_at.isoformat(),
+        deleted_at and deleted_at.isoformat(),
+        version,
+        request.get_full_path(),
+        request.accepted_renderer.format,
+    )
+    return etag, None
+
+
+def detail_validators(pk, request):
+    """Validators for one todo, read from its ``updated_at`` column alone:
+    an ETag, and no Last-Modified.
+
+    ``updated_at`` has microseconds but ``Last-Modified`` only whole
+    seconds, so ``If-Modified-Since`` would get a stale 304 after a write
+    in the same second as the previous response, as for lists.
+    """
+    updated_at = (
+        TodoItem.objects.filter(pk=pk).values_list("updated_at", flat=True).first()
+    )
+    if updated_at is None:
+        return None, None
+    etag = make_etag(pk, updated_at.isoformat(), request.accepted_renderer.format)
+    return etag, None
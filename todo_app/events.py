@@ -0,0 +1,128 @@
+import asyncio
+import json
+import secrets
+import threading
+from collections import deque, namedtuple
+
+from django.conf import settings
+from django.db import transaction
+
+Event = namedtuple("Event", ["id", "seq", "type", "data"])
+
+
+def _wake(future):
+    if not future.done():
+        future.set_result(None)
+
+
+class EventHub:
+    """In-process fan-out of todo change events to SSE subscribers.
+
+    Published events go into a ring buffer of the last ``buffer_size``
+    events, each with a sequence number. A subscriber remembers the last
+    number it has seen and reads what follows, so a reconnecting client can
+    resume from its ``Last-Event-ID`` as long as the buffer still covers it.
+
+    Waiting is cheap: all subscribers on one event loop await a single
+    shared future, and a publish, which may come from any thread, wakes
+    each loop once with ``call_soon_threadsafe``. The work per event
+    grows with the number of loops, not of subscribers.
+
+    Event ids carry a per-process epoch, so an id issued before a restart or
+    by another worker is treated as lost history rather than mis-resumed.
+    """
+
+    def __init__(self, buffer_size=1000):
+        self.epoch = secrets.token_hex(4)
+        self._events = deque(maxlen=buffer_size)
+        self._last_seq = 0
+        self._waiters = {}
+        self._lock = threading.Lock()
+
+    @property
+    def last_seq(self):
+        return self._last_seq
+
+    def publish(self, type, data):
+        with self._lock:
+            self._last_seq += 1
+            event = Event(f"{self.epoch}-{self._last_seq}", self._last_seq, type, data)
+            self._events.append(event)
+            waiters, self._waiters = self._waiters, {}
+        for loop, future in waiters.items():
+            if not loop.is_closed():
+                loop.call_soon_threadsafe(_wake, future)
+        return event
+
+    def publish_on_commit(self, type, data, using=None):
+        transaction.on_commit(lambda: self.publish(type, data), using=using)
+
+    def resume_from(self, last_event_id):
+        """Return the sequence number to resume after, or None when the id
+        is not one this process has issued. Without an id, start from now."""
+        if not last_event_id:
+            return self._last_seq
+        epoch, _, seq = last_event_id.partition("-")
+        if epoch != self.epoch or not seq.isdigit() or int(seq) > self._last_seq:
+            return None
+        return int(seq)
+
+    def events_after(self, seq):
+        """Return ``(events, complete)``: the buffered events after ``seq``
+        and whether the buffer still held every one of them."""
+        with self._lock:
+            events = [event for event in self._events if event.seq > seq]
+            oldest = self._events[0].seq if self._events else self._last_seq + 1
+        return events, seq >= oldest - 1
+
+    async def wait(self, seq, timeout):
+        """Wait up to ``timeout`` seconds for an event after ``seq``."""
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            if self._last_seq > seq:
+                return
+            future = self._waiters.get(loop)
+            if future is None:
+                future = self._waiters[loop] = loop.create_future()
+        try:
+            # shield() keeps a timeout from cancelling the shared future.
+            await asyncio.wait_for(asyncio.shield(future), timeout)
+        except asyncio.TimeoutError:
+            pass
+
+    async def stream(self, last_event_id=None, heartbeat=None):
+        """Yield Server-Sent Events text for every event after
+        ``last_event_id``, with a comment line every ``heartbeat`` seconds
+        of silence to keep proxies from closing the connection.
+
+        When the events since ``last_event_id`` are no longer buffered a
+        ``reset`` event is sent first; the client should resync, e.g. from
+        the change feed, before applying what follows.
+        """
+        if heartbeat is None:
+            heartbeat = getattr(settings, "TODO_EVENTS_HEARTBEAT", 15)
+        yield f"retry: {int(heartbeat * 1000)}\n\n"
+        seq = self.resume_from(last_event_id)
+        if seq is None:
+            seq = self._last_seq
+            yield format_event("reset", {})
+        while True:
+            events, complete = self.events_after(seq)
+            if not complete:
+                yield format_event("reset", {})
+            for event in events:
+                yield format_event(event.type, event.data, event.id)
+                seq = event.seq
+            if not events:
+                await self.wait(seq, heartbeat)
+                if self._last_seq == seq:
+                    yield ": heartbeat\n\n"
+
+
+def format_event(type, data, id=None):
+    lines = [f"id: {id}"] if id else []
+    lines += [f"event: {type}", f"data: {json.dumps(data)}"]
+    return "\n".join(lines) + "\n\n"
+
+
+hub = EventHub(buffer_size=getattr(settings, "TODO_EVENTS_BUFFER", 1000))
@@ -0,0 +1,71 @@
+import csv
+
+from django.conf import settings
+from .models import TodoItem
+from .renderers import dumps
+from .serializers import TodoItemReadSerializer
+
+EXPORT_FIELDS = TodoItemReadSerializer.fields
+CSV_COLUMNS = EXPORT_FIELDS + ["tags"]
+CSV_TAG_SEPARATOR = "|"
+
+
+class Echo:
+    """File-like object whose ``write`` hands back what it was given, so
+    ``csv.writer`` can format one row at a time for a streaming response."""
+
+    def write(self, value):
+        return value
+
+
+def iter_todos(queryset=None, chunk_size=None):
+    """Yield todos as plain dicts shaped like ``TodoItemSerializer`` output.
+
+    Rows come from a server-side cursor (``QuerySet.iterator``) in chunks of
+    ``chunk_size`` and each chunk is serialized by ``TodoItemReadSerializer``
+    with one tag query, so memory holds one chunk at a time whatever the
+    table size. Todos are exported in ``id`` order.
+    """
+    if queryset is None:
+        queryset = TodoItem.objects.all()
+    if chunk_size is None:
+        chunk_size = getattr(settings, "TODO_EXPORT_CHUNK_SIZE", 2000)
+    rows = TodoItemReadSerializer.select(queryset.order_by("id")).iterator(chunk_size)
+    chunk = []
+    for row in rows:
+        chunk.append(row)
+        if len(chunk) == chunk_size:
+            yield from TodoItemReadSerializer.serialize(chunk)
+            chunk = []
+    if chunk:
+        yield from TodoItemReadSerializer.serialize(chunk)
+
+
+def iter_ndjson(todos):
+    """One JSON document per line."""
+    for todo in todos:
+        yield dumps(todo).decode() + "\n"
+
+
+def iter_json(todos):
+    """One JSON array, written an element at a time."""
+    yield "["
+    for index, todo in enumerate(todos):
+        yield ("," if index else "") + dumps(todo).decode()
+    yield "]\n"
+
+
+def iter_csv(todos):
+    """A header row, then one row per todo with tag names joined by
+    ``CSV_TAG_SEPARATOR``."""
+    writer = csv.writer(Echo())
+    yield writer.writerow(CSV_COLUMNS)
+    for todo in todos:
+        tags = CSV_TAG_SEPARATOR.join(tag["name"] for tag in todo["tags"])
+        yield writer.writerow(
+            [todo[field] if todo[field] is not None else "" for field in EXPORT_FIELDS]
+            + [tags]
+        )
+
+
+WRITERS = {"ndjson": iter_ndjson, "csv": iter_csv, "json": iter_json}
@@ -0,0 +1,97 @@
+from django.db.models import Count
+from rest_framework import serializers
+from rest_framework.filters import BaseFilterBackend
+from .models import TodoItem
+from .search import search_todos
+
+
+class TodoItemFilterBackend(BaseFilterBackend):
+    """Filter todos by status, tags and date ranges from query parameters.
+
+    - ``status``: one or more statuses, repeated or comma separated.
+    - ``tag``: one or more tag names; ``tag_match=all`` requires every tag,
+      the default ``any`` requires at least one.
+    - ``due_before`` / ``due_after``: bounds on ``due_date``.
+    - ``created_before`` / ``created_after``: bounds on ``timestamp``.
+
+    Lower bounds are inclusive and upper bounds exclusive. Status and due
+    date filters are served by the ``(status, due_date)`` and ``due_date``
+    indexes; tag filters by the indexes on the tags through table.
+    """
+
+    date_ranges = {
+        "due_after": "due_date__gte",
+        "due_before": "due_date__lt",
+        "created_after": "timestamp__gte",
+        "created_before": "timestamp__lt",
+    }
+
+    def filter_queryset(self, request, queryset, view):
+        params = request.query_params
+        errors = {}
+
+        statuses = self.get_list(params, "status")
+        if statuses:
+            valid = {choice for choice, _ in TodoItem.STATUS_CHOICES}
+            invalid = [value for value in statuses if value not in valid]
+            if invalid:
+                errors["status"] = [
+                    f'"{value}" is not a valid choice.' for value in invalid
+                ]
+            else:
+                queryset = queryset.filter(status__in=statuses)
+
+        tags = self.get_list(params, "tag")
+        if tags:
+            match = params.get("tag_match", "any")
+            if match not in ("any", "all"):
+                errors["tag_match"] = ['Must be "any" or "all".']
+            else:
+                queryset = queryset.filter(pk__in=self.tagged(tags, match))
+
+        field = serializers.DateTimeField()
+        for param, lookup in self.date_ranges.items():
+            if param not in params:
+                continue
+            try:
+                value = field.to_internal_value(params[param])
+            except serializers.ValidationError as exc:
+                errors[param] = exc.detail
+            else:
+                queryset = queryset.filter(**{lookup: value})
+
+        if errors:
+            raise serializers.ValidationError(errors)
+        return queryset
+
+    @staticmethod
+    def get_list(params, name):
+        values = []
+        for raw in params.getlist(name):
+            values.extend(value.strip() for value in raw.split(",") if value.strip())
+        return list(dict.fromkeys(values))
+
+    @staticmethod
+    def tagged(names, match):
+        """Subquery of ids of todos tagged with any or all of ``names``."""
+        links = TodoItem.tags.through.objects.filter(tag__name__in=names)
+        if match == "all":
+            links = (
+                links.values("todoitem_id")
+                .annotate(matched=Count("tag_id"))
+                .filter(matched=len(names))
+            )
+        return links.values("todoitem_id")
+
+
+class TodoItemSearchBackend(BaseFilterBackend):
+    """Full-text search over title and description with ``?q=``.
+
+    Results come back best match first; see ``search.search_todos``.
+    """
+
+    search_param = "q"
+
+    def filter_queryset(self, request, queryset, view):
+        text = request.query_params.get(self.search_param, "")
+        return search_todos(queryset, text)
@@ -0,0 +1,86 @@
+import csv
+import json
+import time
+from collections import namedtuple
+
+from django.conf import settings
+from rest_framework import serializers
+from .export import CSV_TAG_SEPARATOR
+from .serializers import TodoItemSerializer
+from .services import insert_todos
+
+ImportReport = namedtuple("ImportReport", ["imported", "rejected", "chunks", "seconds"])
+
+
+def read_ndjson(stream):
+    """Yield ``(line_number, row)`` for each non-blank line of ``stream``.
+
+    A line that is not a JSON object is yielded as its error message so the
+    importer can reject it like any other invalid row.
+    """
+    for number, line in enumerate(stream, start=1):
+        if not line.strip():
+            continue
+        try:
+            row = json.loads(line)
+        except ValueError as exc:
+            yield number, f"Invalid JSON: {exc}"
+            continue
+        if not isinstance(row, dict):
+            yield number, "Expected a JSON object."
+            continue
+        yield number, row
+
+
+def read_csv(stream):
+    """Yield ``(line_number, row)`` for each data row of a CSV with a header.
+
+    The columns match ``export_todos --format csv``; ``tags`` holds tag names
+    joined by ``CSV_TAG_SEPARATOR`` and an empty ``due_date`` means none.
+    """
+    reader = csv.DictReader(stream)
+    for row in reader:
+        row = {key: value for key, value in row.items() if key is not None}
+        tags = row.pop("tags", "") or ""
+        row["tags"] = [{"name": name} for name in tags.split(CSV_TAG_SEPARATOR) if name]
+        if not row.get("due_date"):
+            row["due_date"] = None
+        yield reader.line_num, row
+
+
+READERS = {"ndjson": read_ndjson, "csv": read_csv}
+
+
+def import_todos(rows, batch_size=None, chunk_size=None, on_reject=None):
+    """Validate ``(line_number, row)`` pairs and insert the valid ones.
+
+    Every row goes through ``TodoItemSerializer.run_validation``, so imports
+    follow the API's rules (no due dates in the past, no duplicate tags)
+    without touching the database per row. Valid rows are buffered and
+    written ``chunk_size`` at a time by ``insert_todos``, one transaction
+    per chunk, with INSERTs of ``batch_size`` rows. Invalid rows are
+    counted and passed to ``on_reject(line_number, errors)``.
+    """
+    chunk_size = chunk_size or getattr(settings, "TODO_IMPORT_CHUNK_SIZE", 5000)
+    serializer = TodoItemSerializer()
+    start = time.perf_counter()
+    imported = rejected = chunks = 0
+    chunk = []
+    for number, row in rows:
+        try:
+            if not isinstance(row, dict):
+                raise serializers.ValidationError({"non_field_errors": [row]})
+            chunk.append(serializer.run_validation(row))
+        except serializers.ValidationError as exc:
+            rejected += 1
+            if on_reject is not None:
+                on_reject(number, exc.detail)
+            continue
+        if len(chunk) == chunk_size:
+            imported += len(insert_todos(chunk, batch_size=batch_size))
+            chunks += 1
+            chunk = []
+    if chunk:
+        imported += len(insert_todos(chunk, batch_size=batch_size))
+        chunks += 1
+    return ImportReport(imported, rejected, chunks, time.perf_counter() - start)
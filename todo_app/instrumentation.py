@@ -0,0 +1,157 @@
+import logging
+import time
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from django.conf import settings
+from django.db import connections
+from .metrics import registry
+
+logger = logging.getLogger("todo_app.requests")
+
+
+class QueryBudgetExceeded(AssertionError):
+    """A view ran more queries than its ``query_budget``. Raised only when
+    ``TODO_QUERY_BUDGET_STRICT`` is on, as it is under the test runner."""
+
+
+class QueryStats:
+    """Database execute wrapper counting queries and the time spent in them."""
+
+    def __init__(self):
+        self.count = 0
+        self.seconds = 0.0
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.seconds += time.perf_counter() - start
+            self.count += 1
+
+    def install(self):
+        for connection in connections.all():
+            connection.execute_wrappers.append(self)
+
+    def uninstall(self):
+        for connection in connections.all():
+            if self in connection.execute_wrappers:
+                connection.execute_wrappers.remove(self)
+
+
+def query_budget(view_func, method):
+    """The query budget a view class declares for ``method``, or None.
+
+    ``query_budget`` is either one number for every method or a dict keyed
+    by HTTP method.
+    """
+    view_class = getattr(view_func, "view_class", None)
+    budget = getattr(view_class, "query_budget", None)
+    if isinstance(budget, dict):
+        return budget.get(method)
+    return budget
+
+
+def extend_query_budget(request, queries):
+    """Allow ``request`` ``queries`` more than its view's ``query_budget``.
+
+    For views whose query count grows with the size of the payload, such
+    as one INSERT per batch; call it once that size is known. Takes a
+    Django or a DRF request.
+    """
+    request = getattr(request, "_request", request)
+    if getattr(request, "query_budget", None) is not None:
+        request.query_budget += queries
+
+
+class QueryInstrumentationMiddleware:
+    """Record the query count, SQL time and total time of every request.
+
+    The numbers go out in a ``Server-Timing`` header (``db`` and ``total``,
+    so they show up in the browser's network panel) and in one log line per
+    request on the ``todo_app.requests`` logger, with the same values as
+    ``extra`` fields for structured log handlers. They are also added to the
+    metrics ``registry`` under the request's URL name.
+
+    Views declare the most queries a request may run, authentication
+    included, as ``query_budget``. A request over budget is logged as a
+    warning; with ``TODO_QUERY_BUDGET_STRICT`` on it raises
+    ``QueryBudgetExceeded`` instead, which the test runner enables so an
+    N+1 regression fails the suite in whichever test first exercises it.
+    Streaming responses are measured up to the point the stream starts.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        stats = QueryStats()
+        start = time.perf_counter()
+        stats.install()
+        try:
+            response = self.get_response(request)
+        finally:
+            stats.uninstall()
+        return self.finish(request, response, stats, time.perf_counter() - start)
+
+    async def __acall__(self, request):
+        # Async views reach the database through thread-sensitive
+        # sync_to_async, so the wrapper goes on that thread's connections.
+        stats = QueryStats()
+        start = time.perf_counter()
+        await sync_to_async(stats.install)()
+        try:
+            response = await self.get_response(request)
+        finally:
+            await sync_to_async(stats.uninstall)()
+        return self.finish(request, response, stats, time.perf_counter() - start)
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        request.query_budget = query_budget(view_func, request.method)
+
+    def finish(self, request, response, stats, seconds):
+        db_ms = stats.seconds * 1000
+        total_ms = seconds * 1000
+        if getattr(settings, "TODO_SERVER_TIMING", True):
+            response["Server-Timing"] = (
+                f'db;dur={db_ms:.3f};desc="{stats.count} queries", '
+                f"total;dur={total_ms:.3f}"
+            )
+        budget = getattr(request, "query_budget", None)
+        over_budget = budget is not None and stats.count > budget
+        fields = {
+            "method": request.method,
+            "path": request.path,
+            "status": response.status_code,
+            "queries": stats.count,
+            "query_budget": budget,
+            "db_ms": round(db_ms, 3),
+            "total_ms": round(total_ms, 3),
+        }
+        match = request.resolver_match
+        registry.observe(
+            match.view_name if match else "unmatched",
+            request.method,
+            response.status_code,
+            seconds,
+            stats.count,
+            stats.seconds,
+        )
+        logger.log(
+            logging.WARNING if over_budget else logging.INFO,
+            " ".join(f"{key}={value}" for key, value in fields.items()),
+            extra=fields,
+        )
+        if over_budget and getattr(settings, "TODO_QUERY_BUDGET_STRICT", False):
+            raise QueryBudgetExceeded(
+                f"{request.method} {request.path} ran {stats.count} queries, "
+                f"over its budget of {budget}."
+            )
+        return response
@@ -0,0 +1,128 @@
+import json
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test.utils import (
+    override_settings,
+    setup_test_environment,
+    teardown_test_environment,
+)
+from todo_app.benchmark import OPERATIONS, compare, run_benchmark
+
+
+class Command(BaseCommand):
+    help = (
+        "Seed throwaway test databases and measure throughput, latency "
+        "percentiles and query counts for the todo API."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--sizes",
+            type=int,
+            nargs="+",
+            default=[1000],
+            help="Dataset sizes to benchmark, e.g. 1000 100000 1000000.",
+        )
+        parser.add_argument(
+            "--requests", type=int, default=200, help="Requests per operation."
+        )
+        parser.add_argument("--tags", type=int, default=200, help="Distinct tags.")
+        parser.add_argument("--seed", type=int, default=0, help="Random seed.")
+        parser.add_argument(
+            "--with-cache",
+            action="store_true",
+            help=(
+                "Keep the list response cache on. The list operation repeats a "
+                "few pages, so it then mostly times cache hits."
+            ),
+        )
+        parser.add_argument("--output", help="Write the JSON report to this file.")
+        parser.add_argument(
+            "--compare", help="Earlier JSON report to compare p95 and throughput with."
+        )
+        parser.add_argument(
+            "--threshold",
+            type=float,
+            default=0.2,
+            help="Relative change reported as a regression (default: 0.2).",
+        )
+
+    def handle(self, *args, **options):
+        baseline = None
+        if options["compare"]:
+            try:
+                with open(options["compare"], encoding="utf-8") as report:
+                    baseline = json.load(report)
+            except (OSError, ValueError) as exc:
+                raise CommandError(f"Cannot read {options['compare']}: {exc}")
+
+        # Everything runs in a fresh test database, never the configured one.
+        old_name = connection.settings_dict["NAME"]
+        setup_test_environment()
+        connection.creation.create_test_db(
+            verbosity=0, autoclobber=True, serialize=False
+        )
+        try:
+            # Off by default, so list timings measure the database.
+            cache = {} if options["with_cache"] else {"TODO_LIST_CACHE_ALIAS": None}
+            with override_settings(**cache):
+                report = run_benchmark(
+                    options["sizes"],
+                    requests=options["requests"],
+                    tags=options["tags"],
+                    seed_value=options["seed"],
+                    log=self.stderr.write,
+                )
+        finally:
+            connection.creation.destroy_test_db(old_name, verbosity=0)
+            teardown_test_environment()
+        report["meta"]["response_cache"] = options["with_cache"]
+
+        self.write_table(report)
+        if options["output"]:
+            with open(options["output"], "w", encoding="utf-8") as out:
+                json.dump(report, out, indent=2)
+            self.stdout.write(f"Wrote {options['output']}.")
+        else:
+            self.stdout.write(json.dumps(report, indent=2))
+        if baseline is not None:
+            self.write_comparison(baseline, report, options["threshold"])
+
+    def write_table(self, report):
+        write = self.stderr.write
+        header = (
+            f"{'size':>9} {'operation':<9} {'req/s':>9} {'p50 ms':>8} "
+            f"{'p95 ms':>8} {'p99 ms':>8} {'queries':>8}"
+        )
+        write(header)
+        for dataset in report["datasets"]:
+            for name in OPERATIONS:
+                stats = dataset["operations"][name]
+                write(
+                    f"{dataset['size']:>9} {name:<9} {stats['throughput_rps']:>9} "
+                    f"{stats['p50_ms']:>8} {stats['p95_ms']:>8} "
+                    f"{stats['p99_ms']:>8} {stats['queries_mean']:>8}"
+                )
+
+    def write_comparison(self, baseline, report, threshold):
+        for key in ("database", "requests_per_operation", "response_cache"):
+            before, after = baseline["meta"].get(key), report["meta"].get(key)
+            if before != after:
+                self.stderr.write(
+                    self.style.WARNING(f"Runs differ in {key}: {before} -> {after}")
+                )
+        regressions = 0
+        for size, name, metric, before, after, change in compare(baseline, report):
+            line = (
+                f"{size:>9} {name:<9} {metric:<15} {before} -> {after} ({change:+.0%})"
+            )
+            if change > threshold:
+                regressions += 1
+                self.stderr.write(self.style.ERROR(f"{line} REGRESSION"))
+            else:
+                self.stderr.write(line)
+        if regressions:
+            raise CommandError(
+                f"{regressions} metrics regressed by more than {threshold:.0%}."
+            )
@@ -0,0 +1,38 @@
+from django.core.management.base import BaseCommand, CommandError
+from todo_app.export import WRITERS, iter_todos
+
+
+class Command(BaseCommand):
+    help = "Stream every todo item, with its tags, as NDJSON or CSV."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--format", choices=sorted(WRITERS), default="ndjson")
+        parser.add_argument(
+            "--output", help="File to write to (default: standard output)."
+        )
+        parser.add_argument(
+            "--chunk-size",
+            type=int,
+            help="Rows fetched per round trip (default: TODO_EXPORT_CHUNK_SIZE).",
+        )
+
+    def handle(self, *args, **options):
+        if options["chunk_size"] is not None and options["chunk_size"] < 1:
+            raise CommandError("--chunk-size must be a positive integer.")
+        self.count = 0
+        lines = WRITERS[options["format"]](self.counted(options["chunk_size"]))
+        if options["output"]:
+            with open(options["output"], "w", newline="", encoding="utf-8") as out:
+                out.writelines(lines)
+        else:
+            for line in lines:
+                self.stdout.write(line, ending="")
+        # Report on stderr so the summary never ends up in piped output.
+        self.stderr.write(
+            f"Exported {self.count} todo items.", style_func=self.style.SUCCESS
+        )
+
+    def counted(self, chunk_size):
+        for todo in iter_todos(chunk_size=chunk_size):
+            self.count += 1
+            yield todo
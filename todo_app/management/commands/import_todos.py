@@ -0,0 +1,80 @@
+import contextlib
+import sys
+
+from django.core.management.base import BaseCommand, CommandError
+from rest_framework.settings import api_settings
+from todo_app.importer import READERS, import_todos
+
+
+class Command(BaseCommand):
+    help = "Import todo items from an NDJSON or CSV file in batched transactions."
+
+    def add_arguments(self, parser):
+        parser.add_argument("path", help='File to read, or "-" for standard input.')
+        parser.add_argument(
+            "--format",
+            choices=sorted(READERS),
+            help="Input format (default: csv for .csv files, otherwise ndjson).",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            help="Rows per INSERT statement (default: TODO_BULK_BATCH_SIZE).",
+        )
+        parser.add_argument(
+            "--chunk-size",
+            type=int,
+            help="Rows per transaction (default: TODO_IMPORT_CHUNK_SIZE).",
+        )
+
+    def handle(self, *args, **options):
+        for option in ("batch_size", "chunk_size"):
+            if options[option] is not None and options[option] < 1:
+                flag = "--" + option.replace("_", "-")
+                raise CommandError(f"{flag} must be a positive integer.")
+        path = options["path"]
+        fmt = options["format"] or ("csv" if path.endswith(".csv") else "ndjson")
+        try:
+            # Standard input belongs to the caller, so it is left open.
+            stream = (
+                contextlib.nullcontext(sys.stdin)
+                if path == "-"
+                else open(path, newline="", encoding="utf-8")
+            )
+        except OSError as exc:
+            raise CommandError(f"Cannot read {path}: {exc}")
+        with stream as source:
+            report = import_todos(
+                READERS[fmt](source),
+                batch_size=options["batch_size"],
+                chunk_size=options["chunk_size"],
+                on_reject=self.reject,
+            )
+        rate = report.imported / report.seconds if report.seconds else 0
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Imported {report.imported} todo items in {report.chunks} chunks "
+                f"({report.seconds:.3f}s, {rate:.0f} rows/s); "
+                f"rejected {report.rejected} rows."
+            )
+        )
+
+    def reject(self, line, errors):
+        self.stderr.write(f"Line {line} rejected: {'; '.join(self.messages(errors))}")
+
+    @classmethod
+    def messages(cls, errors, field=""):
+        """Flatten serializer errors into ``field: message`` strings, with
+        nested fields as ``tags[0].name``."""
+        if isinstance(errors, dict):
+            for key, value in errors.items():
+                if key == api_settings.NON_FIELD_ERRORS_KEY:
+                    yield from cls.messages(value, field)
+                else:
+                    yield from cls.messages(value, f"{field}.{key}" if field else key)
+        elif isinstance(errors, list):
+            nested = any(isinstance(error, (dict, list)) for error in errors)
+            for index, error in enumerate(errors):
+                yield from cls.messages(error, f"{field}[{index}]" if nested else field)
+        else:
+            yield f"{field}: {errors}" if field else str(errors)
@@ -0,0 +1,26 @@
+from django.core.management.base import BaseCommand, CommandError
+from todo_app.services import mark_overdue
+
+
+class Command(BaseCommand):
+    help = "Move active todo items whose due date has passed to OVERDUE."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            help="Rows updated per transaction (default: TODO_OVERDUE_BATCH_SIZE).",
+        )
+
+    def handle(self, *args, **options):
+        # A negative LIMIT is no limit in SQLite, so the sweep would never
+        # see a short batch and stop.
+        if options["batch_size"] is not None and options["batch_size"] < 1:
+            raise CommandError("--batch-size must be a positive integer.")
+        sweep = mark_overdue(batch_size=options["batch_size"])
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Marked {sweep.updated} todo items overdue in {sweep.batches} "
+                f"batches ({sweep.seconds:.3f}s)."
+            )
+        )
@@ -0,0 +1,19 @@
+from django.core.management.base import BaseCommand
+from todo_app.changes import prune_tombstones, tombstone_retention
+
+
+class Command(BaseCommand):
+    help = "Delete tombstones of deleted todo items older than the change feed keeps."
+
+    def handle(self, *args, **options):
+        retention = tombstone_retention()
+        if retention is None:
+            self.stdout.write("TODO_TOMBSTONE_RETENTION_DAYS is None; nothing pruned.")
+            return
+        prune = prune_tombstones()
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Pruned {prune.deleted} tombstones older than {retention.days} "
+                f"days ({prune.seconds:.3f}s)."
+            )
+        )
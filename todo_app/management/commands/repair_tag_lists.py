@@ -0,0 +1,35 @@
+from django.core.management.base import BaseCommand, CommandError
+from todo_app.services import repair_tag_lists
+
+
+class Command(BaseCommand):
+    help = "Check every todo item's denormalized tag_list and rewrite drifted ones."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            help="Todo items checked per transaction (default: TODO_TAG_LIST_BATCH_SIZE).",
+        )
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Report drifted todo items without rewriting them.",
+        )
+
+    def handle(self, *args, **options):
+        # 0 would fall back to the default and a negative size is not a
+        # valid slice.
+        if options["batch_size"] is not None and options["batch_size"] < 1:
+            raise CommandError("--batch-size must be a positive integer.")
+        repair = repair_tag_lists(
+            batch_size=options["batch_size"], dry_run=options["dry_run"]
+        )
+        action = "found" if options["dry_run"] else "repaired"
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Checked {repair.checked} todo items in {repair.batches} batches; "
+                f"{action} {repair.drifted} with a stale tag list "
+                f"({repair.seconds:.3f}s)."
+            )
+        )
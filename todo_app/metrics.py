@@ -0,0 +1,250 @@
+import json
+import logging
+import os
+import tempfile
+import threading
+import time
+from bisect import bisect_left
+from pathlib import Path
+
+from django.conf import settings
+from .cache import list_cache
+
+logger = logging.getLogger(__name__)
+
+# Upper bounds, in seconds, of the request latency histogram buckets.
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+class MetricsRegistry:
+    """In-process request metrics, exported in Prometheus text format.
+
+    Per URL name (``todo-list-create``, ``todo-detail``, ...) it keeps
+    request counts by method and status code, a fixed-bucket latency
+    histogram by method, and the number of queries and SQL time spent.
+    Recording a request is a dict update under a lock; nothing is formatted
+    until a scrape.
+
+    Several worker processes on one host share their numbers through
+    ``TODO_METRICS_DIR``: each process writes its totals to ``<pid>.json``
+    there, at most every ``TODO_METRICS_FLUSH_INTERVAL`` seconds and on
+    every scrape, and a scrape sums every file in the directory. Files of
+    exited workers are kept so totals never go backwards; clear the
+    directory when deploying. Without a directory only the scraped process
+    is reported.
+    """
+
+    def __init__(self, buckets=LATENCY_BUCKETS):
+        self.buckets = tuple(buckets)
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self._requests = {}
+            self._latency = {}
+            self._queries = {}
+            self._flushed_at = time.monotonic()
+
+    def observe(self, view, method, status, seconds, queries, db_seconds):
+        bucket = bisect_left(self.buckets, seconds)
+        request_key = (view, method, status)
+        latency_key = (view, method)
+        with self._lock:
+            self._requests[request_key] = self._requests.get(request_key, 0) + 1
+            histogram = self._latency.get(latency_key)
+            if histogram is None:
+                histogram = self._latency[latency_key] = [0] * (
+                    len(self.buckets) + 1
+                ) + [0.0]
+            histogram[bucket] += 1
+            histogram[-1] += seconds
+            totals = self._queries.get(view)
+            if totals is None:
+                totals = self._queries[view] = [0, 0.0]
+            totals[0] += queries
+            totals[1] += db_seconds
+            now = time.monotonic()
+            due = now - self._flushed_at >= getattr(
+                settings, "TODO_METRICS_FLUSH_INTERVAL", 5
+            )
+            if due:
+                # Claimed under the lock, so one thread flushes per interval.
+                self._flushed_at = now
+        if due:
+            self.write()
+
+    def snapshot(self):
+        """This process's totals as a JSON-serializable dict."""
+        with self._lock:
+            snapshot = {
+                "buckets": list(self.buckets),
+                "requests": [[*key, count] for key, count in self._requests.items()],
+                "latency": [
+                    [*key, histogram[:-1], histogram[-1]]
+                    for key, histogram in self._latency.items()
+                ],
+                "queries": [[view, *totals] for view, totals in self._queries.items()],
+            }
+        snapshot["cache"] = list_cache.stats()
+        return snapshot
+
+    def flush(self):
+        """Write this process's snapshot to ``TODO_METRICS_DIR``, if set."""
+        with self._lock:
+            self._flushed_at = time.monotonic()
+        self.write()
+
+    def write(self):
+        """Replace ``<pid>.json`` atomically with the current snapshot.
+
+        Each write goes through its own temporary file, so concurrent
+        writers never share a partial file. Errors are logged rather than
+        raised: this runs on the request path and metrics must not fail a
+        request.
+        """
+        directory = getattr(settings, "TODO_METRICS_DIR", None)
+        if not directory:
+            return
+        partial = None
+        try:
+            directory = Path(directory)
+            directory.mkdir(parents=True, exist_ok=True)
+            with tempfile.NamedTemporaryFile(
+                "w", dir=directory, suffix=".tmp", delete=False
+            ) as partial:
+                json.dump(self.snapshot(), partial)
+            os.replace(partial.name, directory / f"{os.getpid()}.json")
+        except Exception:
+            logger.warning("Could not write metrics to %s", directory, exc_info=True)
+            if partial is not None:
+                try:
+                    os.unlink(partial.name)
+                except OSError:
+                    pass
+
+    def collect(self):
+        """Snapshots of every process sharing ``TODO_METRICS_DIR``, or of
+        this process alone."""
+        directory = getattr(settings, "TODO_METRICS_DIR", None)
+        if not directory:
+            return [self.snapshot()]
+        self.flush()
+        snapshots = []
+        for path in Path(directory).glob("*.json"):
+            try:
+                snapshots.append(json.loads(path.read_text()))
+            except (OSError, ValueError):
+                continue  # Removed or being replaced; counted next scrape.
+        return snapshots
+
+    def render(self):
+        return render_prometheus(merge(self.collect()))
+
+
+def merge(snapshots):
+    """Sum snapshots from several processes."""
+    requests, latency, queries = {}, {}, {}
+    cache = {"hits": 0, "misses": 0}
+    buckets = snapshots[0]["buckets"] if snapshots else list(LATENCY_BUCKETS)
+    for snapshot in snapshots:
+        if snapshot["buckets"] != buckets:
+            continue  # Written with other buckets by an older deploy.
+        for *key, count in snapshot["requests"]:
+            key = tuple(key)
+            requests[key] = requests.get(key, 0) + count
+        for view, method, counts, total in snapshot["latency"]:
+            merged = latency.setdefault((view, method), [[0] * len(counts), 0.0])
+            merged[0] = [a + b for a, b in zip(merged[0], counts)]
+            merged[1] += total
+        for view, count, seconds in snapshot["queries"]:
+            merged = queries.setdefault(view, [0, 0.0])
+            merged[0] += count
+            merged[1] += seconds
+        for result in cache:
+            cache[result] += snapshot["cache"][result]
+    return {
+        "processes": len(snapshots),
+        "buckets": buckets,
+        "requests": requests,
+        "latency": latency,
+        "queries": queries,
+        "cache": cache,
+    }
+
+
+def escape(value):
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def labels(**pairs):
+    return "{" + ",".join(f'{name}="{escape(v)}"' for name, v in pairs.items()) + "}"
+
+
+def render_prometheus(merged):
+    """Prometheus text exposition format (version 0.0.4) for ``merged``."""
+    lines = []
+
+    def family(name, kind, help_text):
+        lines.append(f"# HELP {name} {help_text}")
+        lines.append(f"# TYPE {name} {kind}")
+
+    family(
+        "todo_http_requests_total",
+        "counter",
+        "Requests handled, by URL name, method and status code.",
+    )
+    for (view, method, code), count in sorted(merged["requests"].items()):
+        lines.append(
+            "todo_http_requests_total"
+            f"{labels(view=view, method=method, status=code)} {count}"
+        )
+
+    family(
+        "todo_http_request_duration_seconds",
+        "histogram",
+        "Request latency, by URL name and method.",
+    )
+    for (view, method), (counts, total) in sorted(merged["latency"].items()):
+        cumulative = 0
+        bounds = [str(bound) for bound in merged["buckets"]] + ["+Inf"]
+        for bound, count in zip(bounds, counts):
+            cumulative += count
+            lines.append(
+                "todo_http_request_duration_seconds_bucket"
+                f"{labels(view=view, method=method, le=bound)} {cumulative}"
+            )
+        pairs = labels(view=view, method=method)
+        lines.append(f"todo_http_request_duration_seconds_sum{pairs} {total:.6f}")
+        lines.append(f"todo_http_request_duration_seconds_count{pairs} {cumulative}")
+
+    family("todo_db_queries_total", "counter", "Database queries, by URL name.")
+    for view, (count, _) in sorted(merged["queries"].items()):
+        lines.append(f"todo_db_queries_total{labels(view=view)} {count}")
+    family(
+        "todo_db_query_duration_seconds_total",
+        "counter",
+        "Time spent in database queries, by URL name.",
+    )
+    for view, (_, seconds) in sorted(merged["queries"].items()):
+        lines.append(
+            f"todo_db_query_duration_seconds_total{labels(view=view)} {seconds:.6f}"
+        )
+
+    family(
+        "todo_list_cache_requests_total",
+        "counter",
+        "Todo list response cache lookups, by result.",
+    )
+    for result, name in (("hit", "hits"), ("miss", "misses")):
+        lines.append(
+            "todo_list_cache_requests_total"
+            f"{labels(result=result)} {merged['cache'][name]}"
+        )
+
+    family("todo_metrics_processes", "gauge", "Worker processes reporting.")
+    lines.append(f"todo_metrics_processes {merged['processes']}")
+    return "\n".join(lines) + "\n"
+
+
+registry = MetricsRegistry()
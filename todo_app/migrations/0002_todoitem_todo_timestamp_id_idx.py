@@ -0,0 +1,19 @@
+# Generated by Django 5.1.3 on 2026-10-18 09:12
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("todo_app", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="todoitem",
+            index=models.Index(
+                fields=["timestamp", "id"], name="todo_timestamp_id_idx"
+            ),
+        ),
+    ]
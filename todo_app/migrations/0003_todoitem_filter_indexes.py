@@ -0,0 +1,23 @@
+# Generated by Django 5.1.3 on 2026-10-18 18:27
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("todo_app", "0002_todoitem_todo_timestamp_id_idx"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="todoitem",
+            index=models.Index(fields=["due_date"], name="todo_due_date_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="todoitem",
+            index=models.Index(
+                fields=["status", "due_date"], name="todo_status_due_idx"
+            ),
+        ),
+    ]
@@ -0,0 +1,70 @@
+# Generated by Django 5.1.3 on 2026-10-18 19:05
+
+from django.db import migrations
+
+# Frozen copy of the schema in todo_app.search at the time of this
+# migration; install_fts() reinstalls the current one after every migrate.
+FTS_SCHEMA = [
+    """
+    CREATE VIRTUAL TABLE IF NOT EXISTS todo_app_todoitem_fts USING fts5(
+        title, description, content='todo_app_todoitem', content_rowid='id'
+    )
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS todo_app_todoitem_fts_ai
+    AFTER INSERT ON todo_app_todoitem
+    BEGIN
+        INSERT INTO todo_app_todoitem_fts(rowid, title, description)
+        VALUES (new.id, new.title, new.description);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS todo_app_todoitem_fts_ad
+    AFTER DELETE ON todo_app_todoitem
+    BEGIN
+        INSERT INTO todo_app_todoitem_fts(
+            todo_app_todoitem_fts, rowid, title, description
+        )
+        VALUES ('delete', old.id, old.title, old.description);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS todo_app_todoitem_fts_au
+    AFTER UPDATE OF title, description ON todo_app_todoitem
+    BEGIN
+        INSERT INTO todo_app_todoitem_fts(
+            todo_app_todoitem_fts, rowid, title, description
+        )
+        VALUES ('delete', old.id, old.title, old.description);
+        INSERT INTO todo_app_todoitem_fts(rowid, title, description)
+        VALUES (new.id, new.title, new.description);
+    END
+    """,
+    "INSERT INTO todo_app_todoitem_fts(todo_app_todoitem_fts) VALUES ('rebuild')",
+]
+
+
+def install_fts(apps, schema_editor):
+    if schema_editor.connection.vendor != "sqlite":
+        return
+    for statement in FTS_SCHEMA:
+        schema_editor.execute(statement)
+
+
+def uninstall_fts(apps, schema_editor):
+    if schema_editor.connection.vendor != "sqlite":
+        return
+    for trigger in ("ai", "ad", "au"):
+        schema_editor.execute(f"DROP TRIGGER IF EXISTS todo_app_todoitem_fts_{trigger}")
+    schema_editor.execute("DROP TABLE IF EXISTS todo_app_todoitem_fts")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("todo_app", "0003_todoitem_filter_indexes"),
+    ]
+
+    operations = [
+        migrations.RunPython(install_fts, uninstall_fts),
+    ]
@@ -0,0 +1,53 @@
+# Generated by Django 5.1.3 on 2026-10-18 20:14
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+def backfill_updated_at(apps, schema_editor):
+    TodoItem = apps.get_model("todo_app", "TodoItem")
+    TodoItem.objects.update(updated_at=models.F("timestamp"))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("todo_app", "0004_todoitem_fts"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="todoitem",
+            name="updated_at",
+            field=models.DateTimeField(
+                auto_now=True, default=django.utils.timezone.now
+            ),
+            preserve_default=False,
+        ),
+        migrations.RunPython(backfill_updated_at, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name="todoitem",
+            index=models.Index(fields=["updated_at", "id"], name="todo_updated_id_idx"),
+        ),
+        migrations.CreateModel(
+            name="TodoItemTombstone",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("todo_id", models.BigIntegerField()),
+                ("deleted_at", models.DateTimeField(default=django.utils.timezone.now)),
+            ],
+            options={
+                "indexes": [
+                    models.Index(fields=["deleted_at", "id"], name="todo_tombstone_idx")
+                ],
+            },
+        ),
+    ]
@@ -0,0 +1,39 @@
+# Generated by Django 5.1.3 on 2026-10-18 19:12
+
+from itertools import groupby
+
+from django.db import migrations, models
+
+
+def backfill_tag_list(apps, schema_editor):
+    TodoItem = apps.get_model("todo_app", "TodoItem")
+    Through = TodoItem.tags.through
+    links = (
+        Through.objects.order_by("todoitem_id", "tag_id")
+        .values_list("todoitem_id", "tag_id", "tag__name")
+        .iterator(chunk_size=2000)
+    )
+    batch = []
+    for todo_id, group in groupby(links, key=lambda link: link[0]):
+        tags = [{"id": tag_id, "name": name} for _, tag_id, name in group]
+        batch.append(TodoItem(pk=todo_id, tag_list=tags))
+        if len(batch) == 1000:
+            TodoItem.objects.bulk_update(batch, ["tag_list"])
+            batch = []
+    TodoItem.objects.bulk_update(batch, ["tag_list"])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("todo_app", "0005_todoitem_updated_at_todoitemtombstone"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="todoitem",
+            name="tag_list",
+            field=models.JSONField(blank=True, default=list, editable=False),
+        ),
+        migrations.RunPython(backfill_tag_list, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,139 @@
+# Generated by Django 5.1.3 on 2026-10-18 19:23
+
+from django.db import migrations, models
+
+
+# Frozen copies of the trigger and recount SQL in todo_app.stats as of this
+# migration; install_counters() reinstalls the current ones after every
+# migrate.
+COUNTER_TABLE = "todo_app_todocounter"
+TODO_TABLE = "todo_app_todoitem"
+LINK_TABLE = "todo_app_todoitem_tags"
+TAG_TABLE = "todo_app_tag"
+
+
+def increment(kind, value):
+    return f"""
+        INSERT INTO {COUNTER_TABLE} (kind, value, count) VALUES ('{kind}', {value}, 1)
+        ON CONFLICT (kind, value) DO UPDATE SET count = count + 1;
+    """
+
+
+def decrement(kind, value):
+    return f"""
+        UPDATE {COUNTER_TABLE} SET count = count - 1
+        WHERE kind = '{kind}' AND value = {value};
+        DELETE FROM {COUNTER_TABLE}
+        WHERE kind = '{kind}' AND value = {value} AND count <= 0;
+    """
+
+
+COUNTER_TRIGGERS = {
+    f"{COUNTER_TABLE}_todo_ai": f"""
+        AFTER INSERT ON {TODO_TABLE} BEGIN
+        {increment("status", "new.status")}
+        END
+    """,
+    f"{COUNTER_TABLE}_todo_ad": f"""
+        AFTER DELETE ON {TODO_TABLE} BEGIN
+        {decrement("status", "old.status")}
+        END
+    """,
+    f"{COUNTER_TABLE}_todo_au": f"""
+        AFTER UPDATE OF status ON {TODO_TABLE}
+        WHEN old.status IS NOT new.status BEGIN
+        {decrement("status", "old.status")}
+        {increment("status", "new.status")}
+        END
+    """,
+    f"{COUNTER_TABLE}_link_ai": f"""
+        AFTER INSERT ON {LINK_TABLE} BEGIN
+        {increment("tag", "CAST(new.tag_id AS TEXT)")}
+        END
+    """,
+    f"{COUNTER_TABLE}_link_ad": f"""
+        AFTER DELETE ON {LINK_TABLE} BEGIN
+        {decrement("tag", "CAST(old.tag_id AS TEXT)")}
+        END
+    """,
+    f"{COUNTER_TABLE}_link_au": f"""
+        AFTER UPDATE OF tag_id ON {LINK_TABLE}
+        WHEN old.tag_id IS NOT new.tag_id BEGIN
+        {decrement("tag", "CAST(old.tag_id AS TEXT)")}
+        {increment("tag", "CAST(new.tag_id AS TEXT)")}
+        END
+    """,
+    f"{COUNTER_TABLE}_tag_ad": f"""
+        AFTER DELETE ON {TAG_TABLE} BEGIN
+        DELETE FROM {COUNTER_TABLE}
+        WHERE kind = 'tag' AND value = CAST(old.id AS TEXT);
+        END
+    """,
+}
+
+COUNT_SQL = [
+    f"""
+    INSERT INTO {COUNTER_TABLE} (kind, value, count)
+    SELECT 'status', status, COUNT(*) FROM {TODO_TABLE} GROUP BY status
+    """,
+    f"""
+    INSERT INTO {COUNTER_TABLE} (kind, value, count)
+    SELECT 'tag', CAST(tag_id AS TEXT), COUNT(*) FROM {LINK_TABLE} GROUP BY tag_id
+    """,
+]
+
+
+def install_counters(apps, schema_editor):
+    if schema_editor.connection.vendor != "sqlite":
+        return
+    for name, body in COUNTER_TRIGGERS.items():
+        schema_editor.execute(f"CREATE TRIGGER IF NOT EXISTS {name} {body}")
+    for statement in COUNT_SQL:
+        schema_editor.execute(statement)
+
+
+def uninstall_counters(apps, schema_editor):
+    if schema_editor.connection.vendor != "sqlite":
+        return
+    for name in COUNTER_TRIGGERS:
+        schema_editor.execute(f"DROP TRIGGER IF EXISTS {name}")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("todo_app", "0006_todoitem_tag_list"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="TodoCounter",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "kind",
+                    models.CharField(
+                        choices=[("status", "Status"), ("tag", "Tag")], max_length=10
+                    ),
+                ),
+                ("value", models.CharField(max_length=30)),
+                ("count", models.BigIntegerField(default=0)),
+            ],
+            options={
+                "constraints": [
+                    models.UniqueConstraint(
+                        fields=("kind", "value"), name="todo_counter_kind_value_uniq"
+                    )
+                ],
+            },
+        ),
+        migrations.RunPython(install_counters, uninstall_counters),
+    ]
@@ -0,0 +1,65 @@
+# Generated by Django 5.1.3 on 2026-10-18 19:40
+
+from django.db import migrations, models
+
+
+# Frozen copies of the version row and trigger SQL in todo_app.conditional
+# as of this migration; install_list_version() reinstalls the current ones
+# after every migrate.
+VERSION_TABLE = "todo_app_todolistversion"
+BUMP_VERSION = f"UPDATE {VERSION_TABLE} SET version = version + 1;"
+VERSION_TRIGGERS = {
+    f"{VERSION_TABLE}_{prefix}_a{event[0].lower()}": (
+        f"AFTER {event} ON {table} BEGIN {BUMP_VERSION} END"
+    )
+    for prefix, table, events in [
+        ("todo", "todo_app_todoitem", ["INSERT", "UPDATE", "DELETE"]),
+        ("link", "todo_app_todoitem_tags", ["INSERT", "UPDATE", "DELETE"]),
+        ("tag", "todo_app_tag", ["UPDATE"]),
+    ]
+    for event in events
+}
+
+
+def install_list_version(apps, schema_editor):
+    schema_editor.execute(
+        f"INSERT INTO {VERSION_TABLE} (id, version) SELECT 1, 0 "
+        f"WHERE NOT EXISTS (SELECT 1 FROM {VERSION_TABLE})"
+    )
+    if schema_editor.connection.vendor != "sqlite":
+        return
+    for name, body in VERSION_TRIGGERS.items():
+        schema_editor.execute(f"CREATE TRIGGER IF NOT EXISTS {name} {body}")
+
+
+def uninstall_list_version(apps, schema_editor):
+    if schema_editor.connection.vendor != "sqlite":
+        return
+    for name in VERSION_TRIGGERS:
+        schema_editor.execute(f"DROP TRIGGER IF EXISTS {name}")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("todo_app", "0007_todocounter"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="TodoListVersion",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("version", models.BigIntegerField(default=0)),
+            ],
+        ),
+        migrations.RunPython(install_list_version, uninstall_list_version),
+    ]
@@ -0,0 +1,114 @@
+# Generated by Django 5.1.3 on 2026-10-18 20:52
+
+from django.db import migrations, models
+
+# Frozen copies of the trigger SQL in todo_app.conditional as of this
+# migration.
+VERSION_TABLE = "todo_app_todolistversion"
+TODO_TABLE = "todo_app_todoitem"
+TOMBSTONE_TABLE = "todo_app_todoitemtombstone"
+BUMP_VERSION = f"UPDATE {VERSION_TABLE} SET version = version + 1;"
+
+
+def stamp_change(table):
+    return (
+        f"UPDATE {table} SET change_seq = (SELECT version FROM {VERSION_TABLE}) "
+        f"WHERE id = new.id;"
+    )
+
+
+CHANGE_TRIGGERS = {
+    f"{VERSION_TABLE}_todo_ai": (
+        f"AFTER INSERT ON {TODO_TABLE} BEGIN "
+        f"{BUMP_VERSION} {stamp_change(TODO_TABLE)} END"
+    ),
+    f"{VERSION_TABLE}_todo_au": (
+        f"AFTER UPDATE ON {TODO_TABLE} WHEN new.change_seq <= old.change_seq "
+        f"BEGIN {BUMP_VERSION} {stamp_change(TODO_TABLE)} END"
+    ),
+    f"{VERSION_TABLE}_todo_ad": f"AFTER DELETE ON {TODO_TABLE} BEGIN {BUMP_VERSION} END",
+    f"{VERSION_TABLE}_tombstone_ai": (
+        f"AFTER INSERT ON {TOMBSTONE_TABLE} BEGIN "
+        f"{BUMP_VERSION} {stamp_change(TOMBSTONE_TABLE)} END"
+    ),
+}
+# The todo triggers of 0008, which only bumped the version.
+VERSION_TRIGGERS_0008 = {
+    f"{VERSION_TABLE}_todo_a{event[0].lower()}": (
+        f"AFTER {event} ON {TODO_TABLE} BEGIN {BUMP_VERSION} END"
+    )
+    for event in ["INSERT", "UPDATE", "DELETE"]
+}
+
+
+def number_changes(apps, schema_editor):
+    """Number the existing todos in ``updated_at`` order, then the
+    tombstones in ``deleted_at`` order, after every version handed out so
+    far, and replace the todo version triggers with the stamping ones."""
+    connection = schema_editor.connection
+    if connection.vendor != "sqlite":
+        return
+    with connection.cursor() as cursor:
+        for name in CHANGE_TRIGGERS:
+            cursor.execute(f"DROP TRIGGER IF EXISTS {name}")
+        cursor.execute(f"SELECT version FROM {VERSION_TABLE}")
+        row = cursor.fetchone()
+        if row is None:
+            return
+        version = row[0]
+        for table, order in [
+            (TODO_TABLE, "updated_at, id"),
+            (TOMBSTONE_TABLE, "deleted_at, id"),
+        ]:
+            cursor.execute(f"SELECT id FROM {table} ORDER BY {order}")
+            ids = [pk for (pk,) in cursor.fetchall()]
+            cursor.executemany(
+                f"UPDATE {table} SET change_seq = %s WHERE id = %s",
+                [(version + number, pk) for number, pk in enumerate(ids, 1)],
+            )
+            version += len(ids)
+        cursor.execute(f"UPDATE {VERSION_TABLE} SET version = %s", [version])
+        for name, body in CHANGE_TRIGGERS.items():
+            cursor.execute(f"CREATE TRIGGER {name} {body}")
+
+
+def unnumber_changes(apps, schema_editor):
+    connection = schema_editor.connection
+    if connection.vendor != "sqlite":
+        return
+    with connection.cursor() as cursor:
+        for name in CHANGE_TRIGGERS:
+            cursor.execute(f"DROP TRIGGER IF EXISTS {name}")
+        for name, body in VERSION_TRIGGERS_0008.items():
+            cursor.execute(f"CREATE TRIGGER {name} {body}")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("todo_app", "0008_todolistversion"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="todoitem",
+            name="change_seq",
+            field=models.BigIntegerField(default=0, db_default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name="todoitemtombstone",
+            name="change_seq",
+            field=models.BigIntegerField(default=0, db_default=0, editable=False),
+        ),
+        migrations.AddIndex(
+            model_name="todoitem",
+            index=models.Index(fields=["change_seq"], name="todo_change_seq_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="todoitemtombstone",
+            index=models.Index(
+                fields=["change_seq"], name="todo_tombstone_change_seq_idx"
+            ),
+        ),
+        migrations.RunPython(number_changes, unnumber_changes),
+    ]
@@ -1,15 +1,94 @@
-from django.db import models
+from itertools import groupby
+from django.db import models, router, transaction
 from django.core.exceptions import ValidationError
 from django.utils import timezone
 
 
+class TagQuerySet(models.QuerySet):
+    def resolve(self, names):
+        """Return a ``{name: Tag}`` map for ``names``, creating missing tags.
+
+        Existing tags are read with one query. Missing ones are inserted in
+        one batch that ignores unique conflicts and then re-read, so callers
+        racing to create the same name all end up with the same row.
+        """
+        names = set(names)
+        if not names:
+            return {}
+        tags = {tag.name: tag for tag in self.filter(name__in=names)}
+        missing = names.difference(tags)
+        if missing:
+            self.bulk_create(
+                [self.model(name=name) for name in missing], ignore_conflicts=True
+            )
+            tags.update((tag.name, tag) for tag in self.filter(name__in=missing))
+        return tags
+
+
 class Tag(models.Model):
-    name = models.CharField(max_length=30, unique=False)
+    name = models.CharField(max_length=30, unique=True)
+
+    objects = TagQuerySet.as_manager()
+
+    def save(self, *args, **kwargs):
+        # A rename rewrites the tagged todos' tag_list from post_save; the
+        # transaction commits both together and keeps those reads on the
+        # primary.
+        using = kwargs.get("using") or router.db_for_write(Tag, instance=self)
+        with transaction.atomic(using=using, savepoint=False):
+            super().save(*args, **kwargs)
 
     def __str__(self):
         return self.name
 
 
+def tag_lists(todo_ids):
+    """Return ``{todo_id: [{"id": ..., "name": ...}, ...]}`` for
+    ``todo_ids`` from the tags relation, with tags in id order. Todos
+    without tags are left out."""
+    links = (
+        TodoItem.tags.through.objects.filter(todoitem_id__in=todo_ids)
+        .order_by("todoitem_id", "tag_id")
+        .values_list("todoitem_id", "tag_id", "tag__name")
+    )
+    return {
+        todo_id: [{"id": tag_id, "name": name} for _, tag_id, name in group]
+        for todo_id, group in groupby(links, key=lambda link: link[0])
+    }
+
+
+def refresh_tag_lists(todo_ids, batch_size=1000):
+    """Rebuild ``tag_list`` from the tags relation for ``todo_ids``, bump
+    their ``updated_at``, and return the new lists by id.
+
+    Todos are rewritten ``batch_size`` at a time with one query for the
+    tags and one UPDATE per batch, all in one transaction, which also sends
+    the reads to the primary rather than a possibly lagging replica.
+    """
+    lists = {}
+    with transaction.atomic(using=router.db_for_write(TodoItem), savepoint=False):
+        todo_ids = sorted(todo_ids)
+        for start in range(0, len(todo_ids), batch_size):
+            batch = todo_ids[start : start + batch_size]
+            tags = tag_lists(batch)
+            now = timezone.now()
+            TodoItem.objects.bulk_update(
+                [
+                    TodoItem(pk=pk, tag_list=tags.get(pk, []), updated_at=now)
+                    for pk in batch
+                ],
+                ["tag_list", "updated_at"],
+            )
+            lists.update((pk, tags.get(pk, [])) for pk in batch)
+    return lists
+
+
+class TodoItemQuerySet(models.QuerySet):
+    def refresh_tag_lists(self, batch_size=1000):
+        """``refresh_tag_lists`` for every todo in the queryset."""
+        return refresh_tag_lists(self.values_list("pk", flat=True), batch_size)
+
+
 class TodoItem(models.Model):
     STATUS_CHOICES = [
         ("OPEN", "Open"),
@@ -19,18 +98,41 @@ class TodoItem(models.Model):
         ("OVERDUE", "Overdue"),
         ("CANCELLED", "Cancelled"),
     ]
+    # Statuses that can still become overdue.
+    ACTIVE_STATUSES = ["OPEN", "WORKING", "PENDING REVIEW"]
 
     timestamp = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
     title = models.CharField(max_length=100)
     description = models.CharField(max_length=1000)
     due_date = models.DateTimeField(null=True, blank=True)
     tags = models.ManyToManyField(Tag, blank=True)
+    # Copy of ``tags`` as ``[{"id", "name"}]`` in tag id order, kept up to
+    # date by the signals in ``signals`` so reads can skip the join. Only
+    # ``refresh_tag_lists`` and the bulk insert path write it.
+    tag_list = models.JSONField(default=list, blank=True, editable=False)
+    # The list version of the latest write to the row, stamped by the
+    # triggers in ``conditional``. Writes commit one at a time, so it grows
+    # in commit order; the change feed pages on it.
+    change_seq = models.BigIntegerField(default=0, db_default=0, editable=False)
     status = models.CharField(
         max_length=15,
         choices=STATUS_CHOICES,
         default="OPEN",
     )
 
+    objects = TodoItemQuerySet.as_manager()
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["timestamp", "id"], name="todo_timestamp_id_idx"),
+            models.Index(fields=["due_date"], name="todo_due_date_idx"),
+            # Also serves status-only filters through its leading column.
+            models.Index(fields=["status", "due_date"], name="todo_status_due_idx"),
+            models.Index(fields=["updated_at", "id"], name="todo_updated_id_idx"),
+            models.Index(fields=["change_seq"], name="todo_change_seq_idx"),
+        ]
+
     def clean(self):
         super().clean()
         current_time = timezone.now()
@@ -40,7 +142,76 @@ class TodoItem(models.Model):
 
     def save(self, *args, **kwargs):
         self.full_clean()  # Calls the clean method
+        if (
+            not self._state.adding
+            and self.pk is not None
+            and kwargs.get("update_fields") is None
+            and not kwargs.get("force_insert")
+        ):
+            # Leave tag_list out of updates: the copy loaded with this
+            # instance may predate a tag change made since. change_seq is
+            # only ever written by the triggers.
+            kwargs["update_fields"] = [
+                field.name
+                for field in self._meta.concrete_fields
+                if not field.primary_key
+                and field.name not in ("tag_list", "change_seq")
+            ]
         super().save(*args, **kwargs)
 
     def __str__(self):
         return self.title
+
+
+class TodoItemTombstone(models.Model):
+    """Marks a deleted todo so readers can notice deletions without
+    counting rows."""
+
+    todo_id = models.BigIntegerField()
+    deleted_at = models.DateTimeField(default=timezone.now)
+    # Stamped like ``TodoItem.change_seq``.
+    change_seq = models.BigIntegerField(default=0, db_default=0, editable=False)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["deleted_at", "id"], name="todo_tombstone_idx"),
+            models.Index(fields=["change_seq"], name="todo_tombstone_change_seq_idx"),
+        ]
+
+    def __str__(self):
+        return f"{self.todo_id} deleted at {self.deleted_at}"
+
+
+class TodoListVersion(models.Model):
+    """A single row whose ``version`` goes up on every write to todos, tag
+    links, tag names or tombstones, bumped by the triggers in
+    ``conditional``. Unlike the newest ``updated_at`` it also moves when a
+    transaction commits after a later one."""
+
+    version = models.BigIntegerField(default=0)
+
+    def __str__(self):
+        return f"todo list version {self.version}"
+
+
+class TodoCounter(models.Model):
+    """Number of todos with a status or a tag, kept up to date by the
+    database triggers in ``stats`` so statistics never scan the todo table.
+    Counters that drop to zero are removed."""
+
+    KIND_CHOICES = [("status", "Status"), ("tag", "Tag")]
+
+    kind = models.CharField(max_length=10, choices=KIND_CHOICES)
+    # The status code, or the tag id as text.
+    value = models.CharField(max_length=30)
+    count = models.BigIntegerField(default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["kind", "value"], name="todo_counter_kind_value_uniq"
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.kind} {self.value}: {self.count}"
@@ -0,0 +1,174 @@
+import base64
+import json
+from collections import OrderedDict
+from datetime import date, datetime
+
+from django.core.exceptions import FieldDoesNotExist, ValidationError
+from django.db.models import Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+
+def keyset_filter(fields, position, reverse=False):
+    """Build ``(f1, f2, ...) > (v1, v2, ...)`` as a range-seekable filter.
+
+    The leading ``f1 >= v1`` term lets the database seek straight into a
+    composite index instead of scanning it from the start. With ``reverse``
+    the comparison is ``<``.
+    """
+    op = "lt" if reverse else "gt"
+    leading, value = fields[0], position[0]
+    condition = Q(**{f"{leading}__{op}": value})
+    for index in range(1, len(fields)):
+        equal = {name: position[i] for i, name in enumerate(fields[:index])}
+        condition |= Q(**equal, **{f"{fields[index]}__{op}": position[index]})
+    return Q(**{f"{leading}__{op}e": value}) & condition
+
+
+class KeysetPagination(BasePagination):
+    """Cursor pagination over a composite, strictly increasing key.
+
+    The cursor carries the key of the last (or first) row on the current
+    page and the next page is fetched with a range seek on that key, so
+    every page costs the same regardless of its depth: there is no OFFSET
+    and no COUNT(*). The key is the queryset's own ``order_by()`` when it
+    has one, otherwise ``ordering``; its last field must be unique. Rows may
+    be model instances or ``values()`` dicts.
+    """
+
+    page_size = 50
+    max_page_size = 500
+    page_size_query_param = "page_size"
+    cursor_query_param = "cursor"
+    ordering = ("id",)
+    invalid_cursor_message = "Invalid cursor"
+
+    def paginate_queryset(self, queryset, request, view=None):
+        return self.build_page(list(self.get_page_queryset(queryset, request)))
+
+    def get_page_queryset(self, queryset, request):
+        """Return the lazy queryset for the requested page.
+
+        It selects one row more than the page size so ``build_page`` can tell
+        whether there is another page without counting.
+        """
+        self.request = request
+        self.base_url = request.build_absolute_uri()
+        self.page_size = self.get_page_size(request)
+        self.fields = list(queryset.query.order_by or self.ordering)
+        self.position, self.reverse = self.decode_cursor(request, queryset)
+
+        order = [f"-{name}" if self.reverse else name for name in self.fields]
+        queryset = queryset.order_by(*order)
+        if self.position is not None:
+            queryset = queryset.filter(self.seek(self.position))
+        return queryset[: self.page_size + 1]
+
+    def build_page(self, rows):
+        self.has_more = len(rows) > self.page_size
+        rows = rows[: self.page_size]
+        if self.reverse:
+            rows.reverse()
+        self.page = rows
+        return rows
+
+    def seek(self, position):
+        return keyset_filter(self.fields, position, reverse=self.reverse)
+
+    def get_page_size(self, request):
+        try:
+            size = int(request.query_params[self.page_size_query_param])
+        except (KeyError, ValueError):
+            return self.page_size
+        if size <= 0:
+            return self.page_size
+        return min(size, self.max_page_size)
+
+    def decode_cursor(self, request, queryset):
+        encoded = request.query_params.get(self.cursor_query_param)
+        if not encoded:
+            return None, False
+        try:
+            payload = json.loads(base64.urlsafe_b64decode(encoded.encode("ascii")))
+            values = payload["k"]
+            if len(values) != len(self.fields):
+                raise ValueError(values)
+            # Only scalars are ever encoded; a null or a list would reach the
+            # seek filter unchecked.
+            if not all(isinstance(value, (str, int, float)) for value in values):
+                raise TypeError(values)
+            position = [
+                self.decode_value(queryset, name, value)
+                for name, value in zip(self.fields, values)
+            ]
+            return position, bool(payload.get("r"))
+        except (TypeError, ValueError, KeyError, ValidationError):
+            raise NotFound(self.invalid_cursor_message)
+
+    @staticmethod
+    def decode_value(queryset, name, value):
+        try:
+            field = queryset.model._meta.get_field(name)
+        except FieldDoesNotExist:
+            # An annotation, such as the search rank.
+            field = queryset.query.annotations[name].output_field
+        return field.to_python(value)
+
+    def encode_cursor(self, row, reverse):
+        values = []
+        for name in self.fields:
+            value = row[name] if isinstance(row, dict) else getattr(row, name)
+            if isinstance(value, (datetime, date)):
+                value = value.isoformat()
+            values.append(value)
+        payload = {"k": values, "r": 1} if reverse else {"k": values}
+        encoded = base64.urlsafe_b64encode(json.dumps(payload).encode("ascii"))
+        return replace_query_param(
+            self.base_url, self.cursor_query_param, encoded.decode("ascii")
+        )
+
+    def get_next_link(self):
+        has_next = True if self.reverse else self.has_more
+        if not has_next:
+            return None
+        if not self.page:
+            return remove_query_param(self.base_url, self.cursor_query_param)
+        return self.encode_cursor(self.page[-1], reverse=False)
+
+    def get_previous_link(self):
+        has_previous = self.has_more if self.reverse else self.position is not None
+        if not has_previous:
+            return None
+        if not self.page:
+            return remove_query_param(self.base_url, self.cursor_query_param)
+        return self.encode_cursor(self.page[0], reverse=True)
+
+    def get_paginated_response(self, data):
+        return Response(
+            OrderedDict(
+                [
+                    ("next", self.get_next_link()),
+                    ("previous", self.get_previous_link()),
+                    ("results", data),
+                ]
+            )
+        )
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            "type": "object",
+            "required": ["results"],
+            "properties": {
+                "next": {"type": "string", "nullable": True, "format": "uri"},
+                "previous": {"type": "string", "nullable": True, "format": "uri"},
+                "results": schema,
+            },
+        }
+
+
+class TodoItemCursorPagination(KeysetPagination):
+    """Pages todos oldest first on the ``(timestamp, id)`` index."""
+
+    ordering = ("timestamp", "id")
@@ -0,0 +1,113 @@
+import csv
+import io
+import json
+
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import BaseRenderer, JSONRenderer
+from rest_framework.utils import encoders
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - orjson is optional
+    orjson = None
+
+_encoder = encoders.JSONEncoder()
+
+
+def dumps(data):
+    """Compact UTF-8 JSON bytes for ``data``, using orjson when installed.
+
+    Datetimes are written as DRF writes them (ISO 8601, ``Z`` for UTC);
+    types neither backend knows, such as lazy translation strings, go
+    through DRF's ``JSONEncoder.default``.
+    """
+    if orjson is not None:
+        return orjson.dumps(
+            data,
+            default=_encoder.default,
+            option=orjson.OPT_UTC_Z | orjson.OPT_NON_STR_KEYS,
+        )
+    return json.dumps(
+        data, cls=encoders.JSONEncoder, ensure_ascii=False, separators=(",", ":")
+    ).encode()
+
+
+class FastJSONRenderer(JSONRenderer):
+    """``JSONRenderer`` backed by ``dumps``.
+
+    Output is the same compact JSON as DRF's renderer, including the
+    escaping of U+2028 and U+2029. Indented output (``; indent=N`` in the
+    Accept header, or the browsable API) is left to DRF's stdlib path.
+    """
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b""
+        if orjson is None or self.get_indent(
+            accepted_media_type, renderer_context or {}
+        ):
+            return super().render(data, accepted_media_type, renderer_context)
+        content = dumps(data)
+        if b"\xe2\x80\xa8" in content or b"\xe2\x80\xa9" in content:
+            content = content.replace(b"\xe2\x80\xa8", b"\\u2028").replace(
+                b"\xe2\x80\xa9", b"\\u2029"
+            )
+        return content
+
+
+class FastJSONParser(JSONParser):
+    """``JSONParser`` backed by ``orjson.loads`` when installed."""
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        encoding = (parser_context or {}).get("encoding", "utf-8")
+        if orjson is None or encoding.lower() not in ("utf-8", "utf8"):
+            return super().parse(stream, media_type, parser_context)
+        try:
+            return orjson.loads(stream.read())
+        except orjson.JSONDecodeError as exc:
+            raise ParseError(f"JSON parse error - {exc}")
+
+
+class NDJSONRenderer(BaseRenderer):
+    """Newline-delimited JSON. A list renders one document per line; any
+    other payload, such as an error, as a single line."""
+
+    media_type = "application/x-ndjson"
+    format = "ndjson"
+    charset = "utf-8"
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        rows = data if isinstance(data, list) else [data]
+        return b"".join(dumps(row) + b"\n" for row in rows)
+
+
+class CSVRenderer(BaseRenderer):
+    """CSV with a header row taken from the keys of the first object."""
+
+    media_type = "text/csv"
+    format = "csv"
+    charset = "utf-8"
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        rows = data if isinstance(data, list) else [data]
+        buffer = io.StringIO()
+        if rows:
+            writer = csv.DictWriter(buffer, fieldnames=list(rows[0]))
+            writer.writeheader()
+            writer.writerows(rows)
+        return buffer.getvalue().encode(self.charset)
+
+
+class PrometheusRenderer(BaseRenderer):
+    """Prometheus text exposition format. The view hands over the finished
+    text; anything else, such as an error, is rendered as a comment."""
+
+    media_type = "text/plain"
+    format = "prometheus"
+    charset = "utf-8"
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if not isinstance(data, str):
+            data = "# " + json.dumps(data) + "\n"
+        return data.encode(self.charset)
@@ -0,0 +1,186 @@
+import random
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.core.cache import caches
+from django.db import DEFAULT_DB_ALIAS, connections
+from django.utils.crypto import salted_hmac
+
+# The alias every todo read goes to for the current request: a replica
+# picked once per request, or the primary. None outside a request.
+_read_alias = ContextVar("todo_app_read_alias", default=None)
+
+
+def replicas():
+    return getattr(settings, "TODO_READ_REPLICAS", [])
+
+
+@contextmanager
+def read_from(alias):
+    """Route every read in the block to the database ``alias``."""
+    token = _read_alias.set(alias)
+    try:
+        yield
+    finally:
+        _read_alias.reset(token)
+
+
+def use_primary():
+    """Route every read in the block to the primary database."""
+    return read_from(DEFAULT_DB_ALIAS)
+
+
+class ReplicaRouter:
+    """Read ``todo_app`` models from a replica, write them to the primary.
+
+    Reads go to the alias set by ``read_from()``: the replica that
+    ``ReplicaPinMiddleware`` picks for a request, so its validators, page
+    and prefetches all come from one snapshot, or the primary for writes
+    and for a client's requests just after one. Outside a request, each
+    read goes to a random alias from ``TODO_READ_REPLICAS``. Reads inside a
+    transaction on the primary stay there, and other apps, auth included,
+    always do.
+    """
+
+    app_label = "todo_app"
+
+    def db_for_read(self, model, **hints):
+        if model._meta.app_label != self.app_label:
+            return None
+        pool = replicas()
+        if not pool or connections[DEFAULT_DB_ALIAS].in_atomic_block:
+            return DEFAULT_DB_ALIAS
+        return _read_alias.get() or random.choice(pool)
+
+    def db_for_write(self, model, **hints):
+        # Explicit, so saving an instance read from a replica writes to the
+        # primary rather than back where it came from.
+        if model._meta.app_label != self.app_label:
+            return None
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        pool = {DEFAULT_DB_ALIAS, *replicas()}
+        if obj1._state.db in pool and obj2._state.db in pool:
+            return True
+        return None
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        # Replicas receive the schema from the primary.
+        if db in replicas():
+            return False
+        return None
+
+
+def pin_key(request):
+    """Cache key naming the client behind ``request``: an HMAC of its
+    credentials or session cookie under ``SECRET_KEY``. None for anonymous
+    requests.
+
+    The middleware runs before authentication, so there is no user yet.
+    Basic credentials are only base64, and a plain hash of them in a shared
+    cache could be brute-forced offline; without the secret key it cannot.
+    """
+    credential = request.headers.get("Authorization") or request.COOKIES.get(
+        settings.SESSION_COOKIE_NAME
+    )
+    if not credential:
+        return None
+    digest = salted_hmac("todo_app.replicas.pin_key", credential).hexdigest()
+    return f"todo-replica-pin:{digest}"
+
+
+def stream_from(alias, content):
+    # Set and restored by hand: a server may resume the generator in a
+    # copy of the context it started in, where a reset token is invalid.
+    previous = _read_alias.get()
+    _read_alias.set(alias)
+    try:
+        yield from content
+    finally:
+        _read_alias.set(previous)
+
+
+async def astream_from(alias, content):
+    previous = _read_alias.get()
+    _read_alias.set(alias)
+    try:
+        async for chunk in content:
+            yield chunk
+    finally:
+        _read_alias.set(previous)
+
+
+class ReplicaPinMiddleware:
+    """One replica per request, and read-your-writes, on top of
+    ``ReplicaRouter``.
+
+    A read request picks one alias from ``TODO_READ_REPLICAS`` and reads
+    everything from it, streamed content included, so replicas that lag by
+    different amounts never mix in one response. A write request (any
+    method but GET, HEAD and OPTIONS) reads from the primary throughout.
+    Once it succeeds, the client is pinned to the primary for
+    ``TODO_REPLICA_PIN_SECONDS``, long enough for replication to catch up,
+    so a GET straight after a PUT never sees the old row. Pins live in the
+    ``TODO_REPLICA_PIN_CACHE_ALIAS`` cache, which must be shared when
+    several processes serve the API. Does nothing while
+    ``TODO_READ_REPLICAS`` is empty.
+    """
+
+    sync_capable = True
+    async_capable = True
+    safe_methods = ("GET", "HEAD", "OPTIONS")
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    @property
+    def cache(self):
+        return caches[getattr(settings, "TODO_REPLICA_PIN_CACHE_ALIAS", "default")]
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        pool = replicas()
+        if not pool:
+            return self.get_response(request)
+        key = pin_key(request)
+        write = request.method not in self.safe_methods
+        pinned = key is not None and (write or self.cache.get(key))
+        alias = DEFAULT_DB_ALIAS if pinned else random.choice(pool)
+        with read_from(alias):
+            response = self.get_response(request)
+        if key is not None and write and response.status_code < 400:
+            self.cache.set(key, True, self.pin_seconds)
+        if response.streaming and not response.is_async:
+            # Exports are read while the response is sent.
+            response.streaming_content = stream_from(alias, response.streaming_content)
+        return response
+
+    async def __acall__(self, request):
+        pool = replicas()
+        if not pool:
+            return await self.get_response(request)
+        key = pin_key(request)
+        write = request.method not in self.safe_methods
+        pinned = key is not None and (write or await self.cache.aget(key))
+        alias = DEFAULT_DB_ALIAS if pinned else random.choice(pool)
+        with read_from(alias):
+            response = await self.get_response(request)
+        if key is not None and write and response.status_code < 400:
+            await self.cache.aset(key, True, self.pin_seconds)
+        if response.streaming:
+            response.streaming_content = (
+                astream_from(alias, response.streaming_content)
+                if response.is_async
+                else stream_from(alias, response.streaming_content)
+            )
+        return response
+
+    @property
+    def pin_seconds(self):
+        return getattr(settings, "TODO_REPLICA_PIN_SECONDS", 5)
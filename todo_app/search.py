@@ -0,0 +1,124 @@
+from django.db import connections
+from django.db.models import FloatField, Q
+from django.db.models.expressions import RawSQL
+from .models import TodoItem
+
+FTS_TABLE = "todo_app_todoitem_fts"
+TODO_TABLE = TodoItem._meta.db_table
+
+# An external-content FTS5 index over todo titles and descriptions. The
+# triggers keep it in step with every write to the todo table, including
+# bulk_create() and QuerySet.update()/delete(), which bypass model signals.
+FTS_SCHEMA = [
+    f"""
+    CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} USING fts5(
+        title, description, content='{TODO_TABLE}', content_rowid='id'
+    )
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_ai AFTER INSERT ON {TODO_TABLE}
+    BEGIN
+        INSERT INTO {FTS_TABLE}(rowid, title, description)
+        VALUES (new.id, new.title, new.description);
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_ad AFTER DELETE ON {TODO_TABLE}
+    BEGIN
+        INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, title, description)
+        VALUES ('delete', old.id, old.title, old.description);
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_au
+    AFTER UPDATE OF title, description ON {TODO_TABLE}
+    BEGIN
+        INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, title, description)
+        VALUES ('delete', old.id, old.title, old.description);
+        INSERT INTO {FTS_TABLE}(rowid, title, description)
+        VALUES (new.id, new.title, new.description);
+    END
+    """,
+]
+FTS_OBJECTS = {FTS_TABLE, f"{FTS_TABLE}_ai", f"{FTS_TABLE}_ad", f"{FTS_TABLE}_au"}
+
+
+def fts_supported(connection):
+    return connection.vendor == "sqlite"
+
+
+def install_fts(connection):
+    """Create the FTS5 table and its triggers if any of them are missing.
+
+    SQLite drops triggers along with their table, so this runs again after
+    every migrate: a migration that rebuilds the todo table would otherwise
+    leave the index silently stale. When anything had to be (re)created the
+    index is rebuilt from the todo table.
+    """
+    if not fts_supported(connection):
+        return False
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT name FROM sqlite_master WHERE name IN (%s, %s, %s, %s)",
+            sorted(FTS_OBJECTS),
+        )
+        if {row[0] for row in cursor.fetchall()} == FTS_OBJECTS:
+            return False
+        for statement in FTS_SCHEMA:
+            cursor.execute(statement)
+        cursor.execute(f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES ('rebuild')")
+    return True
+
+
+def uninstall_fts(connection):
+    if not fts_supported(connection):
+        return
+    with connection.cursor() as cursor:
+        for trigger in ("ai", "ad", "au"):
+            cursor.execute(f"DROP TRIGGER IF EXISTS {FTS_TABLE}_{trigger}")
+        cursor.execute(f"DROP TABLE IF EXISTS {FTS_TABLE}")
+
+
+def to_fts_query(text):
+    """Quote each word of ``text`` so user input is never parsed as FTS5
+    syntax; the quoted terms are implicitly AND-ed."""
+    terms = text.split()
+    return " ".join('"{}"'.format(term.replace('"', '""')) for term in terms)
+
+
+def search_todos(queryset, text):
+    """Restrict ``queryset`` to todos matching ``text``, best match first.
+
+    On SQLite this filters on the ids the FTS5 index matches and orders by
+    its BM25 ``rank``, exposed as the ``search_rank`` annotation (lower is
+    better) with ``id`` as the tie-breaker. Other backends fall back to
+    ``icontains`` on ``title`` and ``description`` without ranking.
+    """
+    terms = text.split()
+    if not terms:
+        return queryset
+    if not fts_supported(connections[queryset.db]):
+        for term in terms:
+            queryset = queryset.filter(
+                Q(title__icontains=term) | Q(description__icontains=term)
+            )
+        return queryset
+    query = to_fts_query(text)
+    matches = RawSQL(
+        f"SELECT rowid FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH %s", [query]
+    )
+    # The derived table runs the MATCH once per query; LIMIT -1 keeps SQLite
+    # from flattening it into a MATCH per todo, and the rank is then looked
+    # up through an automatic index on its rowid.
+    rank = RawSQL(
+        f"SELECT ranked.rank FROM (SELECT rowid, rank FROM {FTS_TABLE} "
+        f"WHERE {FTS_TABLE} MATCH %s LIMIT -1) AS ranked "
+        f'WHERE ranked.rowid = "{TODO_TABLE}"."id"',
+        [query],
+        output_field=FloatField(),
+    )
+    return (
+        queryset.filter(pk__in=matches)
+        .annotate(search_rank=rank)
+        .order_by("search_rank", "id")
+    )
@@ -1,5 +1,14 @@
 from rest_framework import serializers
+from rest_framework.utils.serializer_helpers import ReturnDict, ReturnList
 from .models import TodoItem, Tag
+from .services import (
+    ADD_TAGS_QUERIES,
+    RESOLVE_TAGS_QUERIES,
+    SET_TAGS_QUERIES,
+    TRANSACTION_QUERIES,
+)
+from django.conf import settings
+from django.db import transaction
 from django.utils import timezone
 
 
@@ -45,31 +54,108 @@ class TodoItemSerializer(serializers.ModelSerializer):
             raise serializers.ValidationError("Due date cannot be in the past.")
         return value
 
+    def resolve_tags(self, tags_data):
+        """Map validated tag data to Tag rows, creating missing ones in bulk."""
+        names = [tag_data["name"] for tag_data in tags_data]
+        tags = Tag.objects.resolve(names)
+        return [tags[name] for name in dict.fromkeys(names)]
+
+    # Queries run by create() and update(): the transaction, the todo's
+    # INSERT or UPDATE, and its tags. Views build their budgets from these.
+    create_queries = TRANSACTION_QUERIES + 1 + RESOLVE_TAGS_QUERIES + ADD_TAGS_QUERIES
+    update_queries = TRANSACTION_QUERIES + 1 + RESOLVE_TAGS_QUERIES + SET_TAGS_QUERIES
+
     def create(self, validated_data):
         tags_data = validated_data.pop("tags", [])
-        todo_item = TodoItem.objects.create(**validated_data)
-        tag_names = set()
-        for tag_data in tags_data:
-            tag_name = tag_data["name"]
-            if tag_name not in tag_names:
-                tag, _ = Tag.objects.get_or_create(name=tag_name)
-                todo_item.tags.add(tag)
-                tag_names.add(tag_name)
+        with transaction.atomic():
+            todo_item = TodoItem.objects.create(**validated_data)
+            if tags_data:
+                todo_item.tags.add(*self.resolve_tags(tags_data))
         return todo_item
 
     def update(self, instance, validated_data):
         tags_data = validated_data.pop("tags", [])
         for attr, value in validated_data.items():
             setattr(instance, attr, value)
-        instance.save()
-
-        if tags_data:
-            instance.tags.clear()
-            tag_names = set()
-            for tag_data in tags_data:
-                tag_name = tag_data["name"]
-                if tag_name not in tag_names:
-                    tag, _ = Tag.objects.get_or_create(name=tag_name)
-                    instance.tags.add(tag)
-                    tag_names.add(tag_name)
+        with transaction.atomic():
+            instance.save()
+            if tags_data:
+                # set() diffs against the current links, so only added and
+                # removed tags touch the through table.
+                instance.tags.set(self.resolve_tags(tags_data))
         return instance
+
+
+class TodoItemReadSerializer:
+    """Read-only fast path producing ``TodoItemSerializer`` output.
+
+    It works on ``values()`` rows (see ``select``) instead of model
+    instances, takes tags from the denormalized ``TodoItem.tag_list`` so no
+    join is needed, and builds each dict directly rather than running a
+    field object per attribute, which is where ``TodoItemSerializer`` spends
+    most of a list response. Tags come out in tag id order.
+
+    It mirrors the parts of the serializer interface that list views use:
+    ``Serializer(rows, many=True).data``.
+    """
+
+    fields = ["id", "timestamp", "title", "description", "due_date", "status"]
+
+    def __init__(self, instance=None, many=False, **kwargs):
+        self.instance = instance
+        self.many = many
+
+    @classmethod
+    def select(cls, queryset):
+        """Turn a todo queryset into the rows this serializer reads."""
+        return queryset.prefetch_related(None).values(*cls.fields, "tag_list")
+
+    @property
+    def data(self):
+        if self.many:
+            return ReturnList(self.serialize(self.instance), serializer=self)
+        return ReturnDict(self.serialize([self.instance])[0], serializer=self)
+
+    @classmethod
+    def serialize(cls, rows):
+        to_datetime = serializers.DateTimeField().to_representation
+        return [
+            {
+                "id": row["id"],
+                "timestamp": to_datetime(row["timestamp"]),
+                "title": row["title"],
+                "description": row["description"],
+                "due_date": row["due_date"] and to_datetime(row["due_date"]),
+                "tags": row["tag_list"],
+                "status": row["status"],
+            }
+            for row in rows
+        ]
+
+
+class TodoItemBulkStatusSerializer(serializers.Serializer):
+    """Selects todos by id and/or current status and names the new status."""
+
+    ids = serializers.ListField(
+        child=serializers.IntegerField(min_value=1), required=False, allow_empty=False
+    )
+    from_status = serializers.ListField(
+        child=serializers.ChoiceField(choices=TodoItem.STATUS_CHOICES),
+        required=False,
+        allow_empty=False,
+    )
+    status = serializers.ChoiceField(choices=TodoItem.STATUS_CHOICES)
+    return_ids = serializers.BooleanField(default=False)
+
+    def validate_ids(self, value):
+        max_items = getattr(settings, "TODO_BULK_MAX_ITEMS", 5000)
+        if len(value) > max_items:
+            raise serializers.ValidationError(f"At most {max_items} ids per request.")
+        return value
+
+    def validate(self, attrs):
+        if "ids" not in attrs and "from_status" not in attrs:
+            raise serializers.ValidationError(
+                "Provide ids, from_status or both to select the todo items."
+            )
+        return attrs
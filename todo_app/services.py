@@ -0,0 +1,212 @@
+import math
+import time
+from collections import namedtuple
+from django.conf import settings
+from django.db import connections, transaction
+from django.utils import timezone
+from .models import TodoItem, Tag, refresh_tag_lists, tag_lists
+from .signals import todo_items_changed
+
+OverdueSweep = namedtuple("OverdueSweep", ["updated", "batches", "seconds"])
+TagListRepair = namedtuple(
+    "TagListRepair", ["checked", "drifted", "batches", "seconds"]
+)
+
+# Queries run by the write paths, named so the views' query budgets are
+# built from them; change them with the code they count.
+#
+# SAVEPOINT and RELEASE for a transaction inside another, as under the test
+# runner; an outermost one runs a single BEGIN.
+TRANSACTION_QUERIES = 2
+# Tag.objects.resolve(): read the named tags, INSERT OR IGNORE the missing
+# ones and read those back.
+RESOLVE_TAGS_QUERIES = 3
+# refresh_tag_lists() for the todos of one m2m change: read their tags and
+# UPDATE their tag_list.
+REFRESH_TAG_LISTS_QUERIES = 2
+# todo.tags.add(): read the links already there, INSERT the others, refresh.
+ADD_TAGS_QUERIES = 2 + REFRESH_TAG_LISTS_QUERIES
+# todo.tags.set(): read the current links, DELETE the dropped ones and
+# refresh, then add the new ones.
+SET_TAGS_QUERIES = 1 + 1 + REFRESH_TAG_LISTS_QUERIES + ADD_TAGS_QUERIES
+# Deleting a loaded todo: its tag links, its row, and the tombstone
+# record_tombstone() writes.
+DELETE_TODO_QUERIES = 3
+
+
+def insert_todos(items, batch_size=None):
+    """Insert already validated todos and their tags in one transaction.
+
+    ``items`` are ``validated_data`` dicts from ``TodoItemSerializer``. Todos
+    and tag links are written with batched INSERTs and the tags of every
+    item are resolved together, so the number of queries grows with the
+    number of batches rather than the number of items. ``TodoItem.save`` is
+    bypassed; the serializer has already applied the model's rules, and
+    each ``tag_list`` is filled in here since no m2m signal is sent.
+
+    Returns the inserted ``TodoItem`` instances, in input order, with their
+    pks set but without tags loaded.
+    """
+    if not items:
+        return []
+    batch_size = batch_size or getattr(settings, "TODO_BULK_BATCH_SIZE", 500)
+    fields = [dict(item) for item in items]
+    tag_names = [
+        list(dict.fromkeys(tag["name"] for tag in item.pop("tags", [])))
+        for item in fields
+    ]
+
+    Through = TodoItem.tags.through
+    with transaction.atomic():
+        tags = Tag.objects.resolve(name for names in tag_names for name in names)
+        todos = [
+            TodoItem(
+                **item,
+                tag_list=sorted(
+                    ({"id": tags[name].pk, "name": name} for name in names),
+                    key=lambda tag: tag["id"],
+                ),
+            )
+            for item, names in zip(fields, tag_names)
+        ]
+        todos = TodoItem.objects.bulk_create(todos, batch_size=batch_size)
+        Through.objects.bulk_create(
+            (
+                Through(todoitem_id=todo.pk, tag_id=tags[name].pk)
+                for todo, names in zip(todos, tag_names)
+                for name in names
+            ),
+            batch_size=batch_size,
+        )
+        todo_items_changed.send(sender=TodoItem, pks=[todo.pk for todo in todos])
+    return todos
+
+
+def bulk_create_todos(items, batch_size=None):
+    """Insert todos with ``insert_todos`` and return them in input order
+    with their tags prefetched."""
+    todos = insert_todos(items, batch_size=batch_size)
+    if not todos:
+        return []
+    created = TodoItem.objects.prefetch_related("tags").in_bulk(
+        [todo.pk for todo in todos]
+    )
+    return [created[todo.pk] for todo in todos]
+
+
+def bulk_create_queries(todos, links, batch_size=None, using="default"):
+    """The most queries ``bulk_create_todos`` runs for ``todos`` items with
+    ``links`` tag links between them.
+
+    The transaction and the tag lookup are fixed. ``bulk_create`` splits
+    each ``batch_size`` batch again at the backend's parameter limit (on
+    SQLite, 142 todos or 499 links per INSERT), and ``in_bulk`` reads the
+    todos and prefetches their tags once per ``max_query_params`` ids.
+    """
+    if not todos:
+        return 0
+    batch_size = batch_size or getattr(settings, "TODO_BULK_BATCH_SIZE", 500)
+    connection = connections[using]
+
+    def inserts(model, rows):
+        fields = [
+            field for field in model._meta.concrete_fields if not field.primary_key
+        ]
+        per_insert = max(connection.ops.bulk_batch_size(fields, range(rows)), 1)
+        return math.ceil(rows / min(batch_size, per_insert))
+
+    reads = math.ceil(todos / (connection.features.max_query_params or todos))
+    return (
+        TRANSACTION_QUERIES
+        + RESOLVE_TAGS_QUERIES
+        + inserts(TodoItem, todos)
+        + inserts(TodoItem.tags.through, links)
+        + 2 * reads
+    )
+
+
+def bulk_update_status(queryset, status, return_ids=False):
+    """Move every todo in ``queryset`` to ``status`` with one UPDATE.
+
+    Rows already in ``status`` are left alone, so the returned count is the
+    number of todos that actually changed. With ``return_ids`` the affected
+    ids are read (and locked where the database supports it) in the same
+    transaction first and returned alongside the count.
+    """
+    queryset = queryset.exclude(status=status)
+    with transaction.atomic():
+        ids = None
+        if return_ids:
+            ids = list(
+                queryset.select_for_update().order_by("pk").values_list("pk", flat=True)
+            )
+        count = queryset.update(status=status, updated_at=timezone.now())
+        if count:
+            todo_items_changed.send(sender=TodoItem, pks=ids)
+    return count, ids
+
+
+def mark_overdue(now=None, batch_size=None):
+    """Move active todos whose due date has passed to OVERDUE.
+
+    Each batch is one ``UPDATE ... WHERE id IN (SELECT ... LIMIT n)``
+    served by the ``(status, due_date)`` index and committed on its own, so
+    a large sweep never holds the SQLite write lock for long. Batches run
+    until one comes back short.
+    """
+    now = now or timezone.now()
+    batch_size = batch_size or getattr(settings, "TODO_OVERDUE_BATCH_SIZE", 1000)
+    due = TodoItem.objects.filter(
+        status__in=TodoItem.ACTIVE_STATUSES, due_date__lt=now
+    ).order_by()
+    start = time.perf_counter()
+    updated = batches = 0
+    while True:
+        with transaction.atomic():
+            count = TodoItem.objects.filter(
+                pk__in=due.values("pk")[:batch_size]
+            ).update(status="OVERDUE", updated_at=timezone.now())
+            if count:
+                todo_items_changed.send(sender=TodoItem, pks=None)
+        updated += count
+        batches += 1
+        if count < batch_size:
+            break
+    return OverdueSweep(updated, batches, time.perf_counter() - start)
+
+
+def repair_tag_lists(batch_size=None, dry_run=False):
+    """Find todos whose ``tag_list`` no longer matches their tags, and
+    rewrite them unless ``dry_run``.
+
+    Todos are walked in id order, ``batch_size`` at a time, each batch
+    checked and fixed in its own transaction with one query for the stored
+    lists and one for the tags, so the check can run against a live
+    database. Drift comes from writes that skip model signals, such as raw
+    SQL or ``QuerySet.update`` on tag names.
+    """
+    batch_size = batch_size or getattr(settings, "TODO_TAG_LIST_BATCH_SIZE", 1000)
+    start = time.perf_counter()
+    checked = drifted = batches = 0
+    last_pk = 0
+    while True:
+        with transaction.atomic():
+            rows = list(
+                TodoItem.objects.filter(pk__gt=last_pk)
+                .order_by("pk")
+                .values_list("pk", "tag_list")[:batch_size]
+            )
+            if not rows:
+                break
+            expected = tag_lists([pk for pk, _ in rows])
+            stale = [pk for pk, stored in rows if stored != expected.get(pk, [])]
+            if stale and not dry_run:
+                refresh_tag_lists(stale)
+                todo_items_changed.send(sender=TodoItem, pks=stale)
+        checked += len(rows)
+        drifted += len(stale)
+        batches += 1
+        last_pk = rows[-1][0]
+        if len(rows) < batch_size:
+            break
+    return TagListRepair(checked, drifted, batches, time.perf_counter() - start)
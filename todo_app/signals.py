@@ -0,0 +1,98 @@
+from django.db.models.signals import m2m_changed, post_delete, post_save, pre_delete
+from django.dispatch import Signal, receiver
+from .cache import list_cache
+from .events import hub
+from .models import TodoItem, TodoItemTombstone, Tag, refresh_tag_lists
+
+# Sent by bulk write paths in ``services`` that bypass model signals, with
+# ``pks`` set to the affected todo ids when they are known, else None.
+todo_items_changed = Signal()
+
+
+# Tag changes rewrite the affected todos' ``tag_list`` in the same
+# transaction; ``refresh_tag_lists`` also bumps their ``updated_at``.
+
+
+@receiver(m2m_changed, sender=TodoItem.tags.through)
+def refresh_tag_lists_on_tag_links(sender, instance, action, reverse, pk_set, **kwargs):
+    if not reverse:
+        if action in ("post_add", "post_remove", "post_clear"):
+            instance.tag_list = refresh_tag_lists([instance.pk])[instance.pk]
+    elif action in ("post_add", "post_remove") and pk_set:
+        refresh_tag_lists(pk_set)
+    elif action == "pre_clear":
+        instance._cleared_todo_ids = list(
+            TodoItem.objects.filter(tags=instance).values_list("pk", flat=True)
+        )
+    elif action == "post_clear":
+        refresh_tag_lists(instance.__dict__.pop("_cleared_todo_ids", []))
+
+
+@receiver(post_save, sender=Tag)
+def refresh_tag_lists_on_tag_rename(sender, instance, created, **kwargs):
+    if not created:
+        TodoItem.objects.filter(tags=instance).refresh_tag_lists()
+
+
+@receiver(pre_delete, sender=Tag)
+def collect_todos_on_tag_delete(sender, instance, **kwargs):
+    instance._tagged_todo_ids = list(
+        TodoItem.objects.filter(tags=instance).values_list("pk", flat=True)
+    )
+
+
+@receiver(post_delete, sender=Tag)
+def refresh_tag_lists_on_tag_delete(sender, instance, **kwargs):
+    refresh_tag_lists(instance.__dict__.pop("_tagged_todo_ids", []))
+
+
+@receiver(post_delete, sender=TodoItem)
+def record_tombstone(sender, instance, **kwargs):
+    TodoItemTombstone.objects.create(todo_id=instance.pk)
+
+
+@receiver([post_save, post_delete], sender=TodoItem)
+@receiver([post_save, post_delete], sender=Tag)
+@receiver(m2m_changed, sender=TodoItem.tags.through)
+@receiver(todo_items_changed, sender=TodoItem)
+def invalidate_list_cache(sender, using=None, **kwargs):
+    list_cache.invalidate_on_commit(using=using)
+
+
+@receiver(post_save, sender=TodoItem)
+def publish_todo_saved(sender, instance, created, using=None, **kwargs):
+    event = "todo.created" if created else "todo.updated"
+    hub.publish_on_commit(event, {"id": instance.pk}, using=using)
+
+
+@receiver(post_delete, sender=TodoItem)
+def publish_todo_deleted(sender, instance, using=None, **kwargs):
+    hub.publish_on_commit("todo.deleted", {"id": instance.pk}, using=using)
+
+
+@receiver(m2m_changed, sender=TodoItem.tags.through)
+def publish_tag_links(sender, instance, action, reverse, pk_set, using=None, **kwargs):
+    if action not in ("post_add", "post_remove", "post_clear"):
+        return
+    if not reverse:
+        hub.publish_on_commit("todo.updated", {"id": instance.pk}, using=using)
+    else:
+        ids = sorted(pk_set) if pk_set else None
+        hub.publish_on_commit("todos.changed", {"ids": ids}, using=using)
+
+
+@receiver(todo_items_changed, sender=TodoItem)
+def publish_bulk_change(sender, pks=None, using=None, **kwargs):
+    hub.publish_on_commit("todos.changed", {"ids": pks}, using=using)
+
+
+@receiver(post_save, sender=Tag)
+def publish_tag_saved(sender, instance, created, using=None, **kwargs):
+    if not created:
+        data = {"id": instance.pk, "name": instance.name}
+        hub.publish_on_commit("tag.updated", data, using=using)
+
+
+@receiver(post_delete, sender=Tag)
+def publish_tag_deleted(sender, instance, using=None, **kwargs):
+    hub.publish_on_commit("tag.deleted", {"id": instance.pk}, using=using)
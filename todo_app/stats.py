@@ -0,0 +1,211 @@
+import time
+from collections import namedtuple
+
+from django.db import NotSupportedError, connections, transaction
+from django.db.models import Count
+from .models import Tag, TodoCounter, TodoItem
+
+COUNTER_TABLE = TodoCounter._meta.db_table
+TODO_TABLE = TodoItem._meta.db_table
+LINK_TABLE = TodoItem.tags.through._meta.db_table
+TAG_TABLE = Tag._meta.db_table
+
+CounterRebuild = namedtuple("CounterRebuild", ["counters", "drifted", "seconds"])
+
+
+def increment(kind, value):
+    return f"""
+        INSERT INTO {COUNTER_TABLE} (kind, value, count) VALUES ('{kind}', {value}, 1)
+        ON CONFLICT (kind, value) DO UPDATE SET count = count + 1;
+    """
+
+
+def decrement(kind, value):
+    # An UPDATE rather than an upsert, so a delete never creates a counter.
+    return f"""
+        UPDATE {COUNTER_TABLE} SET count = count - 1
+        WHERE kind = '{kind}' AND value = {value};
+        DELETE FROM {COUNTER_TABLE}
+        WHERE kind = '{kind}' AND value = {value} AND count <= 0;
+    """
+
+
+# Per-status and per-tag todo counts, maintained by triggers in the same
+# statement, and so the same transaction, as the write that changes them:
+# save(), bulk_create(), QuerySet.update()/delete(), tag links and raw SQL
+# alike.
+COUNTER_TRIGGERS = {
+    f"{COUNTER_TABLE}_todo_ai": f"""
+        AFTER INSERT ON {TODO_TABLE} BEGIN
+        {increment("status", "new.status")}
+        END
+    """,
+    f"{COUNTER_TABLE}_todo_ad": f"""
+        AFTER DELETE ON {TODO_TABLE} BEGIN
+        {decrement("status", "old.status")}
+        END
+    """,
+    f"{COUNTER_TABLE}_todo_au": f"""
+        AFTER UPDATE OF status ON {TODO_TABLE}
+        WHEN old.status IS NOT new.status BEGIN
+        {decrement("status", "old.status")}
+        {increment("status", "new.status")}
+        END
+    """,
+    f"{COUNTER_TABLE}_link_ai": f"""
+        AFTER INSERT ON {LINK_TABLE} BEGIN
+        {increment("tag", "CAST(new.tag_id AS TEXT)")}
+        END
+    """,
+    f"{COUNTER_TABLE}_link_ad": f"""
+        AFTER DELETE ON {LINK_TABLE} BEGIN
+        {decrement("tag", "CAST(old.tag_id AS TEXT)")}
+        END
+    """,
+    f"{COUNTER_TABLE}_link_au": f"""
+        AFTER UPDATE OF tag_id ON {LINK_TABLE}
+        WHEN old.tag_id IS NOT new.tag_id BEGIN
+        {decrement("tag", "CAST(old.tag_id AS TEXT)")}
+        {increment("tag", "CAST(new.tag_id AS TEXT)")}
+        END
+    """,
+    f"{COUNTER_TABLE}_tag_ad": f"""
+        AFTER DELETE ON {TAG_TABLE} BEGIN
+        DELETE FROM {COUNTER_TABLE}
+        WHERE kind = 'tag' AND value = CAST(old.id AS TEXT);
+        END
+    """,
+}
+
+REBUILD_SQL = [
+    f"DELETE FROM {COUNTER_TABLE}",
+    f"""
+    INSERT INTO {COUNTER_TABLE} (kind, value, count)
+    SELECT 'status', status, COUNT(*) FROM {TODO_TABLE} GROUP BY status
+    """,
+    f"""
+    INSERT INTO {COUNTER_TABLE} (kind, value, count)
+    SELECT 'tag', CAST(tag_id AS TEXT), COUNT(*) FROM {LINK_TABLE} GROUP BY tag_id
+    """,
+]
+
+
+def counters_supported(connection):
+    return connection.vendor == "sqlite"
+
+
+def install_counters(connection):
+    """Create the counter triggers if any of them are missing, and then
+    recount every counter.
+
+    Like the search index triggers, these disappear when SQLite rebuilds a
+    table during a migration, so this runs again after every migrate. Does
+    nothing until the counter table exists.
+    """
+    if not counters_supported(connection):
+        return False
+    expected = {COUNTER_TABLE, *COUNTER_TRIGGERS}
+    with connection.cursor() as cursor:
+        placeholders = ", ".join(["%s"] * len(expected))
+        cursor.execute(
+            f"SELECT name FROM sqlite_master WHERE name IN ({placeholders})",
+            sorted(expected),
+        )
+        found = {row[0] for row in cursor.fetchall()}
+        # Without the table, migrations are not applied up to it yet.
+        if found == expected or COUNTER_TABLE not in found:
+            return False
+        for name, body in COUNTER_TRIGGERS.items():
+            cursor.execute(f"CREATE TRIGGER IF NOT EXISTS {name} {body}")
+        for statement in REBUILD_SQL:
+            cursor.execute(statement)
+    return True
+
+
+def uninstall_counters(connection):
+    if not counters_supported(connection):
+        return
+    with connection.cursor() as cursor:
+        for name in COUNTER_TRIGGERS:
+            cursor.execute(f"DROP TRIGGER IF EXISTS {name}")
+
+
+def stored_counts(using=None):
+    """``{(kind, value): count}`` from the counter table."""
+    counters = TodoCounter.objects.using(using)
+    return {
+        (kind, value): count
+        for kind, value, count in counters.values_list("kind", "value", "count")
+    }
+
+
+def recount(using=None):
+    """``{(kind, value): count}`` computed with ``GROUP BY`` over the todo
+    and tag link tables, in the counter table's shape."""
+    todos = TodoItem.objects.using(using)
+    links = TodoItem.tags.through.objects.using(using)
+    counts = {
+        ("status", status): count
+        for status, count in todos.order_by()
+        .values_list("status")
+        .annotate(count=Count("pk"))
+    }
+    counts.update(
+        (("tag", str(tag_id)), count)
+        for tag_id, count in links.order_by()
+        .values_list("tag_id")
+        .annotate(count=Count("pk"))
+    )
+    return counts
+
+
+def rebuild_counters(using="default"):
+    """Recount every counter from the todo and tag link tables in one
+    transaction, and report how many stored counters were wrong."""
+    connection = connections[using]
+    start = time.perf_counter()
+    with transaction.atomic(using=using):
+        before = stored_counts(using)
+        with connection.cursor() as cursor:
+            for statement in REBUILD_SQL:
+                cursor.execute(statement)
+        after = stored_counts(using)
+    drifted = sum(
+        before.get(key) != after.get(key) for key in before.keys() | after.keys()
+    )
+    return CounterRebuild(len(after), drifted, time.perf_counter() - start)
+
+
+def todo_stats():
+    """Todo counts for the stats endpoint.
+
+    Read from the counter table, with one more query for the tag names.
+    The counter triggers only exist on SQLite; rather than recount with
+    ``GROUP BY`` on every call, other backends raise ``NotSupportedError``.
+    """
+    counters = TodoCounter.objects.all()
+    if not counters_supported(connections[counters.db]):
+        raise NotSupportedError("Todo statistics need SQLite's counter triggers.")
+    counts = stored_counts()
+    by_status = {
+        status: counts.get(("status", status), 0)
+        for status, _ in TodoItem.STATUS_CHOICES
+    }
+    tag_counts = {
+        int(value): count for (kind, value), count in counts.items() if kind == "tag"
+    }
+    names = dict(Tag.objects.filter(pk__in=tag_counts).values_list("pk", "name"))
+    by_tag = sorted(
+        (
+            {"id": tag_id, "name": names[tag_id], "count": count}
+            for tag_id, count in tag_counts.items()
+            if tag_id in names
+        ),
+        key=lambda tag: (-tag["count"], tag["name"]),
+    )
+    return {
+        "total": sum(by_status.values()),
+        "overdue": by_status["OVERDUE"],
+        "by_status": by_status,
+        "by_tag": by_tag,
+    }
@@ -0,0 +1,17 @@
+from django.test import override_settings
+from django.test.runner import DiscoverRunner
+
+
+class TestRunner(DiscoverRunner):
+    """Run the suite with query budgets enforced: a request that runs more
+    queries than its view's ``query_budget`` raises ``QueryBudgetExceeded``
+    and fails the test that made it."""
+
+    def setup_test_environment(self, **kwargs):
+        super().setup_test_environment(**kwargs)
+        self.strict_budgets = override_settings(TODO_QUERY_BUDGET_STRICT=True)
+        self.strict_budgets.enable()
+
+    def teardown_test_environment(self, **kwargs):
+        self.strict_budgets.disable()
+        super().teardown_test_environment(**kwargs)
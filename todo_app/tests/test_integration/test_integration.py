@@ -125,7 +125,7 @@ class TodoItemIntegrationTest(TestCase):
         self.assertEqual(response.status_code, 200)
 
         # Validate the count in the response and database
-        self.assertEqual(len(response.data), TodoItem.objects.count())
+        self.assertEqual(len(response.data["results"]), TodoItem.objects.count())
 
     def test_clean_method_direct(self):
         """Test the clean method directly for a past due_date."""
@@ -272,6 +272,37 @@ class TodoItemIntegrationTest(TestCase):
         self.assertEqual(create_response.status_code, 201)
         self.assertEqual(Tag.objects.filter(name="Reusable Tag").count(), 1)
 
+    def test_bulk_create_with_db_query(self):
+        """Test bulk creating TodoItems via API and validate the database."""
+        bulk_url = reverse("todo-bulk-create")
+        bulk_data = [
+            {
+                "title": f"Imported Task {i}",
+                "description": "Created through the bulk endpoint.",
+                "due_date": (timezone.now() + timezone.timedelta(days=2)).isoformat(),
+                "status": "OPEN",
+                "tags": [{"name": "Work"}, {"name": "Imported"}],
+            }
+            for i in range(3)
+        ]
+        response = self.client.post(
+            bulk_url, bulk_data, format="json", **self.auth_headers
+        )
+        self.assertEqual(response.status_code, 201)
+
+        created_ids = [result["data"]["id"] for result in response.data["results"]]
+        for todo_id in created_ids:
+            detail_response = self.client.get(
+                reverse("todo-detail", args=[todo_id]), **self.auth_headers
+            )
+            self.assertEqual(detail_response.status_code, 200)
+            self.assertEqual(
+                sorted(tag["name"] for tag in detail_response.data["tags"]),
+                ["Imported", "Work"],
+            )
+        self.assertEqual(Tag.objects.filter(name="Work").count(), 1)
+        self.assertEqual(TodoItem.objects.count(), 4)
+
     def test_home_view(self):
         """Test the home view renders the correct template."""
         response = self.client.get(reverse("home"))
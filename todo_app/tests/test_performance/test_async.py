@@ -0,0 +1,135 @@
+from concurrent.futures import ThreadPoolExecutor
+from django.contrib.auth.models import User
+from django.core.asgi import get_asgi_application
+from django.core.handlers.wsgi import WSGIHandler
+from django.test import TransactionTestCase, override_settings
+from django.urls import reverse
+from todo_app.models import TodoItem
+import asyncio
+import base64
+import io
+import time
+
+CLIENTS = 500
+WSGI_THREADS = 8
+SLOW_CLIENT = 0.25
+ROWS = 200
+QUERY = "page_size=10"
+
+
+@override_settings(TODO_LIST_CACHE_ALIAS=None)
+class AsyncConcurrencyBenchmark(TransactionTestCase):
+    """500 concurrent slow clients: sync views under WSGI versus ASGI.
+
+    Each client takes ``SLOW_CLIENT`` seconds to drain its response. A WSGI
+    worker thread is tied up for that time, so a pool of ``WSGI_THREADS``
+    serves clients in waves; under ASGI the wait is an ``await`` and one
+    event loop holds every client at once. The response cache is disabled
+    so each request does its full database work; pages are kept small so
+    the clients, not the serializer, dominate.
+    """
+
+    def setUp(self):
+        User.objects.create_user(username="bench", password="bench")
+        TodoItem.objects.bulk_create(
+            TodoItem(title=f"Todo {i}", description="Benchmark.") for i in range(ROWS)
+        )
+        token = base64.b64encode(b"bench:bench").decode()
+        self.authorization = f"Basic {token}"
+
+    def run_wsgi(self, path):
+        handler = WSGIHandler()
+
+        def client():
+            environ = {
+                "REQUEST_METHOD": "GET",
+                "PATH_INFO": path,
+                "QUERY_STRING": QUERY,
+                "SERVER_NAME": "testserver",
+                "SERVER_PORT": "80",
+                "HTTP_HOST": "testserver",
+                "HTTP_AUTHORIZATION": self.authorization,
+                "wsgi.url_scheme": "http",
+                "wsgi.input": io.BytesIO(),
+                "wsgi.errors": io.StringIO(),
+            }
+            statuses = []
+            body = b"".join(
+                handler(environ, lambda status, headers: statuses.append(status))
+            )
+            time.sleep(SLOW_CLIENT)
+            return statuses[0], body
+
+        client()  # Verify the password once so every timed request hits the cache.
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=WSGI_THREADS) as pool:
+            results = list(pool.map(lambda _: client(), range(CLIENTS)))
+        return time.perf_counter() - start, [status for status, _ in results]
+
+    def run_asgi(self, path):
+        application = get_asgi_application()
+
+        async def client():
+            scope = {
+                "type": "http",
+                "asgi": {"version": "3.0"},
+                "http_version": "1.1",
+                "method": "GET",
+                "scheme": "http",
+                "path": path,
+                "raw_path": path.encode(),
+                "query_string": QUERY.encode(),
+                "headers": [
+                    (b"host", b"testserver"),
+                    (b"authorization", self.authorization.encode()),
+                ],
+                "server": ("testserver", 80),
+                "client": ("127.0.0.1", 0),
+            }
+            sent = asyncio.Event()
+            messages = [{"type": "http.request", "body": b"", "more_body": False}]
+            statuses = []
+
+            async def receive():
+                if messages:
+                    return messages.pop()
+                await sent.wait()
+                return {"type": "http.disconnect"}
+
+            async def send(message):
+                if message["type"] == "http.response.start":
+                    statuses.append(message["status"])
+                elif not message.get("more_body"):
+                    await asyncio.sleep(SLOW_CLIENT)
+                    sent.set()
+
+            await application(scope, receive, send)
+            return statuses[0]
+
+        async def run():
+            await client()
+            start = time.perf_counter()
+            results = await asyncio.gather(*(client() for _ in range(CLIENTS)))
+            return time.perf_counter() - start, results
+
+        return asyncio.run(run())
+
+    def test_concurrent_slow_clients(self):
+        sync_path = reverse("todo-list-create")
+        async_path = reverse("async-todo-list-create")
+        wsgi, wsgi_statuses = self.run_wsgi(sync_path)
+        asgi_sync, asgi_sync_statuses = self.run_asgi(sync_path)
+        asgi_async, asgi_async_statuses = self.run_asgi(async_path)
+
+        self.assertEqual(set(wsgi_statuses), {"200 OK"})
+        self.assertEqual(set(asgi_sync_statuses), {200})
+        self.assertEqual(set(asgi_async_statuses), {200})
+        print(
+            f"\n{CLIENTS} clients draining for {SLOW_CLIENT * 1000:.0f} ms each:"
+            f"\n  WSGI, sync views, {WSGI_THREADS} threads: {wsgi:.2f}s "
+            f"({CLIENTS / wsgi:.0f} req/s)"
+            f"\n  ASGI, sync views: {asgi_sync:.2f}s ({CLIENTS / asgi_sync:.0f} req/s)"
+            f"\n  ASGI, async views: {asgi_async:.2f}s "
+            f"({CLIENTS / asgi_async:.0f} req/s)"
+        )
+        self.assertLess(asgi_async, wsgi)
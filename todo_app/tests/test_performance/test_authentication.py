@@ -0,0 +1,58 @@
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import authentication
+from rest_framework.test import APIClient
+from todo_app.authentication import CachedBasicAuthentication, CredentialCache
+from todo_app.models import TodoItem
+from todo_app.views import TodoItemDetailView
+from django.contrib.auth.models import User
+from unittest import mock
+import base64
+import time
+
+REQUESTS = 50
+
+
+class BasicAuthenticationBenchmark(TestCase):
+    """Requests/sec on the detail endpoint with and without the
+    verified-credential cache.
+
+    Run with ``python manage.py test todo_app.tests.test_performance``.
+    """
+
+    def setUp(self):
+        self.client = APIClient()
+        User.objects.create_user(username="testuser", password="testpass")
+        credentials = base64.b64encode(b"testuser:testpass").decode("utf-8")
+        self.auth_headers = {"HTTP_AUTHORIZATION": f"Basic {credentials}"}
+        todo = TodoItem.objects.create(
+            title="Benchmark",
+            description="Authentication benchmark.",
+            due_date=timezone.now() + timezone.timedelta(days=1),
+        )
+        self.url = reverse("todo-detail", args=[todo.id])
+
+    def requests_per_second(self, authentication_class):
+        with mock.patch.object(
+            TodoItemDetailView, "authentication_classes", [authentication_class]
+        ):
+            self.client.get(self.url, **self.auth_headers)
+            start = time.perf_counter()
+            for _ in range(REQUESTS):
+                response = self.client.get(self.url, **self.auth_headers)
+                self.assertEqual(response.status_code, 200)
+            return REQUESTS / (time.perf_counter() - start)
+
+    def test_cached_basic_authentication_throughput(self):
+        before = self.requests_per_second(authentication.BasicAuthentication)
+        with mock.patch.object(
+            CachedBasicAuthentication, "credential_cache", CredentialCache()
+        ):
+            after = self.requests_per_second(CachedBasicAuthentication)
+        print(
+            f"\nBasicAuthentication: {before:.1f} req/s, "
+            f"CachedBasicAuthentication: {after:.1f} req/s "
+            f"({after / before:.1f}x)"
+        )
+        self.assertGreater(after, before * 5)
@@ -0,0 +1,51 @@
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework.test import APIClient
+from todo_app.models import TodoItem
+from django.contrib.auth.models import User
+import time
+
+ITEMS = 1000
+
+
+class BulkCreateBenchmark(TestCase):
+    """Todos/sec created one POST at a time versus one bulk POST."""
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(
+            User.objects.create_user(username="testuser", password="testpass")
+        )
+
+    def payload(self, prefix):
+        return [
+            {
+                "title": f"{prefix} {i}",
+                "description": "Benchmark item.",
+                "tags": [{"name": f"Tag{i % 20}"}, {"name": f"Tag{i % 7 + 20}"}],
+            }
+            for i in range(ITEMS)
+        ]
+
+    def test_bulk_create_throughput(self):
+        start = time.perf_counter()
+        for item in self.payload("Single"):
+            response = self.client.post(
+                reverse("todo-list-create"), item, format="json"
+            )
+            self.assertEqual(response.status_code, 201)
+        one_by_one = ITEMS / (time.perf_counter() - start)
+
+        start = time.perf_counter()
+        response = self.client.post(
+            reverse("todo-bulk-create"), self.payload("Bulk"), format="json"
+        )
+        bulk = ITEMS / (time.perf_counter() - start)
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(TodoItem.objects.count(), ITEMS * 2)
+
+        print(
+            f"\none-by-one: {one_by_one:.0f} todos/s, "
+            f"bulk: {bulk:.0f} todos/s ({bulk / one_by_one:.1f}x)"
+        )
+        self.assertGreater(bulk, one_by_one * 2)
@@ -0,0 +1,115 @@
+from django.conf import settings
+from django.db import OperationalError, connections
+from django.test import SimpleTestCase
+from todo_app.benchmark import percentile
+import os
+import tempfile
+import threading
+import time
+
+READERS = 4
+WRITE_SECONDS = 3
+BATCH = 5000
+# A read slower than this counts as stalled behind the writer; readers give
+# up after a busy_timeout of 200 ms.
+STALL_SECONDS = 0.15
+
+
+class SQLiteConcurrencyBenchmark(SimpleTestCase):
+    """Reader stalls while a writer bulk-inserts in 5000-row transactions:
+    SQLite defaults (rollback journal) versus the configured WAL profile.
+
+    The writer's page cache is kept small so it spills to the database file
+    mid-transaction, as a large write does; without WAL that needs the
+    exclusive lock and locks readers out until the commit."""
+
+    def connect(self, path, profile):
+        settings_dict = {
+            **settings.DATABASES["default"],
+            "NAME": path,
+            "TIME_ZONE": None,
+            "AUTOCOMMIT": True,
+        }
+        if not profile:
+            settings_dict["OPTIONS"] = {"timeout": 5}
+        return type(connections["default"])(settings_dict, alias="bench")
+
+    def run_profile(self, profile):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        path = os.path.join(directory.name, "bench.sqlite3")
+        setup = self.connect(path, profile)
+        with setup.cursor() as cursor:
+            cursor.execute("CREATE TABLE item (id INTEGER PRIMARY KEY, body TEXT)")
+            cursor.executemany(
+                "INSERT INTO item (body) VALUES (%s)", [("seed",)] * 10_000
+            )
+        setup.close()
+
+        done = threading.Event()
+        latencies, errors, written = [], [], [0]
+
+        def writer():
+            wrapper = self.connect(path, profile)
+            deadline = time.perf_counter() + WRITE_SECONDS
+            with wrapper.cursor() as cursor:
+                cursor.execute("PRAGMA cache_size=10")
+                while time.perf_counter() < deadline:
+                    cursor.execute("BEGIN IMMEDIATE")
+                    cursor.executemany(
+                        "INSERT INTO item (body) VALUES (%s)", [("x" * 200,)] * BATCH
+                    )
+                    cursor.execute("COMMIT")
+                    written[0] += BATCH
+            wrapper.close()
+            done.set()
+
+        def reader():
+            wrapper = self.connect(path, profile)
+            with wrapper.cursor() as cursor:
+                cursor.execute("PRAGMA busy_timeout=200")
+                while not done.is_set():
+                    start = time.perf_counter()
+                    try:
+                        cursor.execute(
+                            "SELECT id, body FROM item ORDER BY id DESC LIMIT 50"
+                        )
+                        cursor.fetchall()
+                    except OperationalError:
+                        errors.append(1)
+                    latencies.append(time.perf_counter() - start)
+            wrapper.close()
+
+        threads = [threading.Thread(target=writer)] + [
+            threading.Thread(target=reader) for _ in range(READERS)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        latencies.sort()
+        return {
+            "reads": len(latencies),
+            "p99_ms": percentile(latencies, 99) * 1000,
+            "max_ms": latencies[-1] * 1000,
+            "stalls": sum(latency >= STALL_SECONDS for latency in latencies),
+            "errors": len(errors),
+            "written": written[0],
+        }
+
+    def test_readers_during_bulk_writes(self):
+        default = self.run_profile(profile=False)
+        wal = self.run_profile(profile=True)
+        print(f"\n{READERS} readers during {WRITE_SECONDS}s of {BATCH}-row inserts:")
+        for name, result in (("SQLite defaults", default), ("WAL profile", wal)):
+            print(
+                f"  {name}: {result['reads']} reads, p99 {result['p99_ms']:.2f} ms, "
+                f"max {result['max_ms']:.2f} ms, {result['stalls']} stalls, "
+                f"{result['errors']} errors, "
+                f"{result['written']} rows written"
+            )
+        # Without WAL, readers wait out busy_timeout or give up while the
+        # writer holds the exclusive lock; with it, no read waits at all.
+        self.assertGreater(default["stalls"] + default["errors"], 0)
+        self.assertEqual(wal["stalls"], 0)
+        self.assertEqual(wal["errors"], 0)
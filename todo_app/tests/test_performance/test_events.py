@@ -0,0 +1,54 @@
+from django.test import SimpleTestCase
+from todo_app.events import EventHub
+import asyncio
+import threading
+import time
+import tracemalloc
+
+SUBSCRIBERS = 10_000
+
+
+class EventFanOutBenchmark(SimpleTestCase):
+    """Idle SSE subscribers: memory each, and how fast one event reaches all."""
+
+    def test_fan_out(self):
+        hub = EventHub()
+
+        async def subscriber(ready, received):
+            stream = hub.stream(heartbeat=60)
+            await anext(stream)  # retry: line
+            ready.release()
+            chunk = await anext(stream)
+            received.append(chunk)
+            await stream.aclose()
+
+        async def run():
+            ready = asyncio.Semaphore(0)
+            received = []
+            tracemalloc.start()
+            baseline = tracemalloc.get_traced_memory()[0]
+            tasks = [
+                asyncio.create_task(subscriber(ready, received))
+                for _ in range(SUBSCRIBERS)
+            ]
+            for _ in range(SUBSCRIBERS):
+                await ready.acquire()
+            await asyncio.sleep(0.1)  # Let every subscriber reach its wait.
+            idle = tracemalloc.get_traced_memory()[0] - baseline
+            tracemalloc.stop()
+
+            start = time.perf_counter()
+            threading.Thread(
+                target=hub.publish, args=("todo.created", {"id": 1})
+            ).start()
+            await asyncio.gather(*tasks)
+            return idle, time.perf_counter() - start, received
+
+        idle, fan_out, received = asyncio.run(run())
+        self.assertEqual(len(received), SUBSCRIBERS)
+        print(
+            f"\n{SUBSCRIBERS} idle subscribers: {idle / SUBSCRIBERS / 1024:.1f} KiB each; "
+            f"one event reached all of them in {fan_out * 1000:.0f} ms"
+        )
+        self.assertLess(idle / SUBSCRIBERS, 16 * 1024)
+        self.assertLess(fan_out, 2)
@@ -0,0 +1,72 @@
+from django.db import connection
+from django.test import TestCase
+from django.utils import timezone
+from todo_app.export import iter_csv, iter_ndjson, iter_todos
+from todo_app.models import Tag
+from itertools import islice
+import json
+import time
+import tracemalloc
+
+ROWS = 1_000_000
+TAGS = 20
+PEAK_LIMIT = 32 * 1024 * 1024
+
+
+class StreamingExportBenchmark(TestCase):
+    """Peak Python memory of the streaming export at one million rows."""
+
+    @classmethod
+    def setUpTestData(cls):
+        now = timezone.now()
+        tags = Tag.objects.bulk_create(Tag(name=f"tag{i}") for i in range(TAGS))
+        tag_lists = [json.dumps([{"id": tag.id, "name": tag.name}]) for tag in tags]
+        rows = (
+            (
+                now,
+                now,
+                f"Todo {i}",
+                f"Exported todo number {i}.",
+                "OPEN",
+                "[]" if i % 2 else tag_lists[i % TAGS],
+            )
+            for i in range(ROWS)
+        )
+        with connection.cursor() as cursor:
+            cursor.executemany(
+                "INSERT INTO todo_app_todoitem"
+                " (timestamp, updated_at, title, description, status, tag_list)"
+                " VALUES (%s, %s, %s, %s, %s, %s)",
+                rows,
+            )
+            cursor.execute("SELECT MIN(id) FROM todo_app_todoitem")
+            first = cursor.fetchone()[0]
+            cursor.executemany(
+                "INSERT INTO todo_app_todoitem_tags (todoitem_id, tag_id)"
+                " VALUES (%s, %s)",
+                ((first + i, tags[i % TAGS].id) for i in range(0, ROWS, 2)),
+            )
+
+    def measure(self, writer, rows):
+        tracemalloc.start()
+        start = time.perf_counter()
+        written = 0
+        for line in islice(writer(iter_todos()), rows):
+            written += len(line)
+        seconds = time.perf_counter() - start
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        return peak, seconds, written
+
+    def test_peak_memory_is_flat(self):
+        small, _, _ = self.measure(iter_ndjson, ROWS // 10)
+        for name, writer in (("NDJSON", iter_ndjson), ("CSV", iter_csv)):
+            peak, seconds, written = self.measure(writer, ROWS + 1)
+            print(
+                f"\n{name} export of {ROWS} rows: {written / 1e6:.0f} MB written "
+                f"in {seconds:.1f}s, peak {peak / 1e6:.1f} MB traced "
+                f"(first {ROWS // 10} rows: {small / 1e6:.1f} MB)"
+            )
+            self.assertLess(peak, PEAK_LIMIT)
+            # Ten times the rows must not mean ten times the memory.
+            self.assertLess(peak, small * 2)
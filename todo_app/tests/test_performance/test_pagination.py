@@ -0,0 +1,57 @@
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from rest_framework.test import APIClient
+from todo_app.models import TodoItem
+from django.contrib.auth.models import User
+import time
+
+ROWS = 100_000
+PAGE_SIZE = 20
+REPEAT = 20
+
+
+# Measures the queries, not cached responses.
+@override_settings(TODO_LIST_CACHE_ALIAS=None)
+class KeysetPaginationBenchmark(TestCase):
+    """Latency of the first page versus a page deep into the table."""
+
+    @classmethod
+    def setUpTestData(cls):
+        TodoItem.objects.bulk_create(
+            (TodoItem(title=f"Todo {i}", description="Seeded.") for i in range(ROWS)),
+            batch_size=5000,
+        )
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(
+            User.objects.create_user(username="testuser", password="testpass")
+        )
+
+    def seconds_per_page(self, url):
+        start = time.perf_counter()
+        for _ in range(REPEAT):
+            response = self.client.get(url)
+            self.assertEqual(response.status_code, 200)
+        return (time.perf_counter() - start) / REPEAT, response
+
+    def test_deep_page_costs_the_same_as_first_page(self):
+        url = reverse("todo-list-create") + f"?page_size={PAGE_SIZE}"
+        first, _ = self.seconds_per_page(url)
+
+        # Jump straight to the page ~5,000 pages in by building its cursor
+        # from the item that precedes it.
+        anchor = TodoItem.objects.order_by("timestamp", "id")[
+            PAGE_SIZE * 4999 - 1 : PAGE_SIZE * 4999
+        ].get()
+        response = self.client.get(url)
+        paginator = response.renderer_context["view"].paginator
+        deep_url = paginator.encode_cursor(anchor, reverse=False)
+        deep, response = self.seconds_per_page(deep_url)
+        self.assertEqual(len(response.data["results"]), PAGE_SIZE)
+
+        print(
+            f"\npage 1: {first * 1000:.2f} ms, "
+            f"page 5000: {deep * 1000:.2f} ms ({ROWS} rows)"
+        )
+        self.assertLess(deep, first * 2)
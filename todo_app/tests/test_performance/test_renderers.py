@@ -0,0 +1,72 @@
+from django.test import SimpleTestCase
+from django.utils import timezone
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+from todo_app.renderers import FastJSONParser, FastJSONRenderer, orjson
+import io
+import time
+
+ROWS = 50_000
+REPEAT = 3
+
+
+class JSONBackendBenchmark(SimpleTestCase):
+    """Rendering and parsing a 50k-todo list payload: DRF versus orjson."""
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        now = timezone.now()
+        cls.payload = {
+            "next": None,
+            "previous": None,
+            "results": [
+                {
+                    "id": i,
+                    "timestamp": now,
+                    "title": f"Todo {i}",
+                    "description": "A todo item in a large list payload.",
+                    "due_date": now if i % 2 else None,
+                    "tags": [{"id": k, "name": f"tag{k}"} for k in range(i % 3)],
+                    "status": "OPEN",
+                }
+                for i in range(ROWS)
+            ],
+        }
+
+    def setUp(self):
+        if orjson is None:
+            self.skipTest("orjson is not installed.")
+
+    def timed(self, function):
+        best = None
+        for _ in range(REPEAT):
+            start = time.perf_counter()
+            result = function()
+            elapsed = time.perf_counter() - start
+            best = elapsed if best is None else min(best, elapsed)
+        return best, result
+
+    def test_render_and_parse(self):
+        drf_render, expected = self.timed(lambda: JSONRenderer().render(self.payload))
+        fast_render, content = self.timed(
+            lambda: FastJSONRenderer().render(self.payload)
+        )
+        self.assertEqual(content, expected)
+        drf_parse, parsed = self.timed(lambda: JSONParser().parse(io.BytesIO(content)))
+        fast_parse, fast_parsed = self.timed(
+            lambda: FastJSONParser().parse(io.BytesIO(content))
+        )
+        self.assertEqual(fast_parsed, parsed)
+        print(
+            f"\n{ROWS} todos, {len(content) / 1e6:.1f} MB:"
+            f"\n  render: JSONRenderer {drf_render * 1000:.0f} ms, "
+            f"FastJSONRenderer {fast_render * 1000:.0f} ms "
+            f"({drf_render / fast_render:.1f}x)"
+            f"\n  parse: JSONParser {drf_parse * 1000:.0f} ms, "
+            f"FastJSONParser {fast_parse * 1000:.0f} ms "
+            f"({drf_parse / fast_parse:.1f}x)"
+        )
+        self.assertLess(fast_render * 3, drf_render)
+        # Parsing is reported, not asserted: building the Python objects
+        # dominates either way, so the two parsers run neck and neck.
@@ -0,0 +1,75 @@
+from django.db import connection
+from django.db.models import Q
+from django.test import TestCase
+from django.utils import timezone
+from todo_app.models import TodoItem
+from todo_app.search import search_todos
+import random
+import time
+
+ROWS = 1_000_000
+WORDS = [f"word{i}" for i in range(5000)]
+REPEAT = 5
+
+
+class FullTextSearchBenchmark(TestCase):
+    """Ranked FTS5 search versus ``icontains`` at one million rows."""
+
+    @classmethod
+    def setUpTestData(cls):
+        if connection.vendor != "sqlite":
+            return
+        rng = random.Random(0)
+        now = timezone.now()
+        rows = (
+            (
+                now,
+                now,
+                f"Todo {i} {rng.choice(WORDS)}",
+                " ".join(rng.choices(WORDS, k=12)),
+                "OPEN",
+                "[]",
+            )
+            for i in range(ROWS)
+        )
+        with connection.cursor() as cursor:
+            cursor.executemany(
+                "INSERT INTO todo_app_todoitem"
+                " (timestamp, updated_at, title, description, status, tag_list)"
+                " VALUES (%s, %s, %s, %s, %s, %s)",
+                rows,
+            )
+
+    def setUp(self):
+        if connection.vendor != "sqlite":
+            self.skipTest("Full-text search uses SQLite FTS5.")
+
+    def timed(self, queryset):
+        start = time.perf_counter()
+        for _ in range(REPEAT):
+            rows = list(queryset[:50])
+        return (time.perf_counter() - start) / REPEAT, rows
+
+    def test_search_latency(self):
+        term = "word4242"
+        fts, ranked = self.timed(search_todos(TodoItem.objects.all(), term))
+        scan, matched = self.timed(
+            TodoItem.objects.filter(
+                Q(title__icontains=term) | Q(description__icontains=term)
+            ).order_by("id")
+        )
+        self.assertTrue(ranked)
+        self.assertLessEqual(
+            {todo.id for todo in ranked},
+            {
+                todo.id
+                for todo in TodoItem.objects.filter(
+                    Q(title__icontains=term) | Q(description__icontains=term)
+                )
+            },
+        )
+        print(
+            f"\nFTS5 ranked search: {fts * 1000:.1f} ms, "
+            f"icontains scan: {scan * 1000:.1f} ms ({ROWS} rows)"
+        )
+        self.assertLess(fts, scan)
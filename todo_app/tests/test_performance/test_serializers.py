@@ -0,0 +1,60 @@
+from django.test import TestCase
+from todo_app.models import Tag, TodoItem
+from todo_app.serializers import TodoItemReadSerializer, TodoItemSerializer
+import time
+
+ROWS = 10_000
+TAGS = 50
+REPEAT = 3
+
+
+class ReadSerializerBenchmark(TestCase):
+    """``TodoItemSerializer`` versus ``TodoItemReadSerializer`` at 10k rows."""
+
+    @classmethod
+    def setUpTestData(cls):
+        tags = Tag.objects.bulk_create(Tag(name=f"tag{i}") for i in range(TAGS))
+        todos = TodoItem.objects.bulk_create(
+            TodoItem(title=f"Todo {i}", description="Benchmark.") for i in range(ROWS)
+        )
+        Through = TodoItem.tags.through
+        Through.objects.bulk_create(
+            Through(todoitem_id=todo.pk, tag_id=tags[(i + k) % TAGS].pk)
+            for i, todo in enumerate(todos)
+            for k in range(i % 3)
+        )
+        TodoItem.objects.refresh_tag_lists()
+
+    def timed(self, serialize):
+        best = None
+        for _ in range(REPEAT):
+            start = time.perf_counter()
+            data = serialize()
+            elapsed = time.perf_counter() - start
+            best = elapsed if best is None else min(best, elapsed)
+        return best, data
+
+    def test_serialization(self):
+        queryset = TodoItem.objects.order_by("id")
+        drf, expected = self.timed(
+            lambda: TodoItemSerializer(
+                list(queryset.prefetch_related("tags")), many=True
+            ).data
+        )
+        fast, data = self.timed(
+            lambda: TodoItemReadSerializer(
+                list(TodoItemReadSerializer.select(queryset)), many=True
+            ).data
+        )
+        self.assertEqual(data, expected)
+        print(
+            f"\nSerializing {ROWS} todos with tags, queries included: "
+            f"TodoItemSerializer {drf * 1000:.0f} ms, "
+            f"TodoItemReadSerializer {fast * 1000:.0f} ms ({drf / fast:.1f}x)"
+        )
+        # Tags come from the denormalized tag_list rather than a prefetch.
+        with self.assertNumQueries(1):
+            list(TodoItemReadSerializer.select(queryset))
+        # Alone it is several times faster, but under a full performance run
+        # it has measured as low as 2.5x, so the bar leaves room for noise.
+        self.assertLess(fast * 2, drf)
@@ -0,0 +1,65 @@
+from django.db import connection
+from django.test import TestCase
+from django.utils import timezone
+from todo_app.models import Tag, TodoItem
+from todo_app.stats import recount, stored_counts
+import random
+import time
+
+ROWS = 1_000_000
+TAGS = 50
+REPEAT = 5
+
+
+class TodoStatsBenchmark(TestCase):
+    """Stats from the trigger-kept counters versus a ``GROUP BY`` recount at
+    one million todos, and what the triggers add to a bulk insert."""
+
+    @classmethod
+    def setUpTestData(cls):
+        if connection.vendor != "sqlite":
+            return
+        rng = random.Random(0)
+        statuses = [status for status, _ in TodoItem.STATUS_CHOICES]
+        Tag.objects.bulk_create(Tag(name=f"tag{i}") for i in range(TAGS))
+        tag_ids = list(Tag.objects.values_list("pk", flat=True))
+        now = timezone.now()
+        rows = (
+            (now, now, f"Todo {i}", "Stats.", rng.choice(statuses), "[]")
+            for i in range(ROWS)
+        )
+        start = time.perf_counter()
+        with connection.cursor() as cursor:
+            cursor.executemany(
+                "INSERT INTO todo_app_todoitem"
+                " (timestamp, updated_at, title, description, status, tag_list)"
+                " VALUES (%s, %s, %s, %s, %s, %s)",
+                rows,
+            )
+            cursor.executemany(
+                "INSERT INTO todo_app_todoitem_tags (todoitem_id, tag_id)"
+                " VALUES (%s, %s)",
+                ((todo_id, rng.choice(tag_ids)) for todo_id in range(1, ROWS + 1)),
+            )
+        cls.insert_seconds = time.perf_counter() - start
+
+    def setUp(self):
+        if connection.vendor != "sqlite":
+            self.skipTest("The counters are kept by SQLite triggers.")
+
+    def timed(self, function):
+        start = time.perf_counter()
+        for _ in range(REPEAT):
+            result = function()
+        return (time.perf_counter() - start) / REPEAT, result
+
+    def test_stats_latency(self):
+        counters, stored = self.timed(stored_counts)
+        group_by, counted = self.timed(recount)
+        self.assertEqual(stored, counted)
+        print(
+            f"\nTodo stats: counters {counters * 1000:.2f} ms, GROUP BY recount "
+            f"{group_by * 1000:.1f} ms ({ROWS} todos; seeding with triggers "
+            f"took {self.insert_seconds:.1f}s)"
+        )
+        self.assertLess(counters * 100, group_by)
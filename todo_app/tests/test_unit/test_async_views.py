@@ -0,0 +1,177 @@
+from asgiref.sync import sync_to_async
+from django.contrib.auth.models import User
+from django.test import AsyncClient, TestCase
+from django.urls import reverse
+from django.utils import timezone
+from todo_app.authentication import credential_cache
+from todo_app.models import Tag, TodoItem
+from rest_framework.test import APIClient
+import base64
+import json
+
+
+class AsyncTodoItemViewsTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(username="testuser", password="testpass")
+        cls.tag = Tag.objects.create(name="Work")
+        cls.todos = [
+            TodoItem.objects.create(title=f"Todo {i}", description="Async.")
+            for i in range(3)
+        ]
+        cls.todos[0].tags.add(cls.tag)
+        # Linked in the opposite order to their ids.
+        home, urgent = Tag.objects.create(name="Home"), Tag.objects.create(
+            name="Urgent"
+        )
+        cls.todos[1].tags.add(urgent)
+        cls.todos[1].tags.add(home)
+
+    def setUp(self):
+        credential_cache.clear()
+        credentials = base64.b64encode(b"testuser:testpass").decode()
+        self.headers = {"Authorization": f"Basic {credentials}"}
+        self.list_url = reverse("async-todo-list-create")
+
+    def call(self, method, *args, **kwargs):
+        """Send an authenticated request with the async test client."""
+        return getattr(self.async_client, method)(*args, headers=self.headers, **kwargs)
+
+    def detail_url(self, pk):
+        return reverse("async-todo-detail", args=[pk])
+
+    async def test_list_matches_sync_endpoint(self):
+        response = await self.call("get", self.list_url, {"page_size": 2})
+        self.assertEqual(response.status_code, 200)
+
+        sync_client = APIClient()
+        await sync_to_async(sync_client.force_authenticate)(self.user)
+        expected = await sync_to_async(sync_client.get)(
+            reverse("todo-list-create"), {"page_size": 2}
+        )
+        self.assertEqual(response.json()["results"], expected.json()["results"])
+        self.assertIn("/api/async/todos/?cursor=", response.json()["next"])
+
+        detail = await self.call("get", self.detail_url(self.todos[1].id))
+        expected = await sync_to_async(sync_client.get)(
+            reverse("todo-detail", args=[self.todos[1].id])
+        )
+        self.assertEqual(detail.content, expected.content)
+
+        following = await self.call("get", response.json()["next"])
+        self.assertEqual(
+            [todo["title"] for todo in following.json()["results"]], ["Todo 2"]
+        )
+
+    async def test_list_filters_and_validation(self):
+        response = await self.call("get", self.list_url, {"tag": "Work"})
+        self.assertEqual(
+            [todo["id"] for todo in response.json()["results"]], [self.todos[0].id]
+        )
+        response = await self.call("get", self.list_url, {"status": "DONE"})
+        self.assertEqual(response.status_code, 400)
+        self.assertIn("status", response.json())
+
+    async def test_create(self):
+        response = await self.call(
+            "post",
+            self.list_url,
+            {
+                "title": "New",
+                "description": "Async create.",
+                "tags": [{"name": "Work"}],
+            },
+            content_type="application/json",
+        )
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(response.json()["tags"], [{"id": self.tag.id, "name": "Work"}])
+        self.assertTrue(await TodoItem.objects.filter(title="New").aexists())
+
+        past = (timezone.now() - timezone.timedelta(days=1)).isoformat()
+        response = await self.call(
+            "post",
+            self.list_url,
+            {"title": "Late", "description": "Past.", "due_date": past},
+            content_type="application/json",
+        )
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(
+            response.json(), {"due_date": ["Due date cannot be in the past."]}
+        )
+
+    async def test_malformed_json(self):
+        response = await self.call(
+            "post", self.list_url, "{broken", content_type="application/json"
+        )
+        self.assertEqual(response.status_code, 400)
+
+    async def test_retrieve_update_delete(self):
+        todo = self.todos[0]
+        response = await self.call("get", self.detail_url(todo.id))
+        self.assertEqual(response.json()["tags"], [{"id": self.tag.id, "name": "Work"}])
+
+        response = await self.call(
+            "patch",
+            self.detail_url(todo.id),
+            {"status": "WORKING", "tags": [{"name": "Home"}]},
+            content_type="application/json",
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()["status"], "WORKING")
+        self.assertEqual([tag["name"] for tag in response.json()["tags"]], ["Home"])
+
+        response = await self.call(
+            "put",
+            self.detail_url(todo.id),
+            {"title": "Replaced", "description": "Put."},
+            content_type="application/json",
+        )
+        self.assertEqual(response.json()["title"], "Replaced")
+
+        response = await self.call("delete", self.detail_url(todo.id))
+        self.assertEqual(response.status_code, 204)
+        response = await self.call("get", self.detail_url(todo.id))
+        self.assertEqual(response.status_code, 404)
+        response = await self.call("delete", self.detail_url(todo.id))
+        self.assertEqual(response.status_code, 404)
+
+    async def test_writes_need_no_csrf_token(self):
+        client = AsyncClient(enforce_csrf_checks=True)
+        response = await client.post(
+            self.list_url,
+            {"title": "No token", "description": "Basic auth."},
+            content_type="application/json",
+            headers=self.headers,
+        )
+        self.assertEqual(response.status_code, 201)
+        url = self.detail_url(response.json()["id"])
+        response = await client.patch(
+            url,
+            {"status": "WORKING"},
+            content_type="application/json",
+            headers=self.headers,
+        )
+        self.assertEqual(response.status_code, 200)
+        response = await client.delete(url, headers=self.headers)
+        self.assertEqual(response.status_code, 204)
+
+    async def test_authentication(self):
+        response = await self.async_client.get(self.list_url)
+        self.assertEqual(response.status_code, 401)
+        self.assertEqual(response["WWW-Authenticate"], 'Basic realm="api"')
+
+        wrong = base64.b64encode(b"testuser:wrong").decode()
+        response = await self.async_client.get(
+            self.list_url, headers={"Authorization": f"Basic {wrong}"}
+        )
+        self.assertEqual(response.status_code, 401)
+
+        await self.call("get", self.list_url)
+        self.assertEqual(len(credential_cache), 1)
+
+    async def test_method_not_allowed(self):
+        response = await self.call("delete", self.list_url)
+        self.assertEqual(response.status_code, 405)
+        self.assertEqual(
+            json.loads(response.content)["detail"], 'Method "DELETE" not allowed.'
+        )
@@ -0,0 +1,95 @@
+from unittest import mock
+from django.test import TestCase, RequestFactory
+from django.contrib.auth.models import User
+from rest_framework import exceptions
+from todo_app.authentication import CachedBasicAuthentication, CredentialCache
+import base64
+
+
+def basic_request(username, password):
+    credentials = base64.b64encode(f"{username}:{password}".encode()).decode()
+    return RequestFactory().get("/", HTTP_AUTHORIZATION=f"Basic {credentials}")
+
+
+class CredentialCacheTest(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username="testuser", password="testpass")
+
+    def test_key_is_not_plaintext(self):
+        cache = CredentialCache()
+        key = cache.make_key("testuser", "testpass")
+        self.assertNotIn(b"testpass", key)
+        self.assertEqual(key, cache.make_key("testuser", "testpass"))
+        self.assertNotEqual(key, CredentialCache().make_key("testuser", "testpass"))
+
+    def test_entries_expire_after_ttl(self):
+        cache = CredentialCache(ttl=10)
+        key = cache.make_key("testuser", "testpass")
+        with mock.patch("todo_app.authentication.time.monotonic", return_value=100):
+            cache.set(key, self.user)
+        with mock.patch("todo_app.authentication.time.monotonic", return_value=109):
+            self.assertIsNotNone(cache.get(key))
+        with mock.patch("todo_app.authentication.time.monotonic", return_value=110):
+            self.assertIsNone(cache.get(key))
+        self.assertEqual(len(cache), 0)
+
+    def test_least_recently_used_entry_is_evicted(self):
+        cache = CredentialCache(max_entries=2)
+        first, second, third = (cache.make_key("u", str(i)) for i in range(3))
+        cache.set(first, self.user)
+        cache.set(second, self.user)
+        cache.get(first)
+        cache.set(third, self.user)
+        self.assertIsNotNone(cache.get(first))
+        self.assertIsNone(cache.get(second))
+        self.assertIsNotNone(cache.get(third))
+
+
+class CachedBasicAuthenticationTest(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username="testuser", password="testpass")
+        self.auth = CachedBasicAuthentication()
+        self.auth.credential_cache = CredentialCache()
+
+    def authenticate(self, username="testuser", password="testpass"):
+        with mock.patch.object(
+            User, "check_password", autospec=True, side_effect=User.check_password
+        ) as check_password:
+            result = self.auth.authenticate(basic_request(username, password))
+        return result, check_password.call_count
+
+    def test_repeat_caller_skips_password_hash(self):
+        (user, _), first_checks = self.authenticate()
+        (cached_user, _), second_checks = self.authenticate()
+        self.assertEqual(first_checks, 1)
+        self.assertEqual(second_checks, 0)
+        self.assertEqual(cached_user.pk, user.pk)
+
+    def test_failed_verification_is_not_cached(self):
+        for _ in range(2):
+            with self.assertRaises(exceptions.AuthenticationFailed):
+                self.auth.authenticate(basic_request("testuser", "wrong"))
+        self.assertEqual(len(self.auth.credential_cache), 0)
+
+    def test_password_change_invalidates_entry(self):
+        self.authenticate()
+        self.user.set_password("newpass")
+        self.user.save()
+        with self.assertRaises(exceptions.AuthenticationFailed):
+            self.auth.authenticate(basic_request("testuser", "testpass"))
+        (user, _), checks = self.authenticate(password="newpass")
+        self.assertEqual(user.pk, self.user.pk)
+        self.assertEqual(checks, 1)
+
+    def test_deactivation_invalidates_entry(self):
+        self.authenticate()
+        self.user.is_active = False
+        self.user.save()
+        with self.assertRaises(exceptions.AuthenticationFailed):
+            self.auth.authenticate(basic_request("testuser", "testpass"))
+
+    def test_deleted_user_is_rejected(self):
+        self.authenticate()
+        self.user.delete()
+        with self.assertRaises(exceptions.AuthenticationFailed):
+            self.auth.authenticate(basic_request("testuser", "testpass"))
@@ -0,0 +1,55 @@
+from collections import Counter
+from django.test import SimpleTestCase, TestCase
+from todo_app.benchmark import OPERATIONS, Dataset, compare, percentile, run_benchmark
+from todo_app.models import TodoItem
+import json
+
+
+class DatasetTest(SimpleTestCase):
+    def test_draws_are_reproducible(self):
+        first, second = Dataset(seed=1), Dataset(seed=1)
+        self.assertEqual(
+            [first.tags() for _ in range(50)], [second.tags() for _ in range(50)]
+        )
+
+    def test_tag_popularity_is_skewed(self):
+        dataset = Dataset(tags=100)
+        counts = Counter(name for _ in range(5000) for name in dataset.tags())
+        ranked = [counts[name] for name in dataset.tag_names]
+        self.assertGreater(ranked[0], 10 * ranked[-1])
+        self.assertTrue(all(len(dataset.tags()) <= 3 for _ in range(200)))
+
+
+class PercentileTest(SimpleTestCase):
+    def test_nearest_rank(self):
+        values = list(range(1, 101))
+        self.assertEqual(percentile(values, 50), 50)
+        self.assertEqual(percentile(values, 95), 95)
+        self.assertEqual(percentile(values, 99), 99)
+        self.assertEqual(percentile([7], 99), 7)
+
+
+class RunBenchmarkTest(TestCase):
+    def test_report(self):
+        report = run_benchmark([20, 40], requests=5, tags=10)
+        json.dumps(report)
+        self.assertEqual([dataset["size"] for dataset in report["datasets"]], [20, 40])
+        self.assertEqual(TodoItem.objects.count(), 40)
+        for dataset in report["datasets"]:
+            self.assertEqual(list(dataset["operations"]), OPERATIONS)
+            for stats in dataset["operations"].values():
+                self.assertEqual(stats["requests"], 5)
+                self.assertLessEqual(stats["p50_ms"], stats["p95_ms"])
+                self.assertLessEqual(stats["p95_ms"], stats["p99_ms"])
+                self.assertGreater(stats["queries_mean"], 0)
+
+    def test_compare(self):
+        def report(p95, rps):
+            stats = {"p95_ms": p95, "throughput_rps": rps}
+            return {"datasets": [{"size": 10, "operations": {"list": stats}}]}
+
+        changes = {
+            metric: round(change, 2)
+            for _, _, metric, _, _, change in compare(report(2.0, 100), report(3.0, 50))
+        }
+        self.assertEqual(changes, {"p95_ms": 0.5, "throughput_rps": 0.5})
@@ -0,0 +1,147 @@
+from django.core.cache import caches
+from django.core.management import call_command
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APIClient
+from todo_app.cache import list_cache
+from todo_app.models import TodoItem, Tag
+from django.contrib.auth.models import User
+from unittest import mock
+from io import StringIO
+
+
+class ListResponseCacheTest(TestCase):
+    def setUp(self):
+        caches["todo_list"].clear()
+        self.client = APIClient()
+        self.user = User.objects.create_user(username="testuser", password="testpass")
+        self.client.force_authenticate(self.user)
+        self.url = reverse("todo-list-create")
+        self.tag = Tag.objects.create(name="Work")
+        self.todo = TodoItem.objects.create(title="Cached", description="Cache.")
+        self.todo.tags.add(self.tag)
+
+    def get(self, **params):
+        response = self.client.get(self.url, params)
+        self.assertEqual(response.status_code, 200)
+        return response
+
+    def assertInvalidatedBy(self, write):
+        self.get()
+        self.assertEqual(self.get()["X-Cache"], "HIT")
+        # Pin the ETag so only the generation token can cause the miss.
+        with mock.patch("todo_app.views.list_validators", return_value=('"x"', None)):
+            self.get()
+            self.assertEqual(self.get()["X-Cache"], "HIT")
+            with self.captureOnCommitCallbacks(execute=True):
+                write()
+            self.assertEqual(self.get()["X-Cache"], "MISS")
+
+    def test_repeat_reads_are_served_from_cache(self):
+        stats = list_cache.stats()
+        first = self.get()
+        self.assertEqual(first["X-Cache"], "MISS")
+        with self.assertNumQueries(1):
+            second = self.get()
+        self.assertEqual(second["X-Cache"], "HIT")
+        self.assertEqual(second.content, first.content)
+        self.assertEqual(second["ETag"], first["ETag"])
+        self.assertEqual(second["Content-Type"], first["Content-Type"])
+        self.assertEqual(
+            list_cache.stats(),
+            {"hits": stats["hits"] + 1, "misses": stats["misses"] + 1},
+        )
+
+    def test_hits_carry_the_headers_of_the_miss(self):
+        first = self.get()
+        second = self.get()
+        self.assertEqual(second["X-Cache"], "HIT")
+        per_request = {"X-Cache", "Server-Timing"}
+        self.assertEqual(
+            {name: value for name, value in second.items() if name not in per_request},
+            {name: value for name, value in first.items() if name not in per_request},
+        )
+        for header in ("Vary", "Allow", "ETag", "Content-Type"):
+            self.assertIn(header, second)
+
+    def test_scheme_and_host_are_part_of_the_key(self):
+        TodoItem.objects.create(title="Second", description="Cache.")
+        with self.settings(ALLOWED_HOSTS=["testserver", "api.example.com"]):
+            internal = self.get(page_size=1)
+            public = self.client.get(
+                self.url,
+                {"page_size": 1},
+                HTTP_HOST="api.example.com",
+                secure=True,
+            )
+        self.assertEqual(public["X-Cache"], "MISS")
+        self.assertTrue(internal.json()["next"].startswith("http://testserver/"))
+        self.assertTrue(public.json()["next"].startswith("https://api.example.com/"))
+
+    def test_query_parameters_are_part_of_the_key(self):
+        self.get()
+        self.assertEqual(self.get(status="OPEN")["X-Cache"], "MISS")
+        self.assertEqual(self.get(status="OPEN")["X-Cache"], "HIT")
+
+    def test_browsable_api_is_not_cached(self):
+        self.client.get(self.url, HTTP_ACCEPT="text/html")
+        response = self.client.get(self.url, HTTP_ACCEPT="text/html")
+        self.assertNotIn("X-Cache", response)
+
+    def test_disabled_cache(self):
+        with self.settings(TODO_LIST_CACHE_ALIAS=None):
+            self.get()
+            self.assertNotIn("X-Cache", self.get())
+
+    def test_serializer_writes_invalidate(self):
+        payload = {"title": "New", "description": "Via API."}
+        self.assertInvalidatedBy(lambda: self.client.post(self.url, payload))
+        detail_url = reverse("todo-detail", args=[self.todo.id])
+        self.assertInvalidatedBy(
+            lambda: self.client.patch(detail_url, {"title": "Renamed"})
+        )
+        self.assertInvalidatedBy(lambda: self.client.delete(detail_url))
+
+    def test_bulk_writes_invalidate(self):
+        self.assertInvalidatedBy(
+            lambda: self.client.post(
+                reverse("todo-bulk-create"),
+                [{"title": "Bulk", "description": "Bulk."}],
+                format="json",
+            )
+        )
+        self.assertInvalidatedBy(
+            lambda: self.client.post(
+                reverse("todo-bulk-status"),
+                {"ids": [self.todo.id], "status": "WORKING"},
+                format="json",
+            )
+        )
+        TodoItem.objects.filter(pk=self.todo.pk).update(
+            due_date=timezone.now() - timezone.timedelta(days=1)
+        )
+        self.assertInvalidatedBy(
+            lambda: call_command("mark_overdue", stdout=StringIO())
+        )
+
+    def test_tag_changes_invalidate(self):
+        other = Tag.objects.create(name="Home")
+        self.assertInvalidatedBy(lambda: self.todo.tags.add(other))
+        self.assertInvalidatedBy(lambda: other.todoitem_set.clear())
+        self.tag.name = "Office"
+        self.assertInvalidatedBy(self.tag.save)
+        self.assertInvalidatedBy(self.tag.delete)
+
+    def test_admin_edits_invalidate(self):
+        admin = User.objects.create_superuser(username="admin", password="adminpass")
+        self.client.force_login(admin)
+        change_url = reverse("admin:todo_app_todoitem_change", args=[self.todo.id])
+        data = {
+            "title": "Edited in admin",
+            "description": "Cache.",
+            "status": "OPEN",
+            "tags": [self.tag.id],
+        }
+        self.assertInvalidatedBy(lambda: self.client.post(change_url, data))
+        self.assertEqual(TodoItem.objects.get().title, "Edited in admin")
@@ -0,0 +1,333 @@
+from django.core.management import CommandError, call_command
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from todo_app.models import Tag, TodoItem, TodoItemTombstone
+from todo_app.services import mark_overdue, repair_tag_lists
+from io import StringIO
+import csv
+import json
+import os
+import tempfile
+from unittest import mock
+
+
+class MarkOverdueTest(TestCase):
+    def setUp(self):
+        self.now = timezone.now()
+        past = self.now - timezone.timedelta(days=1)
+        future = self.now + timezone.timedelta(days=1)
+        # bulk_create skips TodoItem.clean(), which rejects past due dates.
+        self.todos = TodoItem.objects.bulk_create(
+            TodoItem(title=title, description="Sweep.", status=status, due_date=due)
+            for title, status, due in [
+                ("late open", "OPEN", past),
+                ("late working", "WORKING", past),
+                ("late review", "PENDING REVIEW", past),
+                ("late done", "COMPLETED", past),
+                ("late cancelled", "CANCELLED", past),
+                ("on time", "OPEN", future),
+                ("no due date", "OPEN", None),
+            ]
+        )
+
+    def statuses(self):
+        return dict(TodoItem.objects.values_list("title", "status"))
+
+    def test_marks_only_active_items_past_due(self):
+        sweep = mark_overdue(now=self.now)
+        self.assertEqual(sweep.updated, 3)
+        statuses = self.statuses()
+        for title in ("late open", "late working", "late review"):
+            self.assertEqual(statuses[title], "OVERDUE")
+        self.assertEqual(statuses["late done"], "COMPLETED")
+        self.assertEqual(statuses["late cancelled"], "CANCELLED")
+        self.assertEqual(statuses["on time"], "OPEN")
+        self.assertEqual(statuses["no due date"], "OPEN")
+        self.assertEqual(mark_overdue(now=self.now).updated, 0)
+
+    def test_batches_are_single_updates(self):
+        with CaptureQueriesContext(connection) as queries:
+            sweep = mark_overdue(now=self.now, batch_size=2)
+        self.assertEqual((sweep.updated, sweep.batches), (3, 2))
+        statements = [q["sql"] for q in queries if "todo_app_todoitem" in q["sql"]]
+        self.assertEqual(len(statements), 2)
+        self.assertTrue(all(sql.startswith("UPDATE") for sql in statements))
+
+    def test_update_uses_status_due_index(self):
+        if connection.vendor != "sqlite":
+            self.skipTest("Query plans are checked on SQLite.")
+        with CaptureQueriesContext(connection) as queries:
+            mark_overdue(now=self.now)
+        with connection.cursor() as cursor:
+            update = next(q["sql"] for q in queries if q["sql"].startswith("UPDATE"))
+            cursor.execute(f"EXPLAIN QUERY PLAN {update}")
+            plan = " ".join(row[-1] for row in cursor.fetchall())
+        self.assertIn("todo_status_due_idx (status=? AND due_date<?)", plan)
+
+    def test_command_reports_rows_and_time(self):
+        out = StringIO()
+        call_command("mark_overdue", "--batch-size", "2", stdout=out)
+        self.assertRegex(
+            out.getvalue(), r"Marked 3 todo items overdue in 2 batches \(\d+\.\d+s\)"
+        )
+
+    def test_command_rejects_non_positive_batch_size(self):
+        for size in ("0", "-1"):
+            with self.assertRaisesMessage(CommandError, "positive integer"):
+                call_command("mark_overdue", "--batch-size", size, stdout=StringIO())
+        self.assertFalse(TodoItem.objects.filter(status="OVERDUE").exists())
+
+
+class RepairTagListsTest(TestCase):
+    def setUp(self):
+        self.work = Tag.objects.create(name="Work")
+        self.todos = [
+            TodoItem.objects.create(title=f"todo {n}", description="Drift.")
+            for n in range(5)
+        ]
+        for todo in self.todos:
+            todo.tags.add(self.work)
+        # Writes that bypass the m2m and Tag signals.
+        Tag.objects.filter(pk=self.work.pk).update(name="Office")
+        TodoItem.objects.filter(pk=self.todos[0].pk).update(tag_list=[])
+
+    def stored(self):
+        return list(TodoItem.objects.order_by("pk").values_list("tag_list", flat=True))
+
+    def test_repairs_drifted_rows(self):
+        repair = repair_tag_lists(batch_size=2)
+        self.assertEqual(repair.checked, 5)
+        self.assertEqual(repair.drifted, 5)
+        self.assertEqual(repair.batches, 3)
+        expected = [{"id": self.work.id, "name": "Office"}]
+        self.assertEqual(self.stored(), [expected] * 5)
+        self.assertEqual(repair_tag_lists().drifted, 0)
+
+    def test_dry_run_changes_nothing(self):
+        before = self.stored()
+        self.assertEqual(repair_tag_lists(dry_run=True).drifted, 5)
+        self.assertEqual(self.stored(), before)
+
+    def test_command_reports_rows_and_time(self):
+        out = StringIO()
+        call_command("repair_tag_lists", "--batch-size", "5", "--dry-run", stdout=out)
+        self.assertRegex(
+            out.getvalue(),
+            r"Checked 5 todo items in 1 batches; found 5 with a stale tag list "
+            r"\(\d+\.\d+s\)",
+        )
+
+    def test_command_rejects_non_positive_batch_size(self):
+        before = self.stored()
+        for size in ("0", "-1"):
+            with self.assertRaisesMessage(CommandError, "positive integer"):
+                call_command(
+                    "repair_tag_lists", "--batch-size", size, stdout=StringIO()
+                )
+        self.assertEqual(self.stored(), before)
+
+
+class PruneTombstonesTest(TestCase):
+    def test_prunes_tombstones_past_retention(self):
+        now = timezone.now()
+        TodoItemTombstone.objects.bulk_create(
+            TodoItemTombstone(todo_id=i, deleted_at=now - timezone.timedelta(days=days))
+            for i, days in enumerate([45, 31, 29, 1])
+        )
+        out = StringIO()
+        call_command("prune_tombstones", stdout=out)
+        self.assertRegex(
+            out.getvalue(), r"Pruned 2 tombstones older than 30 days \(\d+\.\d+s\)"
+        )
+        self.assertEqual(
+            sorted(TodoItemTombstone.objects.values_list("todo_id", flat=True)), [2, 3]
+        )
+
+    def test_no_retention_keeps_everything(self):
+        TodoItemTombstone.objects.create(
+            todo_id=1, deleted_at=timezone.now() - timezone.timedelta(days=400)
+        )
+        with self.settings(TODO_TOMBSTONE_RETENTION_DAYS=None):
+            call_command("prune_tombstones", stdout=StringIO())
+        self.assertEqual(TodoItemTombstone.objects.count(), 1)
+
+
+class ExportTodosTest(TestCase):
+    def setUp(self):
+        self.tag = Tag.objects.create(name="Work")
+        self.todos = [
+            TodoItem.objects.create(title=f"Todo {i}", description="Export.")
+            for i in range(3)
+        ]
+        self.todos[1].tags.add(self.tag)
+
+    def test_ndjson_to_stdout(self):
+        out, err = StringIO(), StringIO()
+        call_command("export_todos", "--chunk-size", "2", stdout=out, stderr=err)
+        rows = [json.loads(line) for line in out.getvalue().splitlines()]
+        self.assertEqual([row["id"] for row in rows], [todo.id for todo in self.todos])
+        self.assertEqual(rows[1]["tags"], [{"id": self.tag.id, "name": "Work"}])
+        self.assertIn("Exported 3 todo items.", err.getvalue())
+
+    def test_csv_to_file(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "todos.csv")
+            call_command(
+                "export_todos", "--format", "csv", "--output", path, stderr=StringIO()
+            )
+            with open(path, newline="", encoding="utf-8") as exported:
+                rows = list(csv.DictReader(exported))
+        self.assertEqual([row["title"] for row in rows], ["Todo 0", "Todo 1", "Todo 2"])
+        self.assertEqual(rows[1]["tags"], "Work")
+
+    def test_rejects_non_positive_chunk_size(self):
+        for size in ("0", "-1"):
+            out = StringIO()
+            with self.assertRaisesMessage(CommandError, "positive integer"):
+                call_command(
+                    "export_todos", "--chunk-size", size, stdout=out, stderr=StringIO()
+                )
+            self.assertEqual(out.getvalue(), "")
+
+
+class ImportTodosTest(TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directory.cleanup)
+        self.future = (timezone.now() + timezone.timedelta(days=1)).isoformat()
+        self.past = (timezone.now() - timezone.timedelta(days=1)).isoformat()
+
+    def write(self, name, text):
+        path = os.path.join(self.directory.name, name)
+        with open(path, "w", newline="", encoding="utf-8") as out:
+            out.write(text)
+        return path
+
+    def run_import(self, path, *args):
+        out, err = StringIO(), StringIO()
+        call_command("import_todos", path, *args, stdout=out, stderr=err)
+        return out.getvalue(), err.getvalue()
+
+    def test_ndjson_import_rejects_invalid_rows(self):
+        rows = [
+            {"title": "Valid", "description": "Ok.", "tags": [{"name": "Work"}]},
+            {"title": "Late", "description": "Past.", "due_date": self.past},
+            {
+                "title": "Dupes",
+                "description": "Twice.",
+                "tags": [{"name": "A"}, {"name": "A"}],
+            },
+            {"description": "No title."},
+            {
+                "title": "Due",
+                "description": "Ok.",
+                "due_date": self.future,
+                "status": "WORKING",
+                "tags": [{"name": "Work"}, {"name": "Home"}],
+            },
+        ]
+        text = "\n".join(json.dumps(row) for row in rows) + "\n{broken\n\n"
+        out, err = self.run_import(self.write("todos.ndjson", text))
+
+        self.assertIn("Imported 2 todo items in 1 chunks", out)
+        self.assertIn("rows/s", out)
+        self.assertIn("rejected 4 rows", out)
+        for line in (2, 3, 4, 6):
+            self.assertIn(f"Line {line} rejected", err)
+        self.assertIn("Due date cannot be in the past.", err)
+        self.assertIn("Duplicate tags", err)
+        self.assertIn("Invalid JSON", err)
+        self.assertNotIn("ErrorDetail", err)
+
+        due = TodoItem.objects.get(title="Due")
+        self.assertEqual(due.status, "WORKING")
+        self.assertEqual(
+            sorted(due.tags.values_list("name", flat=True)), ["Home", "Work"]
+        )
+        self.assertEqual(Tag.objects.filter(name="Work").count(), 1)
+        self.assertFalse(TodoItem.objects.filter(title__in=["Late", "Dupes"]).exists())
+
+    def test_rejected_rows_are_readable(self):
+        rows = [
+            {"description": "No title."},
+            {
+                "title": "Blank",
+                "description": "Tag.",
+                "tags": [{"name": "A"}, {"name": ""}],
+            },
+            [1],
+        ]
+        text = "\n".join(json.dumps(row) for row in rows)
+        _, err = self.run_import(self.write("todos.ndjson", text))
+        self.assertEqual(
+            err.splitlines(),
+            [
+                "Line 1 rejected: title: This field is required.",
+                "Line 2 rejected: tags[1].name: This field may not be blank.",
+                "Line 3 rejected: Expected a JSON object.",
+            ],
+        )
+
+    def test_csv_round_trip_with_export(self):
+        Tag.objects.create(name="Work")
+        todo = TodoItem.objects.create(title="Exported", description="Round trip.")
+        todo.tags.add(*Tag.objects.all())
+        TodoItem.objects.create(title="Untagged", description="Round trip.")
+        path = os.path.join(self.directory.name, "todos.csv")
+        call_command(
+            "export_todos", "--format", "csv", "--output", path, stderr=StringIO()
+        )
+        TodoItem.objects.all().delete()
+
+        out, _ = self.run_import(path)
+        self.assertIn("Imported 2 todo items", out)
+        imported = {
+            todo.title: [tag.name for tag in todo.tags.all()]
+            for todo in TodoItem.objects.prefetch_related("tags")
+        }
+        self.assertEqual(imported, {"Exported": ["Work"], "Untagged": []})
+
+    def test_queries_grow_with_chunks_not_rows(self):
+        text = "".join(
+            json.dumps(
+                {
+                    "title": f"Todo {i}",
+                    "description": "Bulk.",
+                    "tags": [{"name": f"t{i % 3}"}],
+                }
+            )
+            + "\n"
+            for i in range(40)
+        )
+        path = self.write("todos.ndjson", text)
+        with CaptureQueriesContext(connection) as queries:
+            out, _ = self.run_import(path, "--chunk-size", "20", "--batch-size", "20")
+        self.assertIn("Imported 40 todo items in 2 chunks", out)
+        self.assertEqual(TodoItem.tags.through.objects.count(), 40)
+        per_chunk = [q for q in queries if "SAVEPOINT" not in q["sql"]]
+        self.assertLessEqual(len(per_chunk), 2 * 6)
+
+    def test_stdin_is_left_open(self):
+        stdin = StringIO(json.dumps({"title": "Piped", "description": "Ok."}) + "\n")
+        with mock.patch("sys.stdin", stdin):
+            out, _ = self.run_import("-")
+        self.assertIn("Imported 1 todo items", out)
+        self.assertFalse(stdin.closed)
+
+    def test_rejects_non_positive_sizes(self):
+        path = self.write(
+            "todos.ndjson", json.dumps({"title": "A", "description": "B."})
+        )
+        for flag in ("--batch-size", "--chunk-size"):
+            for size in ("0", "-1"):
+                with self.assertRaisesMessage(
+                    CommandError, f"{flag} must be a positive"
+                ):
+                    self.run_import(path, flag, size)
+        self.assertFalse(TodoItem.objects.exists())
+
+    def test_missing_file(self):
+        with self.assertRaises(CommandError):
+            self.run_import(os.path.join(self.directory.name, "missing.ndjson"))
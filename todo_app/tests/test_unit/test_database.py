@@ -0,0 +1,100 @@
+from django.conf import settings
+from django.db import OperationalError, connection, connections
+from django.test import SimpleTestCase
+import os
+import tempfile
+import time
+
+
+class SQLiteProfileTest(SimpleTestCase):
+    """The configured pragmas on a file database, and what WAL buys: a
+    reader is not locked out while a bulk write holds the write lock."""
+
+    def setUp(self):
+        if connection.vendor != "sqlite":
+            self.skipTest("The pragma profile is for SQLite.")
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.path = os.path.join(directory.name, "profile.sqlite3")
+
+    def connect(self, profile=True):
+        """A connection to the file database with the project's settings,
+        or with SQLite's defaults when ``profile`` is False."""
+        settings_dict = {
+            **settings.DATABASES["default"],
+            "NAME": self.path,
+            "TIME_ZONE": None,
+            "AUTOCOMMIT": True,
+        }
+        if not profile:
+            settings_dict["OPTIONS"] = {}
+        wrapper = type(connections["default"])(settings_dict, alias="profile")
+        self.addCleanup(wrapper.close)
+        return wrapper
+
+    def pragma(self, wrapper, name):
+        with wrapper.cursor() as cursor:
+            cursor.execute(f"PRAGMA {name}")
+            return cursor.fetchone()[0]
+
+    def test_pragmas_applied(self):
+        wrapper = self.connect()
+        self.assertEqual(self.pragma(wrapper, "journal_mode"), "wal")
+        self.assertEqual(self.pragma(wrapper, "synchronous"), 1)  # NORMAL
+        self.assertEqual(self.pragma(wrapper, "busy_timeout"), 5000)
+        self.assertEqual(self.pragma(wrapper, "cache_size"), -64 * 1024)
+        self.assertEqual(wrapper.transaction_mode, "IMMEDIATE")
+
+    def test_connection_reused_across_requests(self):
+        wrapper = self.connect()
+        opened = []
+        for _ in range(2):
+            # What close_old_connections does on request_started and
+            # request_finished.
+            wrapper.close_if_unusable_or_obsolete()
+            with wrapper.cursor() as cursor:
+                cursor.execute("SELECT 1")
+            opened.append(wrapper.connection)
+            wrapper.close_if_unusable_or_obsolete()
+        self.assertIsNotNone(opened[0])
+        self.assertIs(opened[0], opened[1])
+
+    def read_during_bulk_write(self, profile):
+        """Count rows from one connection while another is half way
+        through a large insert; return the count, or the error raised."""
+        writer, reader = self.connect(profile), self.connect(profile)
+        with writer.cursor() as cursor:
+            cursor.execute("CREATE TABLE item (id INTEGER PRIMARY KEY, body TEXT)")
+            cursor.execute("INSERT INTO item (body) VALUES ('committed')")
+            # A small page cache makes the writer spill to the database file
+            # mid-transaction, which needs the exclusive lock without WAL.
+            cursor.execute("PRAGMA cache_size=10")
+            cursor.execute("BEGIN IMMEDIATE")
+            cursor.executemany(
+                "INSERT INTO item (body) VALUES (%s)",
+                [("x" * 100,) for _ in range(20_000)],
+            )
+        with reader.cursor() as cursor:
+            cursor.execute("PRAGMA busy_timeout=200")
+            start = time.perf_counter()
+            try:
+                cursor.execute("SELECT COUNT(*) FROM item")
+                result = cursor.fetchone()[0]
+            except OperationalError as exc:
+                result = exc
+            waited = time.perf_counter() - start
+        with writer.cursor() as cursor:
+            cursor.execute("COMMIT")
+        return result, waited
+
+    def test_readers_do_not_stall_during_bulk_write(self):
+        result, waited = self.read_during_bulk_write(profile=True)
+        # The reader sees the last committed state, straight away.
+        self.assertEqual(result, 1)
+        self.assertLess(waited, 0.2)
+
+    def test_readers_stall_without_wal(self):
+        result, waited = self.read_during_bulk_write(profile=False)
+        self.assertIsInstance(result, OperationalError)
+        self.assertIn("locked", str(result))
+        self.assertGreaterEqual(waited, 0.2)
@@ -0,0 +1,196 @@
+from django.contrib.auth.models import User
+from django.test import SimpleTestCase, TestCase
+from django.urls import reverse
+from rest_framework.test import APIClient
+from todo_app.authentication import credential_cache
+from todo_app.events import EventHub, hub
+from todo_app.models import Tag, TodoItem
+from todo_app.services import bulk_update_status
+import asyncio
+import base64
+import threading
+
+
+class EventHubTest(SimpleTestCase):
+    def setUp(self):
+        self.hub = EventHub(buffer_size=3)
+
+    def test_resume_from_last_event_id(self):
+        first = self.hub.publish("todo.created", {"id": 1})
+        self.hub.publish("todo.updated", {"id": 1})
+        seq = self.hub.resume_from(first.id)
+        events, complete = self.hub.events_after(seq)
+        self.assertTrue(complete)
+        self.assertEqual([event.type for event in events], ["todo.updated"])
+
+    def test_no_id_starts_from_now(self):
+        self.hub.publish("todo.created", {"id": 1})
+        events, complete = self.hub.events_after(self.hub.resume_from(None))
+        self.assertEqual((events, complete), ([], True))
+
+    def test_ids_from_another_process_are_not_resumed(self):
+        other = EventHub()
+        self.assertIsNone(self.hub.resume_from(other.publish("x", {}).id))
+        self.assertIsNone(self.hub.resume_from("garbage"))
+
+    def test_ids_ahead_of_the_hub_are_not_resumed(self):
+        event = self.hub.publish("todo.created", {"id": 1})
+        self.assertEqual(self.hub.resume_from(event.id), event.seq)
+        self.assertIsNone(self.hub.resume_from(f"{self.hub.epoch}-{event.seq + 1}"))
+
+    def test_stream_resets_for_an_id_ahead_of_the_hub(self):
+        async def run():
+            stream = self.hub.stream(f"{self.hub.epoch}-5", heartbeat=0.01)
+            chunks = [await anext(stream) for _ in range(2)]
+            await stream.aclose()
+            return chunks
+
+        self.assertEqual(asyncio.run(run())[1], "event: reset\ndata: {}\n\n")
+
+    def test_overflowed_buffer_is_reported(self):
+        first = self.hub.publish("todo.created", {"id": 1})
+        for pk in range(2, 6):
+            self.hub.publish("todo.created", {"id": pk})
+        events, complete = self.hub.events_after(first.seq)
+        self.assertFalse(complete)
+        self.assertEqual([event.data["id"] for event in events], [3, 4, 5])
+
+    def test_publish_from_another_thread_wakes_every_waiter(self):
+        async def run():
+            seq = self.hub.last_seq
+            waiters = [
+                asyncio.create_task(self.hub.wait(seq, timeout=5)) for _ in range(100)
+            ]
+            await asyncio.sleep(0)
+            thread = threading.Thread(target=self.hub.publish, args=("x", {}))
+            thread.start()
+            await asyncio.wait_for(asyncio.gather(*waiters), timeout=1)
+            thread.join()
+
+        asyncio.run(run())
+
+    def test_wait_times_out(self):
+        async def run():
+            await self.hub.wait(self.hub.last_seq, timeout=0.01)
+            # A timed out waiter must not cancel the future others share.
+            seq = self.hub.last_seq
+            waiter = asyncio.create_task(self.hub.wait(seq, timeout=5))
+            await asyncio.sleep(0)
+            self.hub.publish("x", {})
+            await asyncio.wait_for(waiter, timeout=1)
+
+        asyncio.run(run())
+
+    def test_stream_resets_and_heartbeats(self):
+        async def run():
+            stream = self.hub.stream("unknown-1", heartbeat=0.01)
+            chunks = [await anext(stream) for _ in range(3)]
+            await stream.aclose()
+            return chunks
+
+        retry, reset, heartbeat = asyncio.run(run())
+        self.assertEqual(retry, "retry: 10\n\n")
+        self.assertEqual(reset, "event: reset\ndata: {}\n\n")
+        self.assertEqual(heartbeat, ": heartbeat\n\n")
+
+
+class ChangeEventsTest(TestCase):
+    def events(self, action):
+        seq = hub.last_seq
+        with self.captureOnCommitCallbacks(execute=True):
+            action()
+        events, _ = hub.events_after(seq)
+        return [(event.type, event.data) for event in events]
+
+    def test_todo_writes(self):
+        events = self.events(
+            lambda: TodoItem.objects.create(title="New", description="Event.")
+        )
+        todo = TodoItem.objects.get()
+        self.assertEqual(events, [("todo.created", {"id": todo.id})])
+
+        tag = Tag.objects.create(name="Work")
+        events = self.events(lambda: todo.tags.add(tag))
+        self.assertEqual(events, [("todo.updated", {"id": todo.id})])
+
+        events = self.events(lambda: TodoItem.objects.filter(pk=todo.pk).delete())
+        self.assertEqual(events[-1], ("todo.deleted", {"id": todo.id}))
+
+    def test_nothing_is_sent_for_rolled_back_writes(self):
+        seq = hub.last_seq
+        with self.captureOnCommitCallbacks(execute=False):
+            TodoItem.objects.create(title="New", description="Event.")
+        self.assertEqual(hub.events_after(seq)[0], [])
+
+    def test_bulk_and_tag_changes(self):
+        todos = TodoItem.objects.bulk_create(
+            TodoItem(title=f"Todo {i}", description="Event.") for i in range(2)
+        )
+        events = self.events(
+            lambda: bulk_update_status(
+                TodoItem.objects.all(), "WORKING", return_ids=True
+            )
+        )
+        self.assertEqual(
+            events, [("todos.changed", {"ids": [todo.id for todo in todos]})]
+        )
+
+        tag = Tag.objects.create(name="Work")
+        todos[0].tags.add(tag)
+        tag.name = "Office"
+        events = self.events(tag.save)
+        self.assertEqual(events, [("tag.updated", {"id": tag.id, "name": "Office"})])
+        pk = tag.pk
+        events = self.events(tag.delete)
+        self.assertIn(("tag.deleted", {"id": pk}), events)
+
+
+class TodoEventStreamViewTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        User.objects.create_user(username="testuser", password="testpass")
+
+    def setUp(self):
+        credential_cache.clear()
+        credentials = base64.b64encode(b"testuser:testpass").decode()
+        self.headers = {"Authorization": f"Basic {credentials}"}
+        self.url = reverse("todo-events")
+
+    async def test_stream_resumes_from_last_event_id(self):
+        first = hub.publish("todo.created", {"id": 1})
+        second = hub.publish("todo.updated", {"id": 1})
+        response = await self.async_client.get(
+            self.url, headers={**self.headers, "Last-Event-ID": first.id}
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response["Content-Type"], "text/event-stream")
+        self.assertEqual(response["Cache-Control"], "no-cache")
+        stream = aiter(response.streaming_content)
+        self.assertEqual(await anext(stream), b"retry: 15000\n\n")
+        self.assertEqual(
+            await anext(stream),
+            f'id: {second.id}\nevent: todo.updated\ndata: {{"id": 1}}\n\n'.encode(),
+        )
+        third = hub.publish("todo.deleted", {"id": 1})
+        self.assertIn(third.id.encode(), await anext(stream))
+        await response.streaming_content.aclose()
+
+    async def test_requires_authentication(self):
+        response = await self.async_client.get(self.url)
+        self.assertEqual(response.status_code, 401)
+
+    def test_sync_writes_through_the_api_are_published(self):
+        client = APIClient()
+        client.force_authenticate(User.objects.get())
+        seq = hub.last_seq
+        with self.captureOnCommitCallbacks(execute=True):
+            response = client.post(
+                reverse("todo-list-create"),
+                {"title": "API", "description": "Event."},
+                format="json",
+            )
+        events, _ = hub.events_after(seq)
+        self.assertEqual(
+            [(event.type, event.data) for event in events],
+            [("todo.created", {"id": response.data["id"]})],
+        )
@@ -0,0 +1,192 @@
+from django.contrib.auth.models import User
+from django.test import TestCase, override_settings
+from django.urls import URLPattern, get_resolver, reverse
+from todo_app.authentication import credential_cache
+from todo_app.instrumentation import QueryBudgetExceeded
+from todo_app.models import Tag, TodoItem
+from todo_app.services import bulk_create_queries
+from todo_app.views import TodoItemListCreateView
+from rest_framework.test import APIClient
+from unittest import mock
+import base64
+import re
+
+
+class QueryInstrumentationMiddlewareTest(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(
+            User.objects.create_user(username="testuser", password="testpass")
+        )
+        self.todo = TodoItem.objects.create(title="Measure me", description="SQL.")
+        self.todo.tags.add(Tag.objects.create(name="Work"))
+        self.url = reverse("todo-list-create")
+
+    def server_timing(self, response):
+        match = re.fullmatch(
+            r'db;dur=([\d.]+);desc="(\d+) queries", total;dur=([\d.]+)',
+            response["Server-Timing"],
+        )
+        self.assertIsNotNone(match, response["Server-Timing"])
+        db_ms, queries, total_ms = match.groups()
+        return float(db_ms), int(queries), float(total_ms)
+
+    @override_settings(TODO_LIST_CACHE_ALIAS=None)
+    def test_server_timing_header(self):
+        response = self.client.get(self.url)
+        db_ms, queries, total_ms = self.server_timing(response)
+        # ETag validators and the page of todos.
+        self.assertEqual(queries, 2)
+        self.assertLessEqual(db_ms, total_ms)
+
+    @override_settings(TODO_SERVER_TIMING=False)
+    def test_server_timing_can_be_disabled(self):
+        response = self.client.get(self.url)
+        self.assertNotIn("Server-Timing", response)
+
+    @override_settings(TODO_LIST_CACHE_ALIAS=None)
+    def test_log_line(self):
+        with self.assertLogs("todo_app.requests", "INFO") as logs:
+            self.client.get(self.url, {"status": "OPEN"})
+        (record,) = logs.records
+        self.assertEqual(record.levelname, "INFO")
+        self.assertEqual(record.method, "GET")
+        self.assertEqual(record.path, self.url)
+        self.assertEqual(record.status, 200)
+        self.assertEqual(record.queries, 2)
+        self.assertEqual(record.query_budget, 4)
+        self.assertTrue(
+            record.getMessage().startswith(
+                f"method=GET path={self.url} status=200 queries=2 query_budget=4 "
+            )
+        )
+
+    @override_settings(TODO_LIST_CACHE_ALIAS=None, TODO_QUERY_BUDGET_STRICT=True)
+    def test_over_budget_raises_when_strict(self):
+        budget = {"GET": 1}
+        with mock.patch.object(TodoItemListCreateView, "query_budget", budget):
+            with self.assertLogs("todo_app.requests", "WARNING"):
+                with self.assertRaisesMessage(
+                    QueryBudgetExceeded, "ran 2 queries, over its budget of 1"
+                ):
+                    self.client.get(self.url)
+
+    @override_settings(TODO_LIST_CACHE_ALIAS=None, TODO_QUERY_BUDGET_STRICT=False)
+    def test_over_budget_warns_otherwise(self):
+        budget = {"GET": 1}
+        with mock.patch.object(TodoItemListCreateView, "query_budget", budget):
+            with self.assertLogs("todo_app.requests", "WARNING") as logs:
+                response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(logs.records[0].query_budget, 1)
+
+    @override_settings(TODO_QUERY_BUDGET_STRICT=True, TODO_BULK_BATCH_SIZE=20)
+    def test_bulk_budget_grows_with_the_payload(self):
+        items = [
+            {
+                "title": f"Bulk {i}",
+                "description": "Budget.",
+                "tags": [{"name": "Work"}, {"name": f"Tag {i % 5}"}],
+            }
+            for i in range(200)
+        ]
+        with self.assertLogs("todo_app.requests", "INFO") as logs:
+            response = self.client.post(
+                reverse("todo-bulk-create"), items, format="json"
+            )
+        self.assertEqual(response.status_code, 201)
+        (record,) = logs.records
+        # The transaction, three for the tags, ten todo INSERTs, twenty link
+        # INSERTs and the re-read, after two for authentication.
+        self.assertEqual(bulk_create_queries(200, 400), 2 + 3 + 10 + 20 + 2)
+        self.assertEqual(record.query_budget, 2 + bulk_create_queries(200, 400))
+        # Authentication is forced, so only that part of the budget is left.
+        self.assertEqual(record.queries, record.query_budget - 2)
+
+    async def test_async_views_are_measured(self):
+        credential_cache.clear()
+        credentials = base64.b64encode(b"testuser:testpass").decode()
+        response = await self.async_client.get(
+            reverse("async-todo-detail", args=[self.todo.id]),
+            headers={"Authorization": f"Basic {credentials}"},
+        )
+        self.assertEqual(response.status_code, 200)
+        # The user lookup and the todo, tags included.
+        self.assertEqual(self.server_timing(response)[1], 2)
+
+    def test_every_api_endpoint_declares_a_budget(self):
+        (api,) = [
+            entry
+            for entry in get_resolver().url_patterns
+            if str(entry.pattern) == "api/"
+        ]
+        for pattern in api.url_patterns:
+            self.assertIsInstance(pattern, URLPattern)
+            view_class = pattern.callback.view_class
+            with self.subTest(view=view_class.__name__):
+                self.assertIsNotNone(getattr(view_class, "query_budget", None))
+
+
+@override_settings(
+    TODO_QUERY_BUDGET_STRICT=True,
+    TODO_LIST_CACHE_ALIAS=None,
+    PASSWORD_HASHERS=["django.contrib.auth.hashers.MD5PasswordHasher"],
+)
+class BasicAuthQueryBudgetTest(TestCase):
+    """Budgets hold with real Basic credentials, in the worst case for
+    authentication: a cached credential whose password hash has changed."""
+
+    def setUp(self):
+        credential_cache.clear()
+        self.user = User.objects.create_user(username="testuser", password="testpass")
+        credentials = base64.b64encode(b"testuser:testpass").decode()
+        self.client = APIClient(HTTP_AUTHORIZATION=f"Basic {credentials}")
+        self.assertEqual(self.client.get(reverse("metrics")).status_code, 200)
+        work = Tag.objects.create(name="Work")
+        self.todos = [
+            TodoItem.objects.create(title=f"Todo {i}", description="Budget.")
+            for i in range(3)
+        ]
+        for todo in self.todos:
+            todo.tags.add(work)
+        self.todos[0].delete()
+
+    def request(self, method, url, data=None):
+        # A new salt changes the hash, so the cached credential no longer
+        # matches and is verified again.
+        self.user.set_password("testpass")
+        self.user.save()
+        with self.assertLogs("todo_app.requests", "INFO") as logs:
+            response = getattr(self.client, method)(url, data, format="json")
+        self.assertLess(response.status_code, 300)
+        (record,) = logs.records
+        return record
+
+    def test_reads(self):
+        for url in [
+            reverse("todo-list-create"),
+            reverse("todo-detail", args=[self.todos[1].id]),
+            reverse("todo-changes"),
+            reverse("todo-stats"),
+            reverse("todo-export"),
+            reverse("metrics"),
+        ]:
+            with self.subTest(url=url):
+                record = self.request("get", url)
+                self.assertLessEqual(record.queries, record.query_budget)
+
+    def test_changes_feed_uses_its_whole_budget(self):
+        record = self.request("get", reverse("todo-changes"))
+        # Authentication, the list version, the todos, their tags and the
+        # tombstones.
+        self.assertEqual(record.queries, 2 + 4)
+        self.assertEqual(record.query_budget, 2 + 4)
+
+    def test_bulk_status_with_ids(self):
+        record = self.request(
+            "post",
+            reverse("todo-bulk-status"),
+            {"from_status": ["OPEN"], "status": "COMPLETED", "return_ids": True},
+        )
+        # Authentication, SAVEPOINT, the ids, the UPDATE and RELEASE.
+        self.assertEqual(record.queries, 2 + 2 + 2)
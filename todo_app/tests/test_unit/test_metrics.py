@@ -0,0 +1,155 @@
+from django.contrib.auth.models import User
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from todo_app.cache import list_cache
+from todo_app.metrics import MetricsRegistry, merge, registry, render_prometheus
+from todo_app.models import TodoItem
+from rest_framework.test import APIClient
+from unittest import mock
+import json
+import os
+import tempfile
+import threading
+
+
+class MetricsRegistryTest(TestCase):
+    def setUp(self):
+        self.registry = MetricsRegistry(buckets=(0.01, 0.1))
+
+    def test_histogram_buckets(self):
+        for seconds in (0.005, 0.01, 0.05, 2):
+            self.registry.observe("todo-detail", "GET", 200, seconds, 3, 0.001)
+        text = render_prometheus(merge([self.registry.snapshot()]))
+        labels = 'view="todo-detail",method="GET"'
+        self.assertIn(f'bucket{{{labels},le="0.01"}} 2\n', text)
+        self.assertIn(f'bucket{{{labels},le="0.1"}} 3\n', text)
+        self.assertIn(f'bucket{{{labels},le="+Inf"}} 4\n', text)
+        self.assertIn(f"todo_http_request_duration_seconds_count{{{labels}}} 4\n", text)
+        self.assertIn(
+            f"todo_http_request_duration_seconds_sum{{{labels}}} 2.065000\n", text
+        )
+        self.assertIn('todo_db_queries_total{view="todo-detail"} 12\n', text)
+        self.assertIn(
+            'todo_http_requests_total{view="todo-detail",method="GET",status="200"} 4',
+            text,
+        )
+
+    def test_label_values_are_escaped(self):
+        self.registry.observe('a"b\\c', "GET", 404, 0.001, 0, 0.0)
+        text = render_prometheus(merge([self.registry.snapshot()]))
+        self.assertIn('view="a\\"b\\\\c"', text)
+
+    def test_processes_are_summed_through_the_metrics_dir(self):
+        with tempfile.TemporaryDirectory() as directory:
+            with override_settings(TODO_METRICS_DIR=directory):
+                other = MetricsRegistry(buckets=(0.01, 0.1))
+                other.observe("todo-list-create", "GET", 200, 0.05, 3, 0.002)
+                with mock.patch.object(os, "getpid", return_value=1):
+                    other.flush()
+                self.registry.observe("todo-list-create", "GET", 200, 0.005, 2, 0.001)
+                self.registry.observe("todo-list-create", "POST", 201, 0.02, 9, 0.003)
+                text = self.registry.render()
+                self.assertEqual(len(os.listdir(directory)), 2)
+        self.assertIn("todo_metrics_processes 2\n", text)
+        self.assertIn(
+            'todo_http_requests_total{view="todo-list-create",method="GET",'
+            'status="200"} 2\n',
+            text,
+        )
+        self.assertIn('todo_db_queries_total{view="todo-list-create"} 14\n', text)
+
+    def test_flush_interval(self):
+        with tempfile.TemporaryDirectory() as directory:
+            with override_settings(
+                TODO_METRICS_DIR=directory, TODO_METRICS_FLUSH_INTERVAL=0
+            ):
+                self.registry.observe("todo-detail", "GET", 200, 0.001, 1, 0.0)
+                (name,) = os.listdir(directory)
+                with open(os.path.join(directory, name)) as snapshot:
+                    self.assertEqual(json.load(snapshot)["requests"][0][-1], 1)
+
+    def observe_in_threads(self, count):
+        threads = [
+            threading.Thread(
+                target=self.registry.observe,
+                args=("todo-detail", "GET", 200, 0.001, 1, 0.0),
+            )
+            for _ in range(count)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+    def test_one_flush_per_interval(self):
+        with tempfile.TemporaryDirectory() as directory:
+            with override_settings(
+                TODO_METRICS_DIR=directory, TODO_METRICS_FLUSH_INTERVAL=60
+            ):
+                self.registry._flushed_at -= 60
+                with mock.patch.object(self.registry, "write") as write:
+                    self.observe_in_threads(16)
+        self.assertEqual(write.call_count, 1)
+
+    def test_concurrent_flushes_leave_one_complete_file(self):
+        with tempfile.TemporaryDirectory() as directory:
+            with override_settings(
+                TODO_METRICS_DIR=directory, TODO_METRICS_FLUSH_INTERVAL=0
+            ):
+                self.observe_in_threads(16)
+                threads = [
+                    threading.Thread(target=self.registry.flush) for _ in range(16)
+                ]
+                for thread in threads:
+                    thread.start()
+                for thread in threads:
+                    thread.join()
+                (name,) = os.listdir(directory)
+                with open(os.path.join(directory, name)) as snapshot:
+                    self.assertEqual(json.load(snapshot)["requests"][0][-1], 16)
+
+    def test_write_errors_do_not_reach_the_request(self):
+        with tempfile.NamedTemporaryFile() as not_a_directory:
+            with override_settings(
+                TODO_METRICS_DIR=not_a_directory.name, TODO_METRICS_FLUSH_INTERVAL=0
+            ):
+                with self.assertLogs("todo_app.metrics", "WARNING"):
+                    self.registry.observe("todo-detail", "GET", 200, 0.001, 1, 0.0)
+
+
+class MetricsViewTest(TestCase):
+    def setUp(self):
+        registry.reset()
+        self.client = APIClient()
+        self.client.force_authenticate(
+            User.objects.create_user(username="testuser", password="testpass")
+        )
+        self.todo = TodoItem.objects.create(title="Count me", description="Metrics.")
+
+    def test_scrape(self):
+        hits = list_cache.stats()["hits"]
+        self.client.get(reverse("todo-list-create"))
+        self.client.get(reverse("todo-list-create"))
+        self.client.get(reverse("todo-detail", args=[self.todo.id]))
+        self.client.get(reverse("todo-detail", args=[0]))
+        response = self.client.get(reverse("metrics"))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            response["Content-Type"], "text/plain; version=0.0.4; charset=utf-8"
+        )
+        text = response.content.decode()
+        for line in (
+            'todo_http_requests_total{view="todo-list-create",method="GET",'
+            'status="200"} 2',
+            'todo_http_requests_total{view="todo-detail",method="GET",status="200"} 1',
+            'todo_http_requests_total{view="todo-detail",method="GET",status="404"} 1',
+            'todo_http_request_duration_seconds_count{view="todo-detail",'
+            'method="GET"} 2',
+            f'todo_list_cache_requests_total{{result="hit"}} {hits + 1}',
+            "todo_metrics_processes 1",
+        ):
+            self.assertIn(line + "\n", text)
+
+    def test_requires_authentication(self):
+        response = APIClient().get(reverse("metrics"))
+        self.assertEqual(response.status_code, 401)
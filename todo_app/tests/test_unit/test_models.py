@@ -1,7 +1,11 @@
 from django.test import TestCase
+from django.db import connection
 from django.core.exceptions import ValidationError
 from django.utils import timezone
-from todo_app.models import TodoItem, Tag
+from todo_app.models import TodoItem, TodoItemTombstone, Tag, TagQuerySet
+from todo_app.serializers import TodoItemSerializer
+from todo_app.services import insert_todos
+from unittest import mock
 
 
 class TagModelTest(TestCase):
@@ -62,3 +66,147 @@ class TodoItemModelTest(TestCase):
             "Value 'INVALID_STATUS' is not a valid choice.",
             str(context.exception),
         )
+
+
+class TagResolveTest(TestCase):
+    def test_resolve_reuses_existing_and_creates_missing(self):
+        existing = Tag.objects.create(name="Work")
+        with self.assertNumQueries(3):
+            tags = Tag.objects.resolve(["Work", "Home", "Home"])
+        self.assertEqual(tags["Work"], existing)
+        self.assertEqual(tags["Home"].name, "Home")
+        self.assertEqual(Tag.objects.count(), 2)
+
+    def test_resolve_existing_tags_is_one_query(self):
+        Tag.objects.bulk_create([Tag(name="Work"), Tag(name="Home")])
+        with self.assertNumQueries(1):
+            tags = Tag.objects.resolve(["Work", "Home"])
+        self.assertEqual(set(tags), {"Work", "Home"})
+
+    def test_resolve_survives_concurrent_creator(self):
+        """A tag inserted by someone else between our SELECT and INSERT is
+        picked up instead of raising an IntegrityError."""
+        original_bulk_create = TagQuerySet.bulk_create
+
+        def racing_bulk_create(queryset, objs, **kwargs):
+            Tag.objects.create(name="Home")
+            return original_bulk_create(queryset, objs, **kwargs)
+
+        with mock.patch.object(TagQuerySet, "bulk_create", racing_bulk_create):
+            tags = Tag.objects.resolve(["Home", "Work"])
+        self.assertEqual(tags["Home"], Tag.objects.get(name="Home"))
+        self.assertEqual(Tag.objects.count(), 2)
+
+
+class TodoItemTagListTest(TestCase):
+    """``tag_list`` follows every change to a todo's tags."""
+
+    def setUp(self):
+        self.work = Tag.objects.create(name="Work")
+        self.home = Tag.objects.create(name="Home")
+        self.todo = TodoItem.objects.create(title="Tagged", description="Lists.")
+
+    def stored(self, todo=None):
+        return TodoItem.objects.get(pk=(todo or self.todo).pk).tag_list
+
+    def test_add_remove_and_clear(self):
+        self.todo.tags.add(self.home, self.work)
+        expected = [
+            {"id": self.work.id, "name": "Work"},
+            {"id": self.home.id, "name": "Home"},
+        ]
+        self.assertEqual(self.stored(), expected)
+        self.assertEqual(self.todo.tag_list, expected)
+        self.todo.tags.remove(self.work)
+        self.assertEqual(self.stored(), [{"id": self.home.id, "name": "Home"}])
+        self.todo.tags.clear()
+        self.assertEqual(self.stored(), [])
+
+    def test_reverse_side(self):
+        other = TodoItem.objects.create(title="Other", description="Lists.")
+        self.work.todoitem_set.add(self.todo, other)
+        self.assertEqual(self.stored(other), [{"id": self.work.id, "name": "Work"}])
+        self.work.todoitem_set.clear()
+        self.assertEqual(self.stored(), [])
+        self.assertEqual(self.stored(other), [])
+
+    def test_tag_rename_and_delete(self):
+        self.todo.tags.add(self.work, self.home)
+        self.work.name = "Office"
+        self.work.save()
+        self.assertEqual(self.stored()[0], {"id": self.work.id, "name": "Office"})
+        self.home.delete()
+        self.assertEqual(self.stored(), [{"id": self.work.id, "name": "Office"}])
+
+    def test_serializer_writes(self):
+        serializer = TodoItemSerializer(
+            data={
+                "title": "New",
+                "description": "Lists.",
+                "tags": [{"name": "Work"}, {"name": "Fresh"}],
+            }
+        )
+        serializer.is_valid(raise_exception=True)
+        todo = serializer.save()
+        names = [tag["name"] for tag in self.stored(todo)]
+        self.assertEqual(names, ["Work", "Fresh"])
+        serializer = TodoItemSerializer(
+            todo, data={"tags": [{"name": "Home"}]}, partial=True
+        )
+        serializer.is_valid(raise_exception=True)
+        serializer.save()
+        self.assertEqual(self.stored(todo), [{"id": self.home.id, "name": "Home"}])
+
+    def test_insert_todos(self):
+        (todo,) = insert_todos(
+            [
+                {
+                    "title": "Bulk",
+                    "description": "Lists.",
+                    "tags": [{"name": "Home"}, {"name": "Work"}],
+                }
+            ]
+        )
+        self.assertEqual(
+            self.stored(todo),
+            [
+                {"id": self.work.id, "name": "Work"},
+                {"id": self.home.id, "name": "Home"},
+            ],
+        )
+
+    def test_stale_instance_save_keeps_the_stored_list(self):
+        stale = TodoItem.objects.get(pk=self.todo.pk)
+        self.todo.tags.add(self.work)
+        stale.title = "Renamed"
+        stale.save()
+        self.assertEqual(self.stored(), [{"id": self.work.id, "name": "Work"}])
+
+
+class TodoItemChangeSeqTest(TestCase):
+    """Every write stamps a higher ``change_seq`` than any before it."""
+
+    def setUp(self):
+        if connection.vendor != "sqlite":
+            self.skipTest("The change triggers are SQLite's.")
+
+    def change_seq(self, todo):
+        return TodoItem.objects.values_list("change_seq", flat=True).get(pk=todo.pk)
+
+    def test_writes_stamp_increasing_numbers(self):
+        first = TodoItem.objects.create(title="First", description="Seq.")
+        second = TodoItem.objects.create(title="Second", description="Seq.")
+        self.assertLess(self.change_seq(first), self.change_seq(second))
+        TodoItem.objects.filter(pk=first.pk).update(status="WORKING")
+        self.assertGreater(self.change_seq(first), self.change_seq(second))
+        first.delete()
+        tombstone = TodoItemTombstone.objects.get()
+        self.assertGreater(tombstone.change_seq, self.change_seq(second))
+
+    def test_stale_instance_save_moves_forward(self):
+        todo = TodoItem.objects.create(title="Stale", description="Seq.")
+        stale = TodoItem.objects.get(pk=todo.pk)
+        TodoItem.objects.filter(pk=todo.pk).update(title="Newer")
+        newer = self.change_seq(todo)
+        stale.save()
+        self.assertGreater(self.change_seq(todo), newer)
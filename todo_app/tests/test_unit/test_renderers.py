@@ -0,0 +1,106 @@
+from datetime import datetime, timedelta, timezone as dt_timezone
+from decimal import Decimal
+from django.contrib.auth.models import User
+from django.test import SimpleTestCase, TestCase
+from django.urls import reverse
+from django.utils.translation import gettext_lazy
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+from rest_framework.test import APIClient
+from todo_app import renderers
+from todo_app.models import TodoItem
+from todo_app.renderers import FastJSONParser, FastJSONRenderer
+from unittest import mock
+import io
+import json
+import uuid
+
+PAYLOAD = {
+    "utc": datetime(2024, 12, 6, 12, 0, 0, 123456, tzinfo=dt_timezone.utc),
+    "offset": datetime(
+        2024, 12, 6, 17, 30, tzinfo=dt_timezone(timedelta(hours=5, minutes=30))
+    ),
+    "naive": datetime(2024, 12, 6, 12, 0),
+    "day": datetime(2024, 12, 6).date(),
+    "decimal": Decimal("1.50"),
+    "uuid": uuid.UUID(int=1),
+    "lazy": gettext_lazy("Not found."),
+    "unicode": "café\u2028\u2029",
+    "nested": [{"id": 1, "tags": []}, None, True, 1.5],
+    3: "int key",
+}
+
+
+class FastJSONRendererTest(SimpleTestCase):
+    def assertSameAsDRF(self, data, media_type=None):
+        self.assertEqual(
+            FastJSONRenderer().render(data, media_type),
+            JSONRenderer().render(data, media_type),
+        )
+
+    def test_matches_drf_renderer(self):
+        self.assertSameAsDRF(PAYLOAD)
+        self.assertSameAsDRF([PAYLOAD, PAYLOAD])
+        self.assertEqual(FastJSONRenderer().render(None), b"")
+
+    def test_indent_uses_stdlib(self):
+        self.assertSameAsDRF(PAYLOAD, "application/json; indent=4")
+
+    def test_stdlib_fallback(self):
+        with mock.patch.object(renderers, "orjson", None):
+            self.assertSameAsDRF(PAYLOAD)
+            self.assertEqual(
+                json.loads(renderers.dumps({"a": PAYLOAD["utc"]})),
+                {"a": "2024-12-06T12:00:00.123456Z"},
+            )
+
+
+class FastJSONParserTest(SimpleTestCase):
+    def parse(self, body, parser=None):
+        return (parser or FastJSONParser()).parse(io.BytesIO(body))
+
+    def test_matches_drf_parser(self):
+        body = json.dumps(
+            {"title": "café", "tags": [{"name": "Work"}], "n": 1.5}
+        ).encode()
+        self.assertEqual(self.parse(body), self.parse(body, JSONParser()))
+
+    def test_invalid_json(self):
+        for body in (b"{broken", b"[NaN]", b"\xff"):
+            with self.subTest(body=body):
+                with self.assertRaises(ParseError):
+                    self.parse(body)
+
+    def test_stdlib_fallback(self):
+        with mock.patch.object(renderers, "orjson", None):
+            self.assertEqual(self.parse(b'{"a": [1]}'), {"a": [1]})
+            with self.assertRaises(ParseError):
+                self.parse(b"{broken")
+
+
+class JSONBackendAPITest(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(
+            User.objects.create_user(username="testuser", password="testpass")
+        )
+        for i in range(3):
+            TodoItem.objects.create(title=f"Todo {i} \u2028", description="JSON.")
+
+    def test_list_and_create_round_trip(self):
+        response = self.client.post(
+            reverse("todo-list-create"),
+            json.dumps({"title": "café", "description": "Parsed."}),
+            content_type="application/json",
+        )
+        self.assertEqual(response.status_code, 201)
+        response = self.client.get(reverse("todo-list-create"))
+        self.assertEqual(response.content, JSONRenderer().render(response.data))
+
+    def test_export_streams_a_json_array(self):
+        response = self.client.get(reverse("todo-export"), {"format": "json"})
+        self.assertEqual(response["Content-Type"], "application/json; charset=utf-8")
+        rows = json.loads(b"".join(response.streaming_content))
+        listed = self.client.get(reverse("todo-list-create")).json()["results"]
+        self.assertEqual(rows, listed)
@@ -0,0 +1,223 @@
+from asgiref.sync import sync_to_async
+from django.contrib.auth.models import User
+from django.http import HttpResponse, StreamingHttpResponse
+from django.test import AsyncRequestFactory, RequestFactory, SimpleTestCase
+from django.test import TransactionTestCase, override_settings
+from django.db import router, transaction
+from django.urls import reverse
+from todo_app.authentication import credential_cache
+from todo_app.models import Tag, TodoItem, TodoListVersion
+from todo_app.replicas import (
+    ReplicaPinMiddleware,
+    ReplicaRouter,
+    pin_key,
+    use_primary,
+)
+import base64
+import hashlib
+import json
+
+
+@override_settings(TODO_READ_REPLICAS=["replica"])
+class ReplicaRouterTest(SimpleTestCase):
+    def test_reads_go_to_a_replica(self):
+        self.assertEqual(router.db_for_read(TodoItem), "replica")
+        self.assertEqual(router.db_for_read(Tag), "replica")
+        self.assertEqual(router.db_for_read(User), "default")
+
+    def test_writes_go_to_the_primary(self):
+        todo = TodoItem(pk=1)
+        todo._state.db = "replica"
+        self.assertEqual(router.db_for_write(TodoItem, instance=todo), "default")
+
+    def test_use_primary(self):
+        with use_primary():
+            self.assertEqual(router.db_for_read(TodoItem), "default")
+        self.assertEqual(router.db_for_read(TodoItem), "replica")
+
+    @override_settings(TODO_READ_REPLICAS=[])
+    def test_no_replicas(self):
+        self.assertEqual(router.db_for_read(TodoItem), "default")
+
+    def test_replicas_are_not_migrated(self):
+        self.assertIs(ReplicaRouter().allow_migrate("replica", "todo_app"), False)
+        self.assertIsNone(ReplicaRouter().allow_migrate("default", "todo_app"))
+
+
+class ReplicaRouterTransactionTest(SimpleTestCase):
+    databases = {"default"}
+
+    @override_settings(TODO_READ_REPLICAS=["replica"])
+    def test_reads_in_a_transaction_go_to_the_primary(self):
+        with transaction.atomic():
+            self.assertEqual(router.db_for_read(TodoItem), "default")
+
+
+@override_settings(TODO_READ_REPLICAS=["replica"])
+class TagRenameOnPrimaryTest(TransactionTestCase):
+    """The ``tag_list`` refresh after a rename reads the tagged todos from
+    the primary: a lagging replica could miss some. No ``replica`` database
+    is configured, so any read routed there fails."""
+
+    databases = {"default"}
+
+    def test_rename_refreshes_from_the_primary(self):
+        tag = Tag.objects.create(name="Work")
+        todo = TodoItem.objects.create(title="Tagged", description="Replica.")
+        todo.tags.add(tag)
+        tag.name = "Office"
+        tag.save()
+        with use_primary():
+            todo.refresh_from_db()
+        self.assertEqual(todo.tag_list, [{"id": tag.id, "name": "Office"}])
+
+
+@override_settings(TODO_READ_REPLICAS=["replica"])
+class PinnedExportUnderASGITest(TransactionTestCase):
+    """An export streamed under ASGI straight after the client's write reads
+    every chunk from the primary."""
+
+    databases = {"default"}
+
+    async def test_export_after_a_write(self):
+        await sync_to_async(User.objects.create_user)(
+            username="testuser", password="testpass"
+        )
+        credential_cache.clear()
+        credentials = base64.b64encode(b"testuser:testpass").decode()
+        headers = {"Authorization": f"Basic {credentials}"}
+        response = await self.async_client.post(
+            reverse("async-todo-list-create"),
+            {"title": "Written", "description": "Read it back."},
+            content_type="application/json",
+            headers=headers,
+        )
+        self.assertEqual(response.status_code, 201)
+        response = await self.async_client.get(reverse("todo-export"), headers=headers)
+        self.assertEqual(response.status_code, 200)
+        # As ASGIHandler sends it: a synchronous stream is read in a worker
+        # thread, which Django warns about.
+        with self.assertWarnsRegex(Warning, "synchronous iterators"):
+            lines = [line async for line in response]
+        self.assertEqual(json.loads(b"".join(lines))["title"], "Written")
+
+
+@override_settings(TODO_READ_REPLICAS=["replica"])
+class ReplicaPinMiddlewareTest(SimpleTestCase):
+    def setUp(self):
+        self.factory = RequestFactory()
+        self.routes = []
+        self.status = 200
+        self.authorization = f"Basic {self.id()}"
+
+    def get_response(self, request):
+        self.routes.append(router.db_for_read(TodoItem))
+        return HttpResponse(status=self.status)
+
+    def send(self, method, authorization=None):
+        request = getattr(self.factory, method)(
+            "/api/todos/1/",
+            HTTP_AUTHORIZATION=authorization or self.authorization,
+        )
+        ReplicaPinMiddleware(self.get_response)(request)
+        return self.routes[-1]
+
+    def test_reads_after_a_write_stick_to_the_primary(self):
+        self.assertEqual(self.send("get"), "replica")
+        self.assertEqual(self.send("put"), "default")
+        self.assertEqual(self.send("get"), "default")
+        # Other clients keep reading from the replica.
+        self.assertEqual(self.send("get", authorization="Basic other"), "replica")
+
+    @override_settings(TODO_REPLICA_PIN_SECONDS=0)
+    def test_pin_expires(self):
+        self.send("delete")
+        self.assertEqual(self.send("get"), "replica")
+
+    def test_failed_write_does_not_pin(self):
+        self.status = 400
+        self.assertEqual(self.send("post"), "default")
+        self.assertEqual(self.send("get"), "replica")
+
+    def test_pin_key_is_keyed_on_the_secret(self):
+        request = self.factory.get("/", HTTP_AUTHORIZATION=self.authorization)
+        key = pin_key(request)
+        plain = hashlib.sha256(self.authorization.encode()).hexdigest()
+        self.assertNotIn(plain, key)
+        with self.settings(SECRET_KEY="another secret"):
+            self.assertNotEqual(pin_key(request), key)
+
+    def test_anonymous_requests(self):
+        request = self.factory.post("/api/todos/")
+        ReplicaPinMiddleware(self.get_response)(request)
+        self.assertEqual(self.routes, ["replica"])
+
+    def test_pinned_stream_reads_from_the_primary(self):
+        def stream():
+            yield router.db_for_read(TodoItem)
+
+        self.send("post")
+        request = self.factory.get(
+            "/api/todos/export/", HTTP_AUTHORIZATION=self.authorization
+        )
+        response = ReplicaPinMiddleware(
+            lambda request: StreamingHttpResponse(stream())
+        )(request)
+        self.assertEqual(b"".join(response.streaming_content), b"default")
+        self.assertEqual(router.db_for_read(TodoItem), "replica")
+
+    async def test_async_requests(self):
+        factory = AsyncRequestFactory()
+
+        async def get_response(request):
+            self.routes.append(router.db_for_read(TodoItem))
+            return HttpResponse()
+
+        middleware = ReplicaPinMiddleware(get_response)
+        headers = {"Authorization": self.authorization}
+        await middleware(factory.get("/api/async/todos/", headers=headers))
+        await middleware(factory.patch("/api/async/todos/1/", headers=headers))
+        await middleware(factory.get("/api/async/todos/1/", headers=headers))
+        self.assertEqual(self.routes, ["replica", "default", "default"])
+
+
+@override_settings(TODO_READ_REPLICAS=["replica1", "replica2"])
+class OneReplicaPerRequestTest(SimpleTestCase):
+    """Every read in a request, the list validators included, comes from
+    the same replica, or the ETag could describe a fresher snapshot than
+    the body it is sent with."""
+
+    def get_response(self, request):
+        self.routes.append(
+            {
+                TodoListVersion.objects.all().db,  # ETag
+                TodoItem.objects.all().db,  # page
+                Tag.objects.all().db,  # tags prefetch
+            }
+        )
+        return HttpResponse()
+
+    def test_validators_and_list_agree(self):
+        self.routes = []
+        middleware = ReplicaPinMiddleware(self.get_response)
+        for _ in range(20):
+            middleware(RequestFactory().get("/api/todos/"))
+        for aliases in self.routes:
+            self.assertEqual(len(aliases), 1)
+            self.assertIn(aliases.pop(), ["replica1", "replica2"])
+
+    def test_stream_reads_from_the_request_replica(self):
+        def stream():
+            yield router.db_for_read(TodoItem)
+            yield router.db_for_read(Tag)
+
+        def get_response(request):
+            routes.append(router.db_for_read(TodoItem))
+            return StreamingHttpResponse(stream())
+
+        middleware = ReplicaPinMiddleware(get_response)
+        for _ in range(10):
+            routes = []
+            response = middleware(RequestFactory().get("/api/todos/export/"))
+            routes.extend(chunk.decode() for chunk in response.streaming_content)
+            self.assertEqual(len(set(routes)), 1)
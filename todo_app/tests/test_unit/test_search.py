@@ -0,0 +1,94 @@
+from django.test import TestCase
+from django.urls import reverse
+from django.db import connection
+from rest_framework.test import APIClient
+from todo_app.models import TodoItem
+from todo_app.search import install_fts, search_todos
+from django.contrib.auth.models import User
+
+
+class TodoItemSearchTest(TestCase):
+    def setUp(self):
+        if connection.vendor != "sqlite":
+            self.skipTest("Full-text search uses SQLite FTS5.")
+        self.client = APIClient()
+        self.client.force_authenticate(
+            User.objects.create_user(username="testuser", password="testpass")
+        )
+        self.url = reverse("todo-list-create")
+
+    def create(self, title, description="Nothing to see."):
+        return TodoItem.objects.create(title=title, description=description)
+
+    def search(self, text):
+        return list(search_todos(TodoItem.objects.all(), text))
+
+    def test_ranked_search_through_api(self):
+        once = self.create("Quarterly report", "Send it to finance.")
+        twice = self.create("Report draft", "Review the report before Friday.")
+        self.create("Groceries")
+        response = self.client.get(self.url, {"q": "report"})
+        self.assertEqual(response.status_code, 200)
+        ids = [item["id"] for item in response.data["results"]]
+        self.assertEqual(ids, [twice.id, once.id])
+
+    def test_terms_are_combined_and_syntax_is_escaped(self):
+        match = self.create("Pay taxes", "Before April.")
+        self.create("Pay rent")
+        self.assertEqual(self.search("pay april"), [match])
+        self.assertEqual(self.search('taxes" OR (rent*'), [])
+        self.assertEqual(self.search("   "), list(TodoItem.objects.all()))
+
+    def test_index_follows_every_write_path(self):
+        todo = self.create("Alpha")
+        todo.title = "Beta"
+        todo.save()
+        self.assertEqual(self.search("alpha"), [])
+        self.assertEqual(self.search("beta"), [todo])
+
+        TodoItem.objects.filter(pk=todo.pk).update(description="Gamma")
+        self.assertEqual(self.search("gamma"), [todo])
+
+        bulk = TodoItem.objects.bulk_create(
+            [TodoItem(title="Delta", description="Bulk.")]
+        )
+        self.assertEqual(self.search("delta"), bulk)
+
+        TodoItem.objects.all().delete()
+        self.assertEqual(self.search("beta delta"), [])
+
+    def test_search_results_paginate_in_rank_order(self):
+        for i in range(5):
+            self.create(f"Task {i}", "task " * (i + 1))
+        first = self.client.get(self.url, {"q": "task", "page_size": 2}).data
+        second = self.client.get(first["next"]).data
+        third = self.client.get(second["next"]).data
+        titles = [
+            item["title"] for page in (first, second, third) for item in page["results"]
+        ]
+        self.assertEqual(titles, [f"Task {i}" for i in range(4, -1, -1)])
+        self.assertIsNone(third["next"])
+        back = self.client.get(third["previous"]).data
+        self.assertEqual(back["results"], second["results"])
+
+    def test_install_repairs_dropped_triggers(self):
+        todo = self.create("Epsilon")
+        self.assertFalse(install_fts(connection))
+        with connection.cursor() as cursor:
+            cursor.execute("DROP TRIGGER todo_app_todoitem_fts_au")
+        TodoItem.objects.filter(pk=todo.pk).update(title="Zeta")
+        self.assertTrue(install_fts(connection))
+        self.assertEqual(self.search("zeta"), [todo])
+        self.assertEqual(self.search("epsilon"), [])
+
+    def test_admin_search_uses_ranked_index(self):
+        admin = User.objects.create_superuser(username="admin", password="adminpass")
+        self.client.force_login(admin)
+        once = self.create("Invoice")
+        twice = self.create("Invoice", "Invoice the client.")
+        self.create("Unrelated")
+        response = self.client.get(
+            reverse("admin:todo_app_todoitem_changelist"), {"q": "invoice"}
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(list(response.context["cl"].result_list), [twice, once])
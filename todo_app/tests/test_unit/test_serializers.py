@@ -1,6 +1,12 @@
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.db import connection
 from todo_app.models import TodoItem, Tag
-from todo_app.serializers import TodoItemSerializer, TagSerializer
+from todo_app.serializers import (
+    TodoItemSerializer,
+    TagSerializer,
+    TodoItemReadSerializer,
+)
 from django.utils import timezone
 from django.utils.timezone import localtime
 
@@ -141,3 +147,92 @@ class TodoItemSerializerTest(TestCase):
         self.assertFalse(serializer.is_valid())
         self.assertIn("due_date", serializer.errors)
         self.assertIn("Due date cannot be in the past.", serializer.errors["due_date"])
+
+
+class TodoItemSerializerTagQueryTest(TestCase):
+    def save(self, tag_names, instance=None):
+        data = {
+            "title": "Tagged",
+            "description": "Tag resolution.",
+            "status": "OPEN",
+            "tags": [{"name": name} for name in tag_names],
+        }
+        serializer = TodoItemSerializer(instance, data=data)
+        self.assertTrue(serializer.is_valid(), serializer.errors)
+        with CaptureQueriesContext(connection) as queries:
+            todo = serializer.save()
+        return todo, len(queries)
+
+    def test_create_query_count_does_not_depend_on_tag_count(self):
+        _, one_tag = self.save(["Tag0"])
+        _, many_tags = self.save([f"Tag{i}" for i in range(1, 21)])
+        self.assertEqual(one_tag, many_tags)
+        # New tags take every query the views' budgets count on.
+        self.assertEqual(many_tags, TodoItemSerializer.create_queries)
+
+    def test_update_query_count_does_not_depend_on_tag_count(self):
+        todo, _ = self.save(["Tag0"])
+        _, one_tag = self.save(["Tag1"], instance=todo)
+        _, many_tags = self.save([f"Tag{i}" for i in range(2, 22)], instance=todo)
+        self.assertEqual(one_tag, many_tags)
+        self.assertEqual(many_tags, TodoItemSerializer.update_queries)
+
+    def test_update_only_writes_changed_links(self):
+        todo, _ = self.save(["Keep", "Drop"])
+        Through = TodoItem.tags.through
+        kept_link = Through.objects.get(todoitem=todo, tag__name="Keep")
+
+        todo, _ = self.save(["Keep", "Add"], instance=todo)
+
+        self.assertTrue(Through.objects.filter(pk=kept_link.pk).exists())
+        self.assertEqual(
+            sorted(todo.tags.values_list("name", flat=True)), ["Add", "Keep"]
+        )
+
+
+class TodoItemReadSerializerTest(TestCase):
+    def setUp(self):
+        tags = [Tag.objects.create(name=name) for name in ("Work", "Home", "Urgent")]
+        self.todos = [
+            TodoItem.objects.create(
+                title=f"Todo {i}",
+                description=f"Description {i}",
+                due_date=timezone.now() + timezone.timedelta(days=i) if i % 2 else None,
+                status=TodoItem.STATUS_CHOICES[i % len(TodoItem.STATUS_CHOICES)][0],
+            )
+            for i in range(6)
+        ]
+        self.todos[0].tags.add(tags[2], tags[0])
+        self.todos[1].tags.add(tags[1])
+        self.todos[4].tags.add(*tags)
+
+    def test_matches_todo_item_serializer(self):
+        queryset = TodoItem.objects.prefetch_related("tags").order_by("id")
+        expected = TodoItemSerializer(queryset, many=True).data
+        fast = TodoItemReadSerializer(
+            list(TodoItemReadSerializer.select(queryset)), many=True
+        ).data
+        self.assertEqual(fast, expected)
+        for fast_row, expected_row in zip(fast, expected):
+            self.assertEqual(list(fast_row), list(expected_row))
+
+    def test_single_row(self):
+        row = TodoItemReadSerializer.select(
+            TodoItem.objects.filter(pk=self.todos[0].pk)
+        ).get()
+        self.assertEqual(
+            TodoItemReadSerializer(row).data, TodoItemSerializer(self.todos[0]).data
+        )
+
+    def test_one_query_for_any_number_of_rows(self):
+        with CaptureQueriesContext(connection) as queries:
+            TodoItemReadSerializer(
+                TodoItemReadSerializer.select(TodoItem.objects.all()), many=True
+            ).data
+        self.assertEqual(len(queries), 1)
+        self.assertNotIn("todo_app_tag", queries[0]["sql"])
+
+    def test_empty(self):
+        with CaptureQueriesContext(connection) as queries:
+            self.assertEqual(TodoItemReadSerializer([], many=True).data, [])
+        self.assertEqual(len(queries), 0)
@@ -0,0 +1,205 @@
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.db import NotSupportedError, connection, transaction
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APIClient
+from todo_app.models import Tag, TodoCounter, TodoItem
+from todo_app.services import bulk_update_status, insert_todos, mark_overdue
+from todo_app.stats import install_counters, recount, stored_counts, todo_stats
+from io import StringIO
+from unittest import mock
+import random
+
+
+class TodoCounterTest(TestCase):
+    def setUp(self):
+        if connection.vendor != "sqlite":
+            self.skipTest("The counters are kept by SQLite triggers.")
+        self.work = Tag.objects.create(name="Work")
+        self.home = Tag.objects.create(name="Home")
+
+    def create(self, status="OPEN", **kwargs):
+        return TodoItem.objects.create(
+            title="Count me", description="Stats.", status=status, **kwargs
+        )
+
+    def assertCounts(self, expected):
+        self.assertEqual(stored_counts(), expected)
+        self.assertEqual(recount(), expected)
+
+    def test_counters_follow_every_write_path(self):
+        todo = self.create()
+        todo.tags.add(self.work, self.home)
+        self.assertCounts(
+            {
+                ("status", "OPEN"): 1,
+                ("tag", str(self.work.id)): 1,
+                ("tag", str(self.home.id)): 1,
+            }
+        )
+
+        todo.status = "WORKING"
+        todo.save()
+        todo.tags.remove(self.home)
+        self.assertCounts({("status", "WORKING"): 1, ("tag", str(self.work.id)): 1})
+
+        TodoItem.objects.bulk_create(
+            TodoItem(title=f"Bulk {i}", description="Stats.") for i in range(3)
+        )
+        insert_todos(
+            [{"title": "Inserted", "description": "Stats.", "tags": [{"name": "Home"}]}]
+        )
+        bulk_update_status(TodoItem.objects.filter(title="Bulk 0"), "COMPLETED")
+        self.assertCounts(
+            {
+                ("status", "WORKING"): 1,
+                ("status", "OPEN"): 3,
+                ("status", "COMPLETED"): 1,
+                ("tag", str(self.work.id)): 1,
+                ("tag", str(self.home.id)): 1,
+            }
+        )
+
+        self.work.delete()
+        TodoItem.objects.filter(status="OPEN").delete()
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "UPDATE todo_app_todoitem SET status = 'CANCELLED' WHERE id = %s",
+                [todo.pk],
+            )
+        self.assertCounts({("status", "CANCELLED"): 1, ("status", "COMPLETED"): 1})
+
+    def test_mark_overdue_moves_counts(self):
+        past = timezone.now() - timezone.timedelta(days=1)
+        TodoItem.objects.bulk_create(
+            TodoItem(title="Late", description="Stats.", due_date=past)
+            for _ in range(2)
+        )
+        mark_overdue()
+        self.assertCounts({("status", "OVERDUE"): 2})
+
+    def test_rolled_back_writes_leave_counters_alone(self):
+        self.create().tags.add(self.work)
+        before = stored_counts()
+        with self.assertRaises(RuntimeError):
+            with transaction.atomic():
+                self.create("COMPLETED").tags.add(self.home)
+                TodoItem.objects.update(status="CANCELLED")
+                raise RuntimeError
+        self.assertEqual(stored_counts(), before)
+
+    def test_counters_match_group_by_after_random_writes(self):
+        rng = random.Random(0)
+        statuses = [status for status, _ in TodoItem.STATUS_CHOICES]
+        tags = [self.work, self.home] + [
+            Tag.objects.create(name=f"Tag {i}") for i in range(4)
+        ]
+        todos = []
+        for _ in range(300):
+            action = rng.random()
+            if action < 0.4 or not todos:
+                todos.append(self.create(rng.choice(statuses)))
+            elif action < 0.6:
+                todo = rng.choice(todos)
+                todo.status = rng.choice(statuses)
+                todo.save()
+            elif action < 0.75:
+                rng.choice(todos).tags.add(*rng.sample(tags, 2))
+            elif action < 0.85:
+                rng.choice(todos).tags.remove(rng.choice(tags))
+            elif action < 0.95:
+                ids = [todo.pk for todo in rng.sample(todos, min(5, len(todos)))]
+                TodoItem.objects.filter(pk__in=ids).update(status=rng.choice(statuses))
+            else:
+                todos.remove(todo := rng.choice(todos))
+                todo.delete()
+        self.assertTrue(stored_counts())
+        self.assertEqual(stored_counts(), recount())
+
+    def test_install_recounts_after_dropped_triggers(self):
+        self.create()
+        self.assertFalse(install_counters(connection))
+        with connection.cursor() as cursor:
+            cursor.execute("DROP TRIGGER todo_app_todocounter_todo_ai")
+        self.create("COMPLETED")
+        self.assertNotEqual(stored_counts(), recount())
+        self.assertTrue(install_counters(connection))
+        self.assertCounts({("status", "OPEN"): 1, ("status", "COMPLETED"): 1})
+
+    def test_rebuild_command(self):
+        self.create().tags.add(self.work)
+        self.create()
+        TodoCounter.objects.filter(kind="status").update(count=7)
+        TodoCounter.objects.create(kind="status", value="CANCELLED", count=1)
+        out = StringIO()
+        call_command("rebuild_todo_stats", stdout=out)
+        self.assertRegex(
+            out.getvalue(),
+            r"Rebuilt 2 todo counters; 2 had drifted \(\d+\.\d+s\)",
+        )
+        self.assertCounts({("status", "OPEN"): 2, ("tag", str(self.work.id)): 1})
+
+
+class TodoItemStatsViewTest(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(
+            User.objects.create_user(username="testuser", password="testpass")
+        )
+        self.url = reverse("todo-stats")
+        work = Tag.objects.create(name="Work")
+        home = Tag.objects.create(name="Home")
+        Tag.objects.create(name="Unused")
+        self.work_id, self.home_id = work.id, home.id
+        for status, tags in [
+            ("OPEN", [work, home]),
+            ("OPEN", [home]),
+            ("OVERDUE", [home]),
+            ("COMPLETED", []),
+        ]:
+            todo = TodoItem.objects.create(
+                title="Count me", description="Stats.", status=status
+            )
+            todo.tags.add(*tags)
+
+    def test_stats(self):
+        with self.assertNumQueries(2):
+            response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            response.data,
+            {
+                "total": 4,
+                "overdue": 1,
+                "by_status": {
+                    "OPEN": 2,
+                    "WORKING": 0,
+                    "PENDING REVIEW": 0,
+                    "COMPLETED": 1,
+                    "OVERDUE": 1,
+                    "CANCELLED": 0,
+                },
+                "by_tag": [
+                    {"id": self.home_id, "name": "Home", "count": 3},
+                    {"id": self.work_id, "name": "Work", "count": 1},
+                ],
+            },
+        )
+
+    def test_requires_authentication(self):
+        response = APIClient().get(self.url)
+        self.assertEqual(response.status_code, 401)
+
+    def test_other_backends_fail_instead_of_recounting(self):
+        with mock.patch("todo_app.stats.counters_supported", return_value=False):
+            with self.assertNumQueries(0):
+                with self.assertRaises(NotSupportedError):
+                    todo_stats()
+
+    def test_other_backends_get_501(self):
+        with mock.patch.object(connection, "vendor", "postgresql"):
+            response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 501)
+        self.assertEqual(response.data["detail"].code, "backend_not_supported")
@@ -1,10 +1,20 @@
-from django.test import TestCase
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.db import connection
 from rest_framework.test import APIClient
 from django.urls import reverse
 from django.utils import timezone
-from todo_app.models import TodoItem, Tag
+from django.utils.http import http_date
+from todo_app.changes import encode_cursor
+from todo_app.models import TodoItem, TodoItemTombstone, Tag
 from django.contrib.auth.models import User
+from todo_app.authentication import credential_cache
 import base64
+import csv
+import io
+import json
+import time
+from unittest import mock
 
 
 class TodoItemAPITest(TestCase):
@@ -37,7 +47,7 @@ class TodoItemAPITest(TestCase):
         url = reverse("todo-list-create")
         response = self.client.get(url, **self.auth_headers)
         self.assertEqual(response.status_code, 200)
-        self.assertEqual(len(response.data), 1)
+        self.assertEqual(len(response.data["results"]), 1)
 
     def test_create_todo_item(self):
         data = {
@@ -95,3 +105,669 @@ class TodoItemAPITest(TestCase):
         self.client.logout()
         response = self.client.get(reverse("todo-list-create"))
         self.assertEqual(response.status_code, 401)
+
+
+class TodoItemQueryCountTest(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(
+            User.objects.create_user(username="testuser", password="testpass")
+        )
+        self.tags = Tag.objects.bulk_create([Tag(name=f"Tag{i}") for i in range(5)])
+
+    def seed(self, count):
+        """Bring the table up to ``count`` items, each with two tags."""
+        existing = TodoItem.objects.count()
+        todos = TodoItem.objects.bulk_create(
+            TodoItem(title=f"Todo {i}", description="Seeded.")
+            for i in range(existing, count)
+        )
+        Through = TodoItem.tags.through
+        Through.objects.bulk_create(
+            Through(todoitem_id=todo.id, tag_id=tag.id)
+            for i, todo in enumerate(todos)
+            for tag in (self.tags[i % 5], self.tags[(i + 1) % 5])
+        )
+        TodoItem.objects.filter(pk__in=[todo.pk for todo in todos]).refresh_tag_lists()
+
+    def list_query_count(self):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(reverse("todo-list-create"))
+        self.assertEqual(response.status_code, 200)
+        return len(queries)
+
+    def test_list_query_count_is_constant(self):
+        self.seed(10)
+        small = self.list_query_count()
+        self.seed(10_000)
+        large = self.list_query_count()
+        self.assertEqual(small, large)
+        # ETag validators and the page of todos, tags included.
+        self.assertEqual(large, 2)
+
+    def test_detail_reads_tags_without_a_join(self):
+        self.seed(1)
+        todo = TodoItem.objects.get()
+        # ETag validators and the todo, tags included.
+        with self.assertNumQueries(2):
+            response = self.client.get(reverse("todo-detail", args=[todo.id]))
+        self.assertEqual(len(response.data["tags"]), 2)
+
+
+class TodoItemPaginationTest(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(
+            User.objects.create_user(username="testuser", password="testpass")
+        )
+        now = timezone.now()
+        # Pairs of items share a timestamp so the id tie-breaker is exercised.
+        self.todos = TodoItem.objects.bulk_create(
+            TodoItem(title=f"Todo {i}", description="Seeded.") for i in range(7)
+        )
+        for i, todo in enumerate(self.todos):
+            todo.timestamp = now + timezone.timedelta(seconds=i // 2)
+        TodoItem.objects.bulk_update(self.todos, ["timestamp"])
+
+    def get_page(self, url, **params):
+        response = self.client.get(url, params)
+        self.assertEqual(response.status_code, 200)
+        return response.data
+
+    def test_pages_walk_forward_and_back(self):
+        url = reverse("todo-list-create")
+        first = self.get_page(url, page_size=3)
+        self.assertIsNone(first["previous"])
+        second = self.get_page(first["next"])
+        third = self.get_page(second["next"])
+        self.assertIsNone(third["next"])
+
+        pages = [first, second, third]
+        ids = [item["id"] for page in pages for item in page["results"]]
+        self.assertEqual(ids, [todo.id for todo in self.todos])
+
+        back = self.get_page(third["previous"])
+        self.assertEqual(back["results"], second["results"])
+        back = self.get_page(back["previous"])
+        self.assertEqual(back["results"], first["results"])
+        self.assertIsNone(back["previous"])
+
+    def test_page_size_is_capped(self):
+        response = self.client.get(reverse("todo-list-create"), {"page_size": 10**6})
+        self.assertEqual(len(response.data["results"]), 7)
+
+    def test_invalid_cursor(self):
+        response = self.client.get(reverse("todo-list-create"), {"cursor": "nope"})
+        self.assertEqual(response.status_code, 404)
+
+    def test_cursor_values_must_be_scalars(self):
+        for params in [{}, {"q": "Todo"}]:
+            for value in [None, {"a": 1}, [1, 2], "soon"]:
+                payload = json.dumps({"k": [value, self.todos[0].id]})
+                cursor = base64.urlsafe_b64encode(payload.encode()).decode()
+                with self.subTest(value=value, **params):
+                    response = self.client.get(
+                        reverse("todo-list-create"), {"cursor": cursor, **params}
+                    )
+                    self.assertEqual(response.status_code, 404)
+
+    def test_search_cursor(self):
+        first = self.get_page(reverse("todo-list-create"), q="Todo", page_size=3)
+        second = self.get_page(first["next"])
+        ids = [item["id"] for page in [first, second] for item in page["results"]]
+        self.assertEqual(len(set(ids)), 6)
+
+    def test_page_query_seeks_index_without_offset_or_count(self):
+        first = self.get_page(reverse("todo-list-create"), page_size=2)
+        with CaptureQueriesContext(connection) as queries:
+            self.client.get(first["next"])
+        for query in queries:
+            self.assertNotIn("OFFSET", query["sql"])
+            self.assertNotIn("COUNT", query["sql"].upper())
+        sql = next(q["sql"] for q in queries if "LIMIT 3" in q["sql"])
+
+        if connection.vendor == "sqlite":
+            with connection.cursor() as cursor:
+                cursor.execute(f"EXPLAIN QUERY PLAN {sql}")
+                plan = " ".join(row[-1] for row in cursor.fetchall())
+            self.assertIn("USING INDEX todo_timestamp_id_idx (timestamp>?)", plan)
+
+
+class TodoItemBulkCreateViewTest(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(
+            User.objects.create_user(username="testuser", password="testpass")
+        )
+        self.url = reverse("todo-bulk-create")
+
+    def payload(self, count, **extra):
+        return [
+            {
+                "title": f"Bulk {i}",
+                "description": "Created in bulk.",
+                "tags": [{"name": "Bulk"}, {"name": f"Tag{i % 3}"}],
+                **extra,
+            }
+            for i in range(count)
+        ]
+
+    def test_bulk_create(self):
+        response = self.client.post(self.url, self.payload(3), format="json")
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(response.data["created"], 3)
+        self.assertEqual(
+            [result["data"]["title"] for result in response.data["results"]],
+            ["Bulk 0", "Bulk 1", "Bulk 2"],
+        )
+        self.assertEqual(TodoItem.objects.count(), 3)
+        self.assertEqual(Tag.objects.filter(name="Bulk").count(), 1)
+        self.assertEqual(TodoItem.objects.filter(tags__name="Bulk").count(), 3)
+
+    def test_partial_failure_reports_per_item_errors(self):
+        items = self.payload(3)
+        items[1]["status"] = "INVALID_STATUS"
+        response = self.client.post(self.url, items, format="json")
+        self.assertEqual(response.status_code, 207)
+        self.assertEqual(response.data["created"], 2)
+        statuses = [result["status"] for result in response.data["results"]]
+        self.assertEqual(statuses, [201, 400, 201])
+        self.assertIn("status", response.data["results"][1]["errors"])
+        self.assertEqual(TodoItem.objects.count(), 2)
+
+    def test_all_invalid(self):
+        past = (timezone.now() - timezone.timedelta(days=1)).isoformat()
+        response = self.client.post(
+            self.url, self.payload(2, due_date=past), format="json"
+        )
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.data["created"], 0)
+        self.assertFalse(TodoItem.objects.exists())
+
+    def test_rejects_non_list_and_oversized_payloads(self):
+        response = self.client.post(self.url, {"title": "x"}, format="json")
+        self.assertEqual(response.status_code, 400)
+        with self.settings(TODO_BULK_MAX_ITEMS=2):
+            response = self.client.post(self.url, self.payload(3), format="json")
+        self.assertEqual(response.status_code, 400)
+        self.assertFalse(TodoItem.objects.exists())
+
+    def test_query_count_does_not_depend_on_item_count(self):
+        Tag.objects.bulk_create(
+            [Tag(name=name) for name in ("Bulk", "Tag0", "Tag1", "Tag2")]
+        )
+        counts = []
+        for size in (5, 50):
+            with CaptureQueriesContext(connection) as queries:
+                self.client.post(self.url, self.payload(size), format="json")
+            counts.append(len(queries))
+        self.assertEqual(counts[0], counts[1])
+
+
+class TodoItemBulkStatusViewTest(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(
+            User.objects.create_user(username="testuser", password="testpass")
+        )
+        self.url = reverse("todo-bulk-status")
+        self.todos = TodoItem.objects.bulk_create(
+            TodoItem(title=f"Todo {i}", description="Seeded.", status=status)
+            for i, status in enumerate(["WORKING", "WORKING", "OPEN", "COMPLETED"])
+        )
+
+    def statuses(self):
+        return list(TodoItem.objects.order_by("id").values_list("status", flat=True))
+
+    def test_transition_by_status_is_one_update(self):
+        data = {"from_status": ["WORKING"], "status": "COMPLETED"}
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.post(self.url, data, format="json")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data, {"updated": 2})
+        self.assertEqual(
+            [q["sql"].split()[0] for q in queries if "todoitem" in q["sql"]],
+            ["UPDATE"],
+        )
+        self.assertEqual(
+            self.statuses(), ["COMPLETED", "COMPLETED", "OPEN", "COMPLETED"]
+        )
+
+    def test_transition_by_ids_returns_affected_ids(self):
+        data = {
+            "ids": [todo.id for todo in self.todos],
+            "status": "CANCELLED",
+            "return_ids": True,
+        }
+        response = self.client.post(self.url, data, format="json")
+        self.assertEqual(response.data["updated"], 4)
+        self.assertEqual(response.data["ids"], [todo.id for todo in self.todos])
+        self.assertEqual(self.statuses(), ["CANCELLED"] * 4)
+
+    def test_ids_and_status_combine_and_skip_unchanged_rows(self):
+        data = {
+            "ids": [self.todos[0].id, self.todos[2].id, self.todos[3].id],
+            "from_status": ["WORKING", "COMPLETED"],
+            "status": "COMPLETED",
+            "return_ids": True,
+        }
+        response = self.client.post(self.url, data, format="json")
+        self.assertEqual(response.data, {"updated": 1, "ids": [self.todos[0].id]})
+
+    def test_requires_selection_and_valid_status(self):
+        response = self.client.post(self.url, {"status": "OPEN"}, format="json")
+        self.assertEqual(response.status_code, 400)
+        response = self.client.post(
+            self.url, {"ids": [self.todos[0].id], "status": "DONE"}, format="json"
+        )
+        self.assertEqual(response.status_code, 400)
+        self.assertIn("status", response.data)
+        self.assertEqual(self.statuses()[0], "WORKING")
+
+
+class TodoItemFilterTest(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(
+            User.objects.create_user(username="testuser", password="testpass")
+        )
+        self.url = reverse("todo-list-create")
+        now = timezone.now()
+        work, home = Tag.objects.bulk_create([Tag(name="Work"), Tag(name="Home")])
+        self.todos = {}
+        for title, status, days, tags in [
+            ("report", "OPEN", 1, [work]),
+            ("laundry", "OPEN", 5, [home]),
+            ("taxes", "WORKING", 2, [work, home]),
+            ("archive", "COMPLETED", None, []),
+        ]:
+            todo = TodoItem.objects.create(
+                title=title,
+                description="Filter test.",
+                status=status,
+                due_date=now + timezone.timedelta(days=days) if days else None,
+            )
+            todo.tags.set(tags)
+            self.todos[title] = todo
+        self.now = now
+
+    def titles(self, **params):
+        response = self.client.get(self.url, params)
+        self.assertEqual(response.status_code, 200, response.data)
+        return sorted(item["title"] for item in response.data["results"])
+
+    def test_filter_by_status(self):
+        self.assertEqual(self.titles(status="OPEN"), ["laundry", "report"])
+        self.assertEqual(self.titles(status="WORKING,COMPLETED"), ["archive", "taxes"])
+        response = self.client.get(self.url, {"status": ["OPEN", "WORKING"]})
+        self.assertEqual(len(response.data["results"]), 3)
+
+    def test_filter_by_tags(self):
+        self.assertEqual(self.titles(tag="Work,Home"), ["laundry", "report", "taxes"])
+        self.assertEqual(self.titles(tag="Work,Home", tag_match="all"), ["taxes"])
+        self.assertEqual(self.titles(tag="Missing"), [])
+
+    def test_filter_by_date_ranges(self):
+        due_before = (self.now + timezone.timedelta(days=3)).isoformat()
+        self.assertEqual(self.titles(due_before=due_before), ["report", "taxes"])
+        self.assertEqual(self.titles(due_before=due_before, status="OPEN"), ["report"])
+        self.assertEqual(self.titles(due_after=due_before), ["laundry"])
+        created_after = (self.now + timezone.timedelta(days=1)).isoformat()
+        self.assertEqual(self.titles(created_after=created_after), [])
+
+    def test_invalid_parameters(self):
+        response = self.client.get(
+            self.url, {"status": "DONE", "due_before": "soon", "tag_match": "x"}
+        )
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(set(response.data), {"status", "due_before"})
+        response = self.client.get(self.url, {"tag": "Work", "tag_match": "x"})
+        self.assertIn("tag_match", response.data)
+
+    def query_plan(self, **params):
+        with CaptureQueriesContext(connection) as queries:
+            self.client.get(self.url, params)
+        page_query = next(q["sql"] for q in queries if "LIMIT 51" in q["sql"])
+        with connection.cursor() as cursor:
+            cursor.execute(f"EXPLAIN QUERY PLAN {page_query}")
+            return " ".join(row[-1] for row in cursor.fetchall())
+
+    def test_filters_use_indexes(self):
+        if connection.vendor != "sqlite":
+            self.skipTest("Query plans are checked on SQLite.")
+        due_before = (self.now + timezone.timedelta(days=3)).isoformat()
+        self.assertIn(
+            "USING INDEX todo_status_due_idx (status=? AND due_date<?)",
+            self.query_plan(status="OPEN", due_before=due_before),
+        )
+        self.assertIn(
+            "USING INDEX todo_status_due_idx (status=?)",
+            self.query_plan(status="OPEN"),
+        )
+        self.assertIn(
+            "USING INDEX todo_due_date_idx (due_date>? AND due_date<?)",
+            self.query_plan(due_after=self.now.isoformat(), due_before=due_before),
+        )
+        self.assertNotIn("SCAN todo_app_todoitem_tags", self.query_plan(tag="Work"))
+
+
+class TodoItemConditionalGetTest(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(
+            User.objects.create_user(username="testuser", password="testpass")
+        )
+        self.tag = Tag.objects.create(name="Work")
+        self.todo = TodoItem.objects.create(title="Poll me", description="ETag.")
+        self.todo.tags.add(self.tag)
+        self.list_url = reverse("todo-list-create")
+        self.detail_url = reverse("todo-detail", args=[self.todo.id])
+
+    def assertNotModified(self, url, etag, queries=1):
+        with self.assertNumQueries(queries):
+            response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response["ETag"], etag)
+        self.assertEqual(response.content, b"")
+
+    def assertModified(self, url, etag):
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response["ETag"], etag)
+        return response["ETag"]
+
+    def test_detail_etag(self):
+        response = self.client.get(self.detail_url)
+        etag = response["ETag"]
+        self.assertTrue(etag.startswith('"'))
+        self.assertNotIn("Last-Modified", response)
+        self.assertNotModified(self.detail_url, etag)
+
+        self.client.patch(self.detail_url, {"status": "WORKING"}, format="json")
+        etag = self.assertModified(self.detail_url, etag)
+        self.tag.name = "Office"
+        self.tag.save()
+        etag = self.assertModified(self.detail_url, etag)
+        self.todo.tags.remove(self.tag)
+        self.assertModified(self.detail_url, etag)
+
+    def test_list_etag_follows_writes(self):
+        etag = self.client.get(self.list_url)["ETag"]
+        self.assertNotModified(self.list_url, etag)
+
+        other = TodoItem.objects.create(title="Other", description="ETag.")
+        etag = self.assertModified(self.list_url, etag)
+        self.client.post(
+            reverse("todo-bulk-status"),
+            {"ids": [other.id], "status": "COMPLETED"},
+            format="json",
+        )
+        etag = self.assertModified(self.list_url, etag)
+        other.delete()
+        self.assertModified(self.list_url, etag)
+
+    def test_list_etag_sees_late_commits(self):
+        """A write that commits after a later one, with an older
+        ``updated_at``, leaves the newest timestamp alone but must still
+        change the ETag."""
+        etag = self.client.get(self.list_url)["ETag"]
+        older = self.todo.updated_at - timezone.timedelta(minutes=5)
+        (late,) = TodoItem.objects.bulk_create(
+            [TodoItem(title="Late", description="ETag.")]
+        )
+        TodoItem.objects.filter(pk=late.pk).update(updated_at=older, timestamp=older)
+        etag = self.assertModified(self.list_url, etag)
+        TodoItem.objects.filter(pk=late.pk).update(status="WORKING", updated_at=older)
+        self.assertModified(self.list_url, etag)
+
+    @override_settings(TODO_QUERY_BUDGET_STRICT=True, TODO_LIST_CACHE_ALIAS=None)
+    def test_empty_list_validators_are_one_query(self):
+        TodoItem.objects.all().delete()
+        TodoItemTombstone.objects.all().delete()
+        credential_cache.clear()
+        credentials = base64.b64encode(b"testuser:testpass").decode()
+        client = APIClient(HTTP_AUTHORIZATION=f"Basic {credentials}")
+        # Authentication, the validators and the empty page.
+        with self.assertNumQueries(3):
+            response = client.get(self.list_url)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data["results"], [])
+        # Authentication and the validators.
+        with self.assertNumQueries(2):
+            response = client.get(self.list_url, HTTP_IF_NONE_MATCH=response["ETag"])
+        self.assertEqual(response.status_code, 304)
+
+    def test_list_etag_depends_on_query(self):
+        etag = self.client.get(self.list_url)["ETag"]
+        response = self.client.get(
+            self.list_url, {"status": "OPEN"}, HTTP_IF_NONE_MATCH=etag
+        )
+        self.assertEqual(response.status_code, 200)
+
+    def test_if_modified_since(self):
+        """A write in the same second as the last GET is never hidden
+        behind a 304: only the ETag validates."""
+        last_modified = http_date(time.time() + 60)
+        self.client.patch(self.detail_url, {"status": "WORKING"}, format="json")
+        for url in [self.detail_url, self.list_url]:
+            response = self.client.get(url, HTTP_IF_MODIFIED_SINCE=last_modified)
+            self.assertEqual(response.status_code, 200)
+            self.assertNotIn("Last-Modified", response)
+
+    def test_missing_item_is_still_404(self):
+        response = self.client.get(
+            reverse("todo-detail", args=[self.todo.id + 1]), HTTP_IF_NONE_MATCH="*"
+        )
+        self.assertEqual(response.status_code, 404)
+
+
+class TodoItemChangesViewTest(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(
+            User.objects.create_user(username="testuser", password="testpass")
+        )
+        self.url = reverse("todo-changes")
+        self.todos = [
+            TodoItem.objects.create(title=f"Todo {i}", description="Sync.")
+            for i in range(3)
+        ]
+
+    def sync(self, cursor=None, **params):
+        if cursor:
+            params["since"] = cursor
+        response = self.client.get(self.url, params)
+        self.assertEqual(response.status_code, 200)
+        return response.data
+
+    def test_initial_sync_then_incremental_changes(self):
+        first = self.sync()
+        self.assertEqual(
+            [item["title"] for item in first["updated"]],
+            ["Todo 0", "Todo 1", "Todo 2"],
+        )
+        self.assertEqual(first["deleted"], [])
+        self.assertFalse(first["has_more"])
+
+        nothing = self.sync(first["cursor"])
+        self.assertEqual((nothing["updated"], nothing["deleted"]), ([], []))
+
+        self.client.patch(
+            reverse("todo-detail", args=[self.todos[1].id]), {"title": "Changed"}
+        )
+        self.client.delete(reverse("todo-detail", args=[self.todos[0].id]))
+        created = TodoItem.objects.create(title="New", description="Sync.")
+        changes = self.sync(nothing["cursor"])
+        self.assertEqual(
+            [item["id"] for item in changes["updated"]],
+            [self.todos[1].id, created.id],
+        )
+        self.assertEqual(changes["updated"][0]["title"], "Changed")
+        self.assertEqual(changes["deleted"], [self.todos[0].id])
+
+    def test_bulk_writes_appear_in_feed(self):
+        cursor = self.sync()["cursor"]
+        self.client.post(
+            reverse("todo-bulk-status"),
+            {"ids": [self.todos[2].id], "status": "COMPLETED"},
+            format="json",
+        )
+        TodoItem.objects.filter(pk=self.todos[1].pk).delete()
+        changes = self.sync(cursor)
+        self.assertEqual(
+            [item["id"] for item in changes["updated"]], [self.todos[2].id]
+        )
+        self.assertEqual(changes["deleted"], [self.todos[1].id])
+
+    def test_limit_pages_through_changes(self):
+        first = self.sync(limit=2)
+        self.assertTrue(first["has_more"])
+        second = self.sync(first["cursor"], limit=2)
+        self.assertFalse(second["has_more"])
+        ids = [item["id"] for item in first["updated"] + second["updated"]]
+        self.assertEqual(ids, [todo.id for todo in self.todos])
+
+    def test_late_commit_with_an_early_timestamp_is_not_skipped(self):
+        """A long transaction stamps ``updated_at`` early but commits after
+        a cursor has moved past that time; the feed still returns it."""
+        cursor = self.sync()["cursor"]
+        TodoItem.objects.create(title="Meanwhile", description="Sync.")
+        cursor = self.sync(cursor)["cursor"]
+        long_ago = timezone.now() - timezone.timedelta(hours=1)
+        TodoItem.objects.filter(pk=self.todos[0].pk).update(
+            title="Slow", updated_at=long_ago
+        )
+        changes = self.sync(cursor)
+        self.assertEqual([item["title"] for item in changes["updated"]], ["Slow"])
+
+    def test_pages_interleave_updates_and_deletions(self):
+        cursor = self.sync()["cursor"]
+        ids = [todo.id for todo in self.todos]
+        self.todos[0].delete()
+        TodoItem.objects.filter(pk=ids[1]).update(title="Changed")
+        self.todos[2].delete()
+        first = self.sync(cursor, limit=2)
+        self.assertTrue(first["has_more"])
+        self.assertEqual(first["deleted"], [ids[0]])
+        self.assertEqual([item["id"] for item in first["updated"]], [ids[1]])
+        second = self.sync(first["cursor"], limit=2)
+        self.assertFalse(second["has_more"])
+        self.assertEqual((second["updated"], second["deleted"]), ([], [ids[2]]))
+
+    def test_invalid_cursor(self):
+        response = self.client.get(self.url, {"since": "garbage"})
+        self.assertEqual(response.status_code, 404)
+
+    def test_other_backends_get_501(self):
+        with mock.patch.object(connection, "vendor", "postgresql"):
+            response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 501)
+        self.assertEqual(response.data["detail"].code, "backend_not_supported")
+
+    def test_cursor_without_an_offset(self):
+        naive = base64.urlsafe_b64encode(
+            json.dumps({"c": 0, "s": "2026-01-01T00:00:00"}).encode()
+        ).decode()
+        response = self.client.get(self.url, {"since": naive})
+        self.assertEqual(response.status_code, 404)
+
+    def test_cursor_older_than_tombstone_retention_needs_resync(self):
+        stale = encode_cursor(0, timezone.now() - timezone.timedelta(days=31))
+        response = self.client.get(self.url, {"since": stale})
+        self.assertEqual(response.status_code, 410)
+        self.assertEqual(response.data["detail"].code, "resync_required")
+        with self.settings(TODO_TOMBSTONE_RETENTION_DAYS=None):
+            self.sync(stale)
+
+        # A client that keeps polling stays inside the retention even when
+        # nothing changes.
+        cursor = self.sync()["cursor"]
+        with self.settings(TODO_TOMBSTONE_RETENTION_DAYS=0):
+            response = self.client.get(self.url, {"since": cursor})
+        self.assertEqual(response.status_code, 410)
+        self.sync(self.sync(cursor)["cursor"])
+
+    def test_time_positioned_cursor_needs_resync(self):
+        legacy = base64.urlsafe_b64encode(
+            json.dumps({"u": None, "d": None, "s": timezone.now().isoformat()}).encode()
+        ).decode()
+        response = self.client.get(self.url, {"since": legacy})
+        self.assertEqual(response.status_code, 410)
+
+    def test_feed_seeks_indexes(self):
+        if connection.vendor != "sqlite":
+            self.skipTest("Query plans are checked on SQLite.")
+        cursor = self.sync()["cursor"]
+        TodoItem.objects.filter(pk=self.todos[0].pk).delete()
+        with CaptureQueriesContext(connection) as queries:
+            self.sync(cursor)
+        plans = []
+        with connection.cursor() as db_cursor:
+            for query in queries:
+                if '"change_seq" >' in query["sql"]:
+                    db_cursor.execute(f"EXPLAIN QUERY PLAN {query['sql']}")
+                    plans.append(" ".join(row[-1] for row in db_cursor.fetchall()))
+        self.assertIn("USING INDEX todo_change_seq_idx", plans[0])
+        self.assertIn("USING INDEX todo_tombstone_change_seq_idx", plans[1])
+
+
+class TodoItemExportViewTest(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(
+            User.objects.create_user(username="testuser", password="testpass")
+        )
+        self.url = reverse("todo-export")
+        work, home = Tag.objects.create(name="Work"), Tag.objects.create(name="Home")
+        self.todos = [
+            TodoItem.objects.create(title=f"Todo {i}", description="Export.")
+            for i in range(5)
+        ]
+        self.todos[0].tags.add(home, work)
+        self.todos[3].status = "COMPLETED"
+        self.todos[3].save()
+
+    def export(self, **params):
+        response = self.client.get(self.url, params)
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.streaming)
+        return response, b"".join(response.streaming_content).decode()
+
+    def test_ndjson_matches_list_serializer(self):
+        response, body = self.export()
+        self.assertEqual(
+            response["Content-Type"], "application/x-ndjson; charset=utf-8"
+        )
+        rows = [json.loads(line) for line in body.splitlines()]
+        listed = self.client.get(reverse("todo-list-create")).json()["results"]
+        self.assertEqual(rows, listed)
+        self.assertEqual([tag["name"] for tag in rows[0]["tags"]], ["Work", "Home"])
+
+    def test_csv(self):
+        response, body = self.export(format="csv")
+        self.assertEqual(response["Content-Type"], "text/csv; charset=utf-8")
+        self.assertIn('filename="todos.csv"', response["Content-Disposition"])
+        rows = list(csv.DictReader(io.StringIO(body)))
+        self.assertEqual(len(rows), 5)
+        self.assertEqual(rows[0]["tags"], "Work|Home")
+        self.assertEqual(rows[0]["due_date"], "")
+        self.assertEqual(rows[1]["tags"], "")
+
+    def test_filters_apply(self):
+        _, body = self.export(status="COMPLETED")
+        self.assertEqual(
+            [json.loads(line)["id"] for line in body.splitlines()], [self.todos[3].id]
+        )
+
+    def test_tags_come_from_the_todo_rows(self):
+        with self.settings(TODO_EXPORT_CHUNK_SIZE=2):
+            with CaptureQueriesContext(connection) as queries:
+                _, body = self.export()
+        self.assertEqual(len(body.splitlines()), 5)
+        # One streaming SELECT for the todos; tag_list saves the tag join.
+        tag_queries = [q for q in queries if "todo_app_tag" in q["sql"]]
+        self.assertEqual(tag_queries, [])
+
+    def test_requires_authentication(self):
+        response = APIClient().get(self.url)
+        self.assertEqual(response.status_code, 401)
@@ -1,7 +1,42 @@
 from django.urls import path
-from .views import TodoItemListCreateView, TodoItemDetailView
+from .async_views import (
+    AsyncTodoItemDetailView,
+    AsyncTodoItemListCreateView,
+    TodoEventStreamView,
+)
+from .views import (
+    TodoItemListCreateView,
+    TodoItemDetailView,
+    TodoItemBulkCreateView,
+    TodoItemBulkStatusView,
+    TodoItemChangesView,
+    TodoItemExportView,
+    TodoItemStatsView,
+    MetricsView,
+)
 
 urlpatterns = [
     path("todos/", TodoItemListCreateView.as_view(), name="todo-list-create"),
+    path("todos/bulk/", TodoItemBulkCreateView.as_view(), name="todo-bulk-create"),
+    path(
+        "todos/bulk/status/",
+        TodoItemBulkStatusView.as_view(),
+        name="todo-bulk-status",
+    ),
+    path("todos/changes/", TodoItemChangesView.as_view(), name="todo-changes"),
+    path("todos/export/", TodoItemExportView.as_view(), name="todo-export"),
+    path("todos/stats/", TodoItemStatsView.as_view(), name="todo-stats"),
+    path("todos/events/", TodoEventStreamView.as_view(), name="todo-events"),
+    path("metrics/", MetricsView.as_view(), name="metrics"),
     path("todos/<int:pk>/", TodoItemDetailView.as_view(), name="todo-detail"),
+    path(
+        "async/todos/",
+        AsyncTodoItemListCreateView.as_view(),
+        name="async-todo-list-create",
+    ),
+    path(
+        "async/todos/<int:pk>/",
+        AsyncTodoItemDetailView.as_view(),
+        name="async-todo-detail",
+    ),
 ]
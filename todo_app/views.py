@@ -1,22 +1,361 @@
+from django.conf import settings
+from django.db import NotSupportedError
+from django.http import StreamingHttpResponse
 from django.shortcuts import render
-from rest_framework import generics, permissions, authentication
+from rest_framework import generics, permissions, serializers, status
+from rest_framework.exceptions import APIException, NotFound
+from rest_framework.response import Response
+from .authentication import CachedBasicAuthentication
 from .models import TodoItem
-from .serializers import TodoItemSerializer
+from .cache import list_cache
+from .changes import InvalidCursor, ResyncRequired, changes_since
+from .conditional import ConditionalGetMixin, detail_validators, list_validators
+from .export import WRITERS, iter_todos
+from .filters import TodoItemFilterBackend, TodoItemSearchBackend
+from .instrumentation import extend_query_budget
+from .metrics import registry
+from .pagination import TodoItemCursorPagination
+from .renderers import (
+    CSVRenderer,
+    FastJSONRenderer,
+    NDJSONRenderer,
+    PrometheusRenderer,
+)
+from .serializers import (
+    TodoItemSerializer,
+    TodoItemBulkStatusSerializer,
+    TodoItemReadSerializer,
+)
+from .services import (
+    DELETE_TODO_QUERIES,
+    TRANSACTION_QUERIES,
+    bulk_create_queries,
+    bulk_create_todos,
+    bulk_update_status,
+)
+from .stats import todo_stats
 
 
 def home(request):
     return render(request, "home.html")
 
 
-class TodoItemListCreateView(generics.ListCreateAPIView):
+class ReadSerializerMixin:
+    """Serve safe requests through ``read_serializer_class``.
+
+    The queryset is handed to the read serializer's ``select`` so it yields
+    the rows that serializer expects; writes keep ``serializer_class``. Set
+    ``read_serializer_class = None`` to serve reads with the regular
+    serializer.
+    """
+
+    read_serializer_class = None
+
+    def use_read_serializer(self):
+        return self.read_serializer_class is not None and self.request.method in (
+            "GET",
+            "HEAD",
+        )
+
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        if self.use_read_serializer():
+            return self.read_serializer_class.select(queryset)
+        return queryset
+
+    def get_serializer_class(self):
+        if self.use_read_serializer():
+            return self.read_serializer_class
+        return super().get_serializer_class()
+
+
+class TodoItemListCreateView(
+    ConditionalGetMixin, ReadSerializerMixin, generics.ListCreateAPIView
+):
+    queryset = TodoItem.objects.prefetch_related("tags")
+    serializer_class = TodoItemSerializer
+    read_serializer_class = TodoItemReadSerializer
+    pagination_class = TodoItemCursorPagination
+    filter_backends = [TodoItemFilterBackend, TodoItemSearchBackend]
+    authentication_classes = [CachedBasicAuthentication]
+    permission_classes = [permissions.IsAuthenticated]
+    # GET: authentication, the list validators and the page. POST:
+    # authentication, the create, and reading back the todo's tags.
+    query_budget = {
+        "GET": CachedBasicAuthentication.queries + 2,
+        "POST": CachedBasicAuthentication.queries
+        + TodoItemSerializer.create_queries
+        + 1,
+    }
+
+    def get_validators(self, request):
+        return list_validators(request)
+
+    def list(self, request, *args, **kwargs):
+        return self.conditional_response(request, self.cached_list, *args, **kwargs)
+
+    def cached_list(self, request, *args, **kwargs):
+        key = list_cache.make_key(request, self.etag)
+        if key is None:
+            return super().list(request, *args, **kwargs)
+        response = list_cache.get(key)
+        if response is not None:
+            response["X-Cache"] = "HIT"
+            return response
+        response = super().list(request, *args, **kwargs)
+        response["X-Cache"] = "MISS"
+        response.add_post_render_callback(
+            lambda rendered: list_cache.set(key, rendered)
+        )
+        return response
+
+
+class TodoItemDetailView(
+    ConditionalGetMixin, ReadSerializerMixin, generics.RetrieveUpdateDestroyAPIView
+):
+    queryset = TodoItem.objects.prefetch_related("tags")
+    serializer_class = TodoItemSerializer
+    read_serializer_class = TodoItemReadSerializer
+    authentication_classes = [CachedBasicAuthentication]
+    permission_classes = [permissions.IsAuthenticated]
+    # GET: authentication, the detail validators and the row. The others
+    # also load the todo and its tags first; PUT and PATCH read the tags
+    # back after the update.
+    query_budget = {
+        "GET": CachedBasicAuthentication.queries + 2,
+        "PUT": CachedBasicAuthentication.queries
+        + 2
+        + TodoItemSerializer.update_queries
+        + 1,
+        "DELETE": CachedBasicAuthentication.queries
+        + 2
+        + TRANSACTION_QUERIES
+        + DELETE_TODO_QUERIES,
+    }
+    query_budget["PATCH"] = query_budget["PUT"]
+
+    def get_validators(self, request):
+        pk = self.kwargs[self.lookup_url_kwarg or self.lookup_field]
+        return detail_validators(pk, request)
+
+    def retrieve(self, request, *args, **kwargs):
+        return self.conditional_response(request, super().retrieve, *args, **kwargs)
+
+
+class TodoItemBulkCreateView(generics.GenericAPIView):
+    """Create many todos from one JSON array.
+
+    Every item is validated with ``TodoItemSerializer``; the valid ones are
+    inserted together and the response lists a result per input item, in
+    order, with either the created todo or that item's errors.
+    """
+
     queryset = TodoItem.objects.all()
     serializer_class = TodoItemSerializer
-    authentication_classes = [authentication.BasicAuthentication]
+    authentication_classes = [CachedBasicAuthentication]
+    permission_classes = [permissions.IsAuthenticated]
+    # Authentication; the inserts are added once the payload is validated.
+    query_budget = CachedBasicAuthentication.queries
+
+    def post(self, request, *args, **kwargs):
+        items = request.data
+        max_items = getattr(settings, "TODO_BULK_MAX_ITEMS", 5000)
+        if not isinstance(items, list) or not items:
+            raise serializers.ValidationError(
+                {"detail": "Expected a non-empty list of todo items."}
+            )
+        if len(items) > max_items:
+            raise serializers.ValidationError(
+                {"detail": f"At most {max_items} todo items per request."}
+            )
+
+        serializer = self.get_serializer()
+        validated, errors = [], {}
+        for index, item in enumerate(items):
+            try:
+                validated.append(serializer.run_validation(item))
+            except serializers.ValidationError as exc:
+                errors[index] = exc.detail
+
+        links = sum(len(item.get("tags", [])) for item in validated)
+        extend_query_budget(request, bulk_create_queries(len(validated), links))
+        created = iter(bulk_create_todos(validated))
+        results = []
+        for index in range(len(items)):
+            if index in errors:
+                results.append({"status": 400, "errors": errors[index]})
+            else:
+                data = self.get_serializer(next(created)).data
+                results.append({"status": 201, "data": data})
+
+        if not errors:
+            response_status = status.HTTP_201_CREATED
+        elif len(errors) == len(items):
+            response_status = status.HTTP_400_BAD_REQUEST
+        else:
+            response_status = status.HTTP_207_MULTI_STATUS
+        return Response(
+            {"created": len(items) - len(errors), "results": results},
+            status=response_status,
+        )
+
+
+class TodoItemBulkStatusView(generics.GenericAPIView):
+    """Move a set of todos to a new status with a single UPDATE.
+
+    Todos are selected by ``ids``, by their current status (``from_status``)
+    or by both. The response holds the number of todos that changed and,
+    when ``return_ids`` is set, their ids.
+    """
+
+    queryset = TodoItem.objects.all()
+    serializer_class = TodoItemBulkStatusSerializer
+    authentication_classes = [CachedBasicAuthentication]
     permission_classes = [permissions.IsAuthenticated]
+    # Authentication, then the ids (with return_ids) and the UPDATE in one
+    # transaction.
+    query_budget = CachedBasicAuthentication.queries + TRANSACTION_QUERIES + 2
+
+    def post(self, request, *args, **kwargs):
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        params = serializer.validated_data
+
+        queryset = self.get_queryset()
+        if "ids" in params:
+            queryset = queryset.filter(pk__in=params["ids"])
+        if "from_status" in params:
+            queryset = queryset.filter(status__in=params["from_status"])
+
+        count, ids = bulk_update_status(
+            queryset, params["status"], return_ids=params["return_ids"]
+        )
+        data = {"updated": count}
+        if ids is not None:
+            data["ids"] = ids
+        return Response(data)
+
+
+class CursorExpired(APIException):
+    status_code = status.HTTP_410_GONE
+    default_detail = "Cursor is older than the tombstone retention; resync without it."
+    default_code = "resync_required"
+
 
+class BackendNotSupported(APIException):
+    status_code = status.HTTP_501_NOT_IMPLEMENTED
+    default_detail = "Not available on this database backend."
+    default_code = "backend_not_supported"
+
+
+class TodoItemChangesView(generics.GenericAPIView):
+    """Todos created, updated or deleted since a sync cursor.
+
+    Call without ``since`` for a first full sync, then pass back the
+    returned ``cursor`` each time; keep calling while ``has_more`` is true.
+    ``updated`` holds full todos to upsert, ``deleted`` the ids to drop. A
+    cursor older than the tombstone retention gets 410 Gone; backends
+    without the change triggers get 501.
+    """
 
-class TodoItemDetailView(generics.RetrieveUpdateDestroyAPIView):
     queryset = TodoItem.objects.all()
     serializer_class = TodoItemSerializer
-    authentication_classes = [authentication.BasicAuthentication]
+    authentication_classes = [CachedBasicAuthentication]
+    permission_classes = [permissions.IsAuthenticated]
+    # Authentication, the list version, the updated todos, their tags and
+    # the tombstones.
+    query_budget = CachedBasicAuthentication.queries + 4
+    page_size = 500
+    max_page_size = 1000
+
+    def get(self, request, *args, **kwargs):
+        try:
+            limit = int(request.query_params.get("limit", self.page_size))
+        except ValueError:
+            limit = self.page_size
+        limit = min(max(limit, 1), self.max_page_size)
+        try:
+            updated, deleted, cursor, has_more = changes_since(
+                request.query_params.get("since"), limit=limit
+            )
+        except ResyncRequired:
+            raise CursorExpired()
+        except InvalidCursor:
+            raise NotFound("Invalid cursor")
+        except NotSupportedError as exc:
+            raise BackendNotSupported(str(exc))
+        return Response(
+            {
+                "updated": self.get_serializer(updated, many=True).data,
+                "deleted": deleted,
+                "cursor": cursor,
+                "has_more": has_more,
+            }
+        )
+
+
+class TodoItemExportView(generics.GenericAPIView):
+    """Stream every todo, with its tags, as NDJSON (default), CSV or one
+    JSON array.
+
+    Pick the format with ``?format=ndjson|csv|json`` or the Accept header. The
+    list filters apply. Rows are written as they are read, so memory use
+    does not grow with the number of todos.
+    """
+
+    queryset = TodoItem.objects.all()
+    filter_backends = [TodoItemFilterBackend]
+    renderer_classes = [NDJSONRenderer, CSVRenderer, FastJSONRenderer]
+    authentication_classes = [CachedBasicAuthentication]
     permission_classes = [permissions.IsAuthenticated]
+    # Rows are read once the stream has started, after the budget is checked.
+    query_budget = CachedBasicAuthentication.queries
+
+    def get(self, request, *args, **kwargs):
+        queryset = self.filter_queryset(self.get_queryset())
+        renderer = request.accepted_renderer
+        response = StreamingHttpResponse(
+            WRITERS[renderer.format](iter_todos(queryset)),
+            content_type=(
+                f"{renderer.media_type}; charset={renderer.charset or 'utf-8'}"
+            ),
+        )
+        response["Content-Disposition"] = (
+            f'attachment; filename="todos.{renderer.format}"'
+        )
+        return response
+
+
+class TodoItemStatsView(generics.GenericAPIView):
+    """Todo counts: in total, overdue, per status and per tag.
+
+    Served from the ``TodoCounter`` table, which the database keeps up to
+    date on every write, so the cost does not grow with the number of todos.
+    Tags are ordered by count, most used first.
+    """
+
+    authentication_classes = [CachedBasicAuthentication]
+    permission_classes = [permissions.IsAuthenticated]
+    # Authentication, the counters and the tag names.
+    query_budget = CachedBasicAuthentication.queries + 2
+
+    def get(self, request, *args, **kwargs):
+        try:
+            return Response(todo_stats())
+        except NotSupportedError as exc:
+            raise BackendNotSupported(str(exc))
+
+
+class MetricsView(generics.GenericAPIView):
+    """Request, latency, query and cache metrics in Prometheus text format,
+    summed over the worker processes sharing ``TODO_METRICS_DIR``."""
+
+    renderer_classes = [PrometheusRenderer]
+    authentication_classes = [CachedBasicAuthentication]
+    permission_classes = [permissions.IsAuthenticated]
+    query_budget = CachedBasicAuthentication.queries
+
+    def get(self, request, *args, **kwargs):
+        return Response(
+            registry.render(), content_type="text/plain; version=0.0.4; charset=utf-8"
+        )